@@ -1,6 +1,6 @@
 import { LitElement, html } from "lit";
 import { run } from "../../../utils/run";
-import { get, save } from "../../progress/index.js";
+import { get, global, save } from "../../progress/index.js";
 
 import { dismissNotification, notify } from "../../notifications";
 import { isStorybook } from "../../globals.js";
@@ -11,6 +11,37 @@ import { getRandomSample } from "../../../utils/random";
 import { resolveMetadata } from "../../../utils/data";
 import Swal from "sweetalert2";
 import { createProgressPopup } from "../../../utils/popups";
+import { baseUrl } from "../../server/globals";
+
+// Number of sessions sent to the project store of the server per request
+const STORE_SYNC_BATCH_SIZE = 25;
+
+// Payload and hash of each session last synced with the project store, by project and session id
+const storedSessions = {};
+
+// Send the sessions whose payload changed since they were last synced, so that conversions can reference them by id
+const syncProjectStore = async (projectName, sessions) => {
+    const pathname = `neuroconv/store/${encodeURIComponent(projectName)}`;
+    const synced = storedSessions[projectName] ?? (storedSessions[projectName] = new Map());
+
+    // Forget sessions that the store no longer holds as they were synced (e.g. changed by another window)
+    const index = await fetch(new URL(pathname, baseUrl)).then((res) => res.json());
+    for (const [id, { hash }] of synced) if (index[id] !== hash) synced.delete(id);
+
+    const changed = Object.entries(sessions)
+        .map(([id, info]) => [id, JSON.stringify(info)])
+        .filter(([id, json]) => synced.get(id)?.json !== json);
+
+    for (let i = 0; i < changed.length; i += STORE_SYNC_BATCH_SIZE) {
+        const batch = changed.slice(i, i + STORE_SYNC_BATCH_SIZE);
+        const updated = await run(
+            pathname,
+            { sessions: Object.fromEntries(batch.map(([id, json]) => [id, JSON.parse(json)])) },
+            { swal: false }
+        );
+        batch.forEach(([id, json]) => synced.set(id, { json, hash: updated[id] }));
+    }
+};
 
 export class Page extends LitElement {
     // static get styles() {
@@ -167,6 +198,7 @@ export class Page extends LitElement {
         const { close: closeProgressPopup } = swalOpts;
 
         const fileConfiguration = [];
+        const storedPayloads = {}; // By project name and session id
 
         try {
             for (let info of toRun) {
@@ -217,16 +249,41 @@ export class Page extends LitElement {
                     const result = await backendFunctionToRun(payload, swalOpts); // Already handling Swal popup
                     const subRef = conversionOutput[subject] ?? (conversionOutput[subject] = {});
                     subRef[session] = result;
-                } else fileConfiguration.push(payload);
+                } else {
+                    // Conversions reference the session in the project store, with the options of this run
+                    const { output_folder, ...stored } = payload;
+                    Object.keys(optsCopy).forEach((key) => delete stored[key]);
+
+                    const session_id = `${subject}/${session}`;
+                    const projectPayloads = storedPayloads[name] ?? (storedPayloads[name] = {});
+                    projectPayloads[session_id] = stored;
+
+                    fileConfiguration.push({
+                        project_name: name,
+                        session_id,
+                        output_folder,
+                        split_interfaces: global.data.developer?.split_heavy_interfaces,
+                        ...optsCopy,
+                    });
+                }
             }
 
+            for (const [projectName, sessions] of Object.entries(storedPayloads))
+                await syncProjectStore(projectName, sessions);
+
             if (fileConfiguration.length) {
                 const results = await run(
                     `neuroconv/convert`,
                     {
                         files: fileConfiguration,
-                        max_workers: 2, // TODO: Make this configurable and confirm default value
+                        // Concurrency is adapted to the resources of the machine by the server
                         request_id: swalOpts.id,
+                        preview_cache_quota_gb: global.data.developer?.preview_cache_quota_gb,
+                        pin_cpus: global.data.developer?.pin_worker_cpus,
+                        consolidate: global.data.developer?.consolidate_split_files ?? true,
+                        memory_budget_gb:
+                            this.info.globalState.project?.memory_budget_gb ?? global.data.memory_budget_gb,
+                        job_queue_folder: this.info.globalState.project?.job_queue_folder,
                     },
                     {
                         title: "Running the conversion",
@@ -13,6 +13,7 @@ import { until } from "lit/directives/until.js";
 import { resolve } from "../../../../../utils/promises";
 import { InstanceManager } from "../../../InstanceManager.js";
 import { InspectorListItem } from "../../../InspectorList.js";
+import { JSONSchemaInput } from "../../../JSONSchemaInput.js";
 
 import { getResourceUsageBytes } from "../../../../validation/backend-configuration";
 
@@ -256,6 +257,57 @@ export class GuidedBackendConfigurationPage extends ManagedPage {
         );
     };
 
+    // Resolve the configuration of every session from that of a single (representative) session
+    applyToAllSessions = async ({ subject, session }) => {
+        const configuration = this.info.globalState.results[subject][session].configuration;
+        const backend = configuration.backend ?? this.workflow.file_format.value;
+        const template = { backend, results: configuration.results[backend] };
+
+        const files = [];
+        await this.runConversions({}, true, {}, (payload) => files.push(payload));
+
+        const { configurations, failed, schema } = await run(
+            `neuroconv/configuration/template`,
+            { template, files },
+            { title: "Applying the configuration to all sessions" }
+        ).catch((e) => {
+            this.notify(e.message, "error");
+            throw e;
+        });
+
+        Object.entries(configurations).forEach(([file, { results, itemsizes }]) => {
+            const fileName = file.split("/").pop();
+            const [subject, session] = fileName.match(/sub-(.+)_ses-(.+)\.nwb/).slice(1);
+
+            const sesResults = this.info.globalState.results[subject][session];
+            if (!sesResults.configuration) sesResults.configuration = {};
+            const sesConfiguration = sesResults.configuration;
+            sesConfiguration.backend = backend;
+            sesConfiguration.results = { ...(sesConfiguration.results ?? {}), [backend]: results };
+            sesConfiguration.itemsizes = { ...(sesConfiguration.itemsizes ?? {}), [backend]: itemsizes };
+
+            const schemaPath = [subject, session, backend];
+            schemaPath.reduce((acc, key, i) => {
+                if (i === schemaPath.length - 1) acc[key] = schema;
+                if (!acc[key]) acc[key] = {};
+                return acc[key];
+            }, this.info.globalState.schema.configuration);
+        });
+
+        await this.save({}, false); // Configurations were set on the global state directly
+        this.unsavedUpdates = "conversions"; // Trigger conversion updates
+
+        const failedFiles = Object.keys(failed);
+        if (failedFiles.length)
+            this.notify(
+                `The configuration could not be fully applied to ${failedFiles.length} session(s): ${failedFiles.join(", ")}`,
+                "warning"
+            );
+        else this.notify("The configuration was applied to all sessions.", "success");
+
+        this.requestUpdate(); // Re-render the forms with the new configurations
+    };
+
     #getManager = () => {
         const instances = {};
 
@@ -314,6 +366,24 @@ export class GuidedBackendConfigurationPage extends ManagedPage {
                 //         },
                 //     });
                 // },
+                // Zarr datasets are compressed and written on parallel threads
+                (id) => {
+                    const { subject, session } = getInfoFromId(id);
+                    const configuration = this.localState.results[subject][session].configuration;
+                    const backend = configuration.backend ?? this.workflow.file_format.value;
+                    if (backend !== "zarr") return "";
+
+                    return new JSONSchemaInput({
+                        path: [],
+                        schema: {
+                            type: "integer",
+                            minimum: 1,
+                            placeholder: "Write threads (all cores by default)",
+                        },
+                        value: configuration.number_of_write_threads,
+                        onUpdate: (value) => (configuration.number_of_write_threads = value ?? undefined),
+                    });
+                },
                 {
                     name: "Save & Validate",
                     primary: true,
@@ -323,6 +393,14 @@ export class GuidedBackendConfigurationPage extends ManagedPage {
                         await this.validate({ session, subject });
                     },
                 },
+                {
+                    name: "Apply to All Sessions",
+                    onClick: async (id) => {
+                        const { subject, session } = getInfoFromId(id);
+                        await this.save();
+                        await this.applyToAllSessions({ subject, session });
+                    },
+                },
             ],
         });
 
@@ -16,7 +16,7 @@ const options = {
         schema: {
             type: "string",
             format: "file",
-            description: "A CSV file containing the timestamps of the recording.",
+            description: "A file containing the timestamps of the recording (.csv, .tsv, .txt, .npy, or .bin).",
         },
     },
     linked: {
@@ -110,14 +110,13 @@ export class TimeAlignment extends LitElement {
     render() {
         const container = document.createElement("div");
 
-        const { timestamps, errors, metadata } = this.data;
+        const { timestamps, errors, metadata, timing = {} } = this.data;
 
+        // Each interface only reports a summary of its timestamps (start, stop, count, rate, max_deviation)
         const flatTimes = Object.values(timestamps)
-            .map((interfaceTimestamps) => {
-                return [interfaceTimestamps[0], interfaceTimestamps.slice(-1)[0]];
-            })
+            .map((summary) => (summary ? [summary.start, summary.stop] : []))
             .flat()
-            .filter((timestamp) => !isNaN(timestamp));
+            .filter((timestamp) => typeof timestamp === "number" && !isNaN(timestamp));
 
         const minTime = Math.min(...flatTimes);
         const maxTime = Math.max(...flatTimes);
@@ -167,13 +166,17 @@ export class TimeAlignment extends LitElement {
             const hasCompatibleInterfaces = isSortingInterface && metadata[name].compatible.length > 0;
 
             // Render this way if the interface has data
-            if (info.length > 0) {
-                const firstTime = info[0];
-                const lastTime = info[info.length - 1];
+            if (info && info.count > 0) {
+                const firstTime = info.start;
+                const lastTime = info.stop;
 
                 const smallLabel = document.createElement("small");
                 smallLabel.innerText = `${firstTime.toFixed(2)} - ${lastTime.toFixed(2)} sec`;
 
+                // Aligned timestamps that are regular will be written as a starting time and rate
+                if (timing[name]?.representation === "rate")
+                    smallLabel.innerText += ` (regular at ${timing[name].rate.toFixed(2)} Hz)`;
+
                 const firstTimePct = normalizeTimePct(firstTime);
                 const lastTimePct = normalizeTimePct(lastTime);
 
@@ -98,6 +98,7 @@ export const createProgressPopup = async (
         const { request_id, ...update } = parsed;
 
         if (request_id && request_id !== id) return;
+        if (parsed.event) return; // Telemetry events are not progress bars
         lastUpdate = Date.now();
 
         const _barId = parsed.progress_bar_id;
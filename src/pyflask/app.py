@@ -122,9 +122,13 @@ class Log(Resource):
 @api.route("/server_shutdown", endpoint="shutdown")
 class Shutdown(Resource):
     def get(self):
+        from manageNeuroconv import shutdown_worker_pool
+
         func = request.environ.get("werkzeug.server.shutdown")
         api.logger.info("Shutting down server")
 
+        shutdown_worker_pool()
+
         if func is None:
             kill(getpid(), SIGINT)
             return
@@ -0,0 +1,199 @@
+"""
+Headless replay of a saved GUIDE project: convert its sessions, inspect the NWB files, and upload them to DANDI.
+
+Run from `src/pyflask`, for instance as an array job of a scheduler with one shard per task:
+
+    python cli.py <project name or file> --shard $SLURM_ARRAY_TASK_ID/$SLURM_ARRAY_TASK_COUNT
+
+which plans, converts, and inspects the sessions of the shard. Upload once every shard has completed with
+
+    python cli.py <project name or file> --steps upload
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# https://stackoverflow.com/questions/32672596/pyinstaller-loads-script-multiple-times#comment103216434_32677108
+multiprocessing.freeze_support()
+
+from manageNeuroconv import (
+    convert_all_to_nwb,
+    inspect_all,
+    plan_conversions,
+    shutdown_worker_pool,
+    upload_project_to_dandi,
+)
+from manageNeuroconv.manage_neuroconv import get_conversion_path_info
+from manageNeuroconv.projects import (
+    get_conversion_payload,
+    get_project_sessions,
+    load_project,
+    select_shard,
+)
+
+STEPS = ("plan", "convert", "inspect", "upload")
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse a shard given as `i/n`, counted from 0."""
+    try:
+        shard, number_of_shards = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected a shard as 'i/n', got '{value}'.")
+
+    return shard, number_of_shards
+
+
+def convert_project(project: dict, files: List[dict], arguments: argparse.Namespace) -> List[dict]:
+    project_info = project["project"]
+    memory_budget_gb = arguments.memory_budget_gb or project_info.get("memory_budget_gb")
+    job_queue_folder = arguments.job_queue_folder or project_info.get("job_queue_folder")
+    return convert_all_to_nwb(
+        files=files,
+        request_id=None,
+        max_workers=arguments.max_workers,
+        force=arguments.force,
+        memory_budget_gb=memory_budget_gb,
+        job_queue_folder=job_queue_folder,
+        pin_cpus=arguments.pin_cpus,
+        consolidate=arguments.consolidate,
+    )
+
+
+def inspect_project(nwbfile_paths: List[str], arguments: argparse.Namespace) -> dict:
+    payload = dict(paths=nwbfile_paths)
+    if arguments.inspection_jobs is not None:
+        payload["n_jobs"] = arguments.inspection_jobs
+
+    return inspect_all(payload)
+
+
+def upload_project(project: dict, arguments: argparse.Namespace) -> list:
+    upload_info = project.get("upload", dict()).get("info", dict())
+    dandiset_id = arguments.dandiset or upload_info.get("dandiset")
+    if not dandiset_id:
+        raise ValueError("No Dandiset was selected for this project; provide one with --dandiset.")
+
+    staging = int(dandiset_id) >= 100000  # Staging Dandisets are numbered from 100000, as detected by the frontend
+    api_key = os.environ.get("DANDI_SANDBOX_API_KEY" if staging else "DANDI_API_KEY") or os.environ.get("DANDI_API_KEY")
+    if not api_key:
+        raise ValueError("Set the DANDI_API_KEY (or DANDI_SANDBOX_API_KEY for staging) environment variable to upload.")
+
+    upload_options = dict(upload_info.get("additional_settings", dict()))
+    upload_options.update(number_of_jobs=arguments.upload_jobs, number_of_threads=arguments.upload_threads)
+
+    return upload_project_to_dandi(
+        dandiset_id=str(dandiset_id),
+        api_key=api_key,
+        project=project["project"]["name"],
+        staging=staging,
+        **upload_options,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert, inspect, and upload the sessions of a saved GUIDE project without the GUIDE."
+    )
+    parser.add_argument("project", help="Name of a project saved by the GUIDE, or the path to its file.")
+    parser.add_argument("--steps", nargs="+", choices=STEPS, default=["plan", "convert", "inspect"])
+    parser.add_argument("--shard", type=parse_shard, default=None, help="Only run shard i of n (counted from 0).")
+    parser.add_argument("--stub", action="store_true", help="Convert previews of each session instead.")
+    parser.add_argument("--force", action="store_true", help="Convert sessions that are already up to date.")
+    parser.add_argument(
+        "--append",
+        nargs="+",
+        default=None,
+        metavar="INTERFACE",
+        help="Only convert these interfaces, adding them to the existing NWB file of each session.",
+    )
+    parser.add_argument(
+        "--split", action="store_true", help="Write heavy interfaces to linked HDF5 files of their own in parallel."
+    )
+    parser.add_argument(
+        "--consolidate", action="store_true", help="Copy the linked files of split conversions into their NWB file."
+    )
+    parser.add_argument("--max-workers", type=int, default=None, help="Number of sessions converted at once.")
+    parser.add_argument("--memory-budget-gb", type=float, default=None)
+    parser.add_argument("--job-queue-folder", default=None, help="Submit conversions to the workers of this queue.")
+    parser.add_argument("--pin-cpus", action="store_true", help="Pin each worker to its own cores (Linux only).")
+    parser.add_argument("--inspection-jobs", type=int, default=None, help="Number of files inspected at once.")
+    parser.add_argument("--report", default=None, help="Write the results of each step to this JSON file.")
+    parser.add_argument("--dandiset", default=None, help="Dandiset to upload to, if not that of the project.")
+    parser.add_argument("--upload-jobs", type=int, default=1)
+    parser.add_argument("--upload-threads", type=int, default=1)
+    arguments = parser.parse_args(argv)
+
+    if arguments.shard is not None and "upload" in arguments.steps:
+        parser.error("Upload the whole project once all shards have completed, rather than from each shard.")
+    if arguments.stub and "upload" in arguments.steps:
+        parser.error("Previews cannot be uploaded.")
+    if arguments.stub and arguments.append:
+        parser.error("Previews always convert every interface.")
+    if arguments.consolidate and not arguments.split:
+        parser.error("Only split conversions can be consolidated.")
+
+    project = load_project(arguments.project)
+    sessions = get_project_sessions(project)
+    if arguments.shard is not None:
+        sessions = select_shard(sessions, *arguments.shard)
+
+    files = [
+        get_conversion_payload(project, subject=subject, session=session, stub_test=arguments.stub)
+        for subject, session in sessions
+    ]
+    if arguments.append:
+        for info in files:
+            info["append_interfaces"] = arguments.append
+    if arguments.split:
+        for info in files:
+            info["split_interfaces"] = True
+
+    report = dict(project=project["project"]["name"], sessions=[info["nwbfile_path"] for info in files])
+
+    try:
+        # Stop before anything is written if the conversions cannot run to completion
+        if "plan" in arguments.steps:
+            print(f"Planning {len(sessions)} sessions...", flush=True)
+            report["plan"] = plan_conversions(
+                dict(files=files, force=arguments.force, max_workers=arguments.max_workers)
+            )
+            for issue in report["plan"]["issues"]:
+                print(f"{'Error' if issue['blocking'] else 'Warning'}: {issue['message']}", flush=True)
+            if not report["plan"]["ready"]:
+                sys.exit(1)
+
+        if "convert" in arguments.steps:
+            print(f"Converting {len(sessions)} sessions...", flush=True)
+            report["conversion"] = convert_project(project, files=files, arguments=arguments)
+            for result in report["conversion"]:
+                print(f"{'Up to date' if result['cached'] else 'Converted'}: {result['file']}", flush=True)
+
+        if "inspect" in arguments.steps:
+            nwbfile_paths = [str(get_conversion_path_info(info)["file"]) for info in files]
+            missing = [path for path in nwbfile_paths if not Path(path).exists()]
+            if missing:
+                raise FileNotFoundError(f"Convert these sessions before inspecting them: {', '.join(missing)}")
+
+            print(f"Inspecting {len(nwbfile_paths)} files...", flush=True)
+            report["inspection"] = inspect_project(nwbfile_paths, arguments=arguments)
+            print(report["inspection"]["text"], flush=True)
+
+        if "upload" in arguments.steps:
+            print("Uploading to DANDI...", flush=True)
+            report["upload"] = [str(path) for path in upload_project(project, arguments=arguments)]
+    finally:
+        shutdown_worker_pool()
+
+        if arguments.report:
+            with open(file=arguments.report, mode="w") as file:
+                json.dump(obj=report, fp=file, indent=4, default=str)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,3 +1,7 @@
+from .backend_tuning import tune_backend_configuration
+from .configuration_templates import apply_configuration_template
+from .conversion_planning import plan_conversions
+from .conversion_predictions import get_project_predictions
 from .info import CONVERSION_SAVE_FOLDER_PATH, STUB_SAVE_FOLDER_PATH
 from .manage_neuroconv import (
     autocomplete_format_string,
@@ -11,12 +15,16 @@ from .manage_neuroconv import (
     get_interface_alignment,
     get_metadata_schema,
     get_source_schema,
+    get_timeline_overview,
     inspect_all,
     listen_to_neuroconv_progress_events,
     locate_data,
     progress_handler,
+    stream_interface_timestamps,
     upload_folder_to_dandi,
     upload_multiple_filesystem_objects_to_dandi,
     upload_project_to_dandi,
     validate_metadata,
 )
+from .project_store import get_project_index, update_project_store
+from .worker_pool import shutdown_worker_pool, warm_worker_pool
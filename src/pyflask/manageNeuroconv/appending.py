@@ -0,0 +1,202 @@
+"""Append the newly selected interfaces of a session to its existing NWB file, without converting the others again."""
+
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from pynwb import NWBFile
+
+from .manage_neuroconv import (
+    apply_dataset_configurations,
+    build_in_memory_nwbfile,
+    resolve_references,
+)
+
+# File-level metadata expected to differ between conversions of the same session
+IGNORED_NWBFILE_METADATA = ["identifier", "source_script", "source_script_file_name", "file_create_date"]
+
+
+def _select_metadata(metadata: dict, schema: dict) -> dict:
+    """Drop the metadata of interfaces that are not appended, wherever the metadata schema forbids other properties."""
+    properties = schema.get("properties")
+    if not isinstance(metadata, dict) or properties is None:
+        return metadata
+
+    return {
+        key: _select_metadata(value, properties.get(key, dict()))
+        for key, value in metadata.items()
+        if key in properties or schema.get("additionalProperties", True) is not False
+    }
+
+
+def get_appended_metadata(converter, metadata: dict) -> dict:
+    return _select_metadata(metadata, resolve_references(converter.get_metadata_schema()))
+
+
+def _get_object_locations(nwbfile: NWBFile) -> dict:
+    """
+    The neurodata type of each object that cannot be shared between interfaces, by location in the file.
+
+    Devices, electrode groups, imaging planes, and electrodes are excluded, since NeuroConv reuses them by name.
+    """
+    locations = dict()
+    for group_name in ("acquisition", "stimulus", "intervals", "scratch"):
+        for name, neurodata_object in getattr(nwbfile, group_name).items():
+            locations[f"{group_name}/{name}"] = neurodata_object.neurodata_type
+
+    for module_name, module in nwbfile.processing.items():
+        for name, neurodata_object in module.data_interfaces.items():
+            locations[f"processing/{module_name}/{name}"] = neurodata_object.neurodata_type
+
+    if nwbfile.units is not None:
+        locations["units"] = nwbfile.units.neurodata_type
+
+    return locations
+
+
+def _normalize(value):
+    if hasattr(value, "tolist"):  # NumPy arrays read from the file
+        value = value.tolist()
+    if isinstance(value, tuple):
+        value = list(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+
+    return value
+
+
+def _compare_metadata(existing_object, metadata: dict, ignore: Optional[List[str]] = None) -> List[dict]:
+    differences = []
+    for key, value in metadata.items():
+        if key in (ignore or []) or value in (None, "", [], dict()):
+            continue
+
+        existing_value = getattr(existing_object, key, None)
+        if _normalize(existing_value) != _normalize(value):
+            differences.append(dict(key=key, existing=existing_value, value=value))
+
+    return differences
+
+
+def get_append_conflicts(existing_nwbfile: NWBFile, additions: NWBFile, metadata: dict) -> List[dict]:
+    """
+    Compare the objects and metadata of the interfaces to append, added to an in-memory NWBFile, with an existing one.
+
+    Objects written to an occupied location conflict, as does metadata of the session or subject that differs from
+    that of the file, which appending would otherwise silently leave unchanged.
+    """
+    conflicts = []
+
+    existing_locations = _get_object_locations(existing_nwbfile)
+    for location, neurodata_type in _get_object_locations(additions).items():
+        if location in existing_locations:
+            conflicts.append(
+                dict(
+                    type="object",
+                    location=location,
+                    message=f"The file already contains a {existing_locations[location]} at '{location}'.",
+                )
+            )
+
+    metadata_to_compare = [("NWBFile", existing_nwbfile, IGNORED_NWBFILE_METADATA)]
+    if metadata.get("Subject"):
+        metadata_to_compare.append(("Subject", existing_nwbfile.subject, []))
+
+    for section, existing_object, ignore in metadata_to_compare:
+        for difference in _compare_metadata(existing_object, metadata.get(section, dict()), ignore=ignore):
+            conflicts.append(
+                dict(
+                    type="metadata",
+                    location=f"{section}/{difference['key']}",
+                    message=(
+                        f"The {section} metadata '{difference['key']}' of the file is '{difference['existing']}', "
+                        f"not '{difference['value']}'. Convert every interface again to change it."
+                    ),
+                )
+            )
+
+    return conflicts
+
+
+def _raise_for_conflicts(conflicts: List[dict], nwbfile_path: Path) -> None:
+    if conflicts:
+        messages = "\n".join(f"- {conflict['message']}" for conflict in conflicts)
+        raise ValueError(f"The selected interfaces cannot be appended to '{nwbfile_path}':\n{messages}")
+
+
+def _check_target(nwbfile_path: Path, backend: str) -> Optional[dict]:
+    # NeuroConv cannot yet append to Zarr files
+    if backend != "hdf5":
+        return dict(type="backend", location="", message="Only HDF5 files can be appended to.")
+    if not Path(nwbfile_path).is_file():
+        return dict(type="missing_output", location="", message=f"There is no file to append to at '{nwbfile_path}'.")
+
+
+def check_append(
+    converter, metadata: dict, nwbfile_path: Path, backend: str, additions: Optional[NWBFile] = None
+) -> List[dict]:
+    """
+    The conflicts that would stop appending the interfaces of a converter to an existing file, without writing.
+
+    The in-memory NWBFile of the `additions` is built from the converter unless it was already.
+    """
+    from neuroconv.tools.nwb_helpers import BACKEND_NWB_IO
+
+    target_conflict = _check_target(nwbfile_path, backend=backend)
+    if target_conflict is not None:
+        return [target_conflict]
+
+    metadata = get_appended_metadata(converter, metadata=metadata)
+    if additions is None:
+        additions = build_in_memory_nwbfile(converter=converter, metadata=metadata)
+    with BACKEND_NWB_IO[backend](path=str(nwbfile_path), mode="r", load_namespaces=True) as io:
+        return get_append_conflicts(io.read(), additions=additions, metadata=metadata)
+
+
+def append_to_nwbfile(
+    converter,
+    metadata: dict,
+    nwbfile_path: Path,
+    backend: str = "hdf5",
+    conversion_options: Optional[dict] = None,
+    dataset_configurations: Optional[dict] = None,
+) -> "BackendConfiguration":
+    """
+    Add the interfaces of a converter to an existing NWB file, after checking that they do not conflict with it.
+
+    Datasets already in the file are left as they are, while those added are configured by their defaults, updated
+    with any of the `dataset_configurations` (by location in file) chosen on the frontend.
+    Returns the backend configuration of the added datasets.
+    """
+    from neuroconv.tools.nwb_helpers import (
+        configure_backend,
+        get_default_backend_configuration,
+        make_or_load_nwbfile,
+    )
+
+    target_conflict = _check_target(nwbfile_path, backend=backend)
+    if target_conflict is not None:
+        raise ValueError(target_conflict["message"])
+
+    metadata = get_appended_metadata(converter, metadata=metadata)
+    converter.validate_metadata(metadata=metadata)
+    converter.validate_conversion_options(conversion_options=conversion_options)
+
+    # Nothing is written unless the context exits without error
+    with make_or_load_nwbfile(
+        nwbfile_path=nwbfile_path, metadata=metadata, overwrite=False, backend=backend
+    ) as nwbfile:
+        additions = build_in_memory_nwbfile(converter=converter, metadata=metadata)
+        _raise_for_conflicts(get_append_conflicts(nwbfile, additions=additions, metadata=metadata), nwbfile_path)
+
+        converter.add_to_nwbfile(nwbfile, metadata=metadata, conversion_options=conversion_options)
+
+        backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend=backend)
+        apply_dataset_configurations(backend_configuration, dataset_configurations, ignore_missing=True)
+
+        configure_backend(nwbfile=nwbfile, backend_configuration=backend_configuration)
+
+    return backend_configuration
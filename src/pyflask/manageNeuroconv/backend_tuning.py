@@ -0,0 +1,376 @@
+"""Empirical tuning of chunking and compression for the backend configuration of a session."""
+
+import json
+import math
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .manage_neuroconv import (
+    build_in_memory_nwbfile,
+    get_conversion_info,
+    update_backend_configuration,
+)
+
+# Amount of source data read per dataset to benchmark each candidate
+DEFAULT_TUNING_SAMPLE_SIZE_IN_MB = 64
+
+# Datasets smaller than this keep their configuration, since the choice barely affects them
+MINIMUM_TUNING_DATASET_SIZE_IN_MB = 1
+
+# Number of ranked recommendations returned per dataset
+DEFAULT_NUMBER_OF_RECOMMENDATIONS = 3
+
+# Relative importance of each metric when ranking candidates; higher scores are better
+DEFAULT_TUNING_OBJECTIVE = dict(compression_ratio=2.0, write_throughput=1.0, read_latency=0.5)
+
+# Factors applied to the first axis of the configured chunk shape
+CHUNK_SHAPE_SCALE_FACTORS = [0.25, 0.5, 2, 4]
+
+# Number of best codecs (at the configured chunk shape) whose chunk shapes are then tuned
+NUMBER_OF_CODECS_TO_RESHAPE = 2
+
+# Candidate codecs per backend as (compression method, compression options)
+HDF5_CANDIDATE_CODECS = [
+    (None, None),
+    ("gzip", None),
+    ("gzip", dict(level=1)),
+    ("lzf", None),
+    ("Blosc", dict(cname="lz4", clevel=5, shuffle=1)),
+    ("Blosc", dict(cname="zstd", clevel=5, shuffle=1)),
+    ("Zstd", dict(clevel=3)),
+]
+ZARR_CANDIDATE_CODECS = [
+    (None, None),
+    ("gzip", None),
+    ("gzip", dict(level=1)),
+    ("blosc", dict(cname="lz4", clevel=5, shuffle=1)),
+    ("blosc", dict(cname="zstd", clevel=5, shuffle=1)),
+    ("zstd", dict(level=3)),
+    ("lz4", None),
+]
+
+
+def _get_available_candidate_codecs(backend: str) -> List[Tuple[Optional[str], Optional[dict]]]:
+    from neuroconv.tools.nwb_helpers import (
+        AVAILABLE_HDF5_COMPRESSION_METHODS,
+        AVAILABLE_ZARR_COMPRESSION_METHODS,
+    )
+
+    if backend == "hdf5":
+        candidates, available_methods = HDF5_CANDIDATE_CODECS, AVAILABLE_HDF5_COMPRESSION_METHODS
+    else:
+        candidates, available_methods = ZARR_CANDIDATE_CODECS, AVAILABLE_ZARR_COMPRESSION_METHODS
+
+    return [(method, options) for method, options in candidates if method is None or method in available_methods]
+
+
+def fit_buffer_shape(chunk_shape: tuple, buffer_shape: tuple, full_shape: tuple) -> tuple:
+    """Adjust a buffer shape to remain a multiple of a new chunk shape along every axis it does not fully span."""
+    fitted_buffer_shape = []
+    for chunk_axis, buffer_axis, full_axis in zip(chunk_shape, buffer_shape, full_shape):
+        if buffer_axis >= full_axis:
+            fitted_buffer_shape.append(full_axis)
+        else:
+            fitted_buffer_shape.append(min(full_axis, max(chunk_axis, (buffer_axis // chunk_axis) * chunk_axis)))
+
+    return tuple(fitted_buffer_shape)
+
+
+def _get_candidate_chunk_shapes(chunk_shape: tuple, full_shape: tuple) -> List[tuple]:
+    """Vary the configured chunk shape along the first axis, as well as spanning the full second axis."""
+    itemcount = math.prod(chunk_shape)
+
+    candidates = [tuple(chunk_shape)]
+    for factor in CHUNK_SHAPE_SCALE_FACTORS:
+        first_axis = min(full_shape[0], max(1, int(chunk_shape[0] * factor)))
+        candidates.append((first_axis, *chunk_shape[1:]))
+
+    # Keep roughly the same number of elements per chunk while spanning all channels (or columns)
+    if len(full_shape) > 1 and chunk_shape[1] < full_shape[1]:
+        other_axes = math.prod(full_shape[1:2]) * math.prod(chunk_shape[2:])
+        first_axis = min(full_shape[0], max(1, itemcount // other_axes))
+        candidates.append((first_axis, full_shape[1], *chunk_shape[2:]))
+
+    return list(dict.fromkeys(candidates))  # Remove duplicates while preserving order
+
+
+def read_sample(data, full_shape: tuple, dtype, number_of_rows: int) -> "np.ndarray":
+    """Read a contiguous block of rows from the middle of a dataset through its iterator, if possible."""
+    import numpy as np
+    from hdmf.data_utils import DataIO, GenericDataChunkIterator
+
+    if isinstance(data, DataIO):
+        data = data.data
+
+    start = (full_shape[0] - number_of_rows) // 2
+    selection = (slice(start, start + number_of_rows), *(slice(0, axis) for axis in full_shape[1:]))
+
+    if isinstance(data, GenericDataChunkIterator):
+        sample = data._get_data(selection=selection)
+    elif hasattr(data, "__getitem__") and not isinstance(data, (str, bytes)):
+        sample = np.asarray(data)[selection] if isinstance(data, list) else data[selection]
+    else:
+        raise TypeError(f"Data of type {type(data).__name__} cannot be sampled without consuming it.")
+
+    return np.ascontiguousarray(sample, dtype=dtype)
+
+
+def _get_typical_read_selections(shape: tuple, chunk_shape: tuple) -> list:
+    # A window spanning all channels (or columns), and a single channel (or column) spanning the whole sample
+    window = (slice(0, chunk_shape[0]), *(slice(None) for _ in shape[1:]))
+    selections = [window]
+    if len(shape) > 1:
+        selections.append((slice(None), *(0 for _ in shape[1:])))
+
+    return selections
+
+
+def _benchmark_hdf5(sample, data_io_kwargs: dict, folder_path: Path) -> Tuple[float, int, float]:
+    import h5py
+
+    file_path = folder_path / "benchmark.h5"
+    # Translate the H5DataIO keyword arguments into those of h5py
+    data_io_kwargs = dict(data_io_kwargs)
+    data_io_kwargs.pop("allow_plugin_filters", None)
+    if data_io_kwargs.get("compression", None) is False:
+        data_io_kwargs.pop("compression")
+
+    start_time = time.perf_counter()
+    with h5py.File(name=file_path, mode="w") as file:
+        dataset = file.create_dataset(name="data", data=sample, **data_io_kwargs)
+        file.flush()
+        stored_bytes = dataset.id.get_storage_size()
+    write_time = time.perf_counter() - start_time
+
+    with h5py.File(name=file_path, mode="r") as file:
+        dataset = file["data"]
+        selections = _get_typical_read_selections(shape=sample.shape, chunk_shape=dataset.chunks or sample.shape)
+        start_time = time.perf_counter()
+        for selection in selections:
+            dataset[selection]
+        read_latency = (time.perf_counter() - start_time) / len(selections)
+
+    file_path.unlink()
+
+    return write_time, stored_bytes, read_latency
+
+
+def _benchmark_zarr(sample, data_io_kwargs: dict, folder_path: Path) -> Tuple[float, int, float]:
+    from shutil import rmtree
+
+    import zarr
+
+    store_path = folder_path / "benchmark.zarr"
+
+    start_time = time.perf_counter()
+    array = zarr.open_array(
+        store=str(store_path),
+        mode="w",
+        shape=sample.shape,
+        chunks=data_io_kwargs["chunks"],
+        dtype=sample.dtype,
+        compressor=data_io_kwargs["compressor"] or None,
+        filters=data_io_kwargs["filters"],
+    )
+    array[...] = sample
+    write_time = time.perf_counter() - start_time
+    stored_bytes = array.nbytes_stored
+
+    array = zarr.open_array(store=str(store_path), mode="r")
+    selections = _get_typical_read_selections(shape=sample.shape, chunk_shape=array.chunks)
+    start_time = time.perf_counter()
+    for selection in selections:
+        array[selection]
+    read_latency = (time.perf_counter() - start_time) / len(selections)
+
+    rmtree(store_path)
+
+    return write_time, stored_bytes, read_latency
+
+
+def benchmark_candidate(
+    sample, dataset_configuration, candidate: dict, backend: str, folder_path: Path
+) -> Dict[str, float]:
+    """Write a sample with a candidate chunking and codec, measuring its compression, write and read performance."""
+    # The sample may be shorter than the full dataset, so chunks are clipped to it for the benchmark
+    sample_chunk_shape = tuple(
+        min(chunk_axis, axis) for chunk_axis, axis in zip(candidate["chunk_shape"], sample.shape)
+    )
+    benchmark_configuration = dataset_configuration.model_copy(
+        update=dict(
+            chunk_shape=sample_chunk_shape,
+            compression_method=candidate["compression_method"],
+            compression_options=candidate["compression_options"],
+        )
+    )
+    data_io_kwargs = benchmark_configuration.get_data_io_kwargs()
+
+    benchmark = _benchmark_hdf5 if backend == "hdf5" else _benchmark_zarr
+    write_time, stored_bytes, read_latency = benchmark(
+        sample=sample, data_io_kwargs=data_io_kwargs, folder_path=folder_path
+    )
+
+    # Edge chunks are stored at their full size, so compare against the chunk-aligned size of the sample
+    chunk_aligned_bytes = sample.dtype.itemsize * math.prod(
+        math.ceil(axis / chunk_axis) * chunk_axis for axis, chunk_axis in zip(sample.shape, sample_chunk_shape)
+    )
+
+    return dict(
+        write_throughput=sample.nbytes / max(write_time, 1e-9) / 1e6,  # MB/s of uncompressed data
+        compression_ratio=chunk_aligned_bytes / max(stored_bytes, 1),
+        read_latency=read_latency * 1e3,  # Milliseconds per typical slice
+    )
+
+
+def _score(metrics: Dict[str, float], objective: Dict[str, float]) -> float:
+    # Log-scaling makes the weights act on relative (rather than absolute) improvements
+    return (
+        objective.get("compression_ratio", 0) * math.log(metrics["compression_ratio"])
+        + objective.get("write_throughput", 0) * math.log(max(metrics["write_throughput"], 1e-9))
+        - objective.get("read_latency", 0) * math.log(max(metrics["read_latency"], 1e-6))
+    )
+
+
+def tune_dataset_configuration(
+    sample,
+    dataset_configuration,
+    backend: str,
+    objective: Optional[Dict[str, float]] = None,
+    number_of_recommendations: int = DEFAULT_NUMBER_OF_RECOMMENDATIONS,
+) -> List[Dict[str, Any]]:
+    """
+    Benchmark candidate codecs and chunk shapes for a single dataset on a sample of its data.
+
+    Codecs are first compared at the configured chunk shape; the chunk shape is then varied for the best few codecs.
+    Returns the ranked recommendations, each with its configuration (in the `results` format of the configuration
+    page) and measured metrics.
+    """
+    objective = objective or DEFAULT_TUNING_OBJECTIVE
+
+    chunk_shape = tuple(dataset_configuration.chunk_shape)
+    full_shape = tuple(dataset_configuration.full_shape)
+    buffer_shape = tuple(dataset_configuration.buffer_shape)
+
+    def make_candidate(candidate_chunk_shape, compression_method, compression_options) -> dict:
+        return dict(
+            chunk_shape=list(candidate_chunk_shape),
+            buffer_shape=list(fit_buffer_shape(candidate_chunk_shape, buffer_shape, full_shape)),
+            compression_method=compression_method,
+            compression_options=compression_options,
+        )
+
+    benchmarks = dict()
+    with tempfile.TemporaryDirectory(prefix="nwb_guide_tuning_") as folder_path:
+
+        def run(candidate: dict) -> None:
+            key = repr(candidate)
+            if key in benchmarks:
+                return
+
+            try:
+                metrics = benchmark_candidate(
+                    sample=sample,
+                    dataset_configuration=dataset_configuration,
+                    candidate=candidate,
+                    backend=backend,
+                    folder_path=Path(folder_path),
+                )
+            except Exception:  # Codecs may not support every dtype
+                return
+
+            benchmarks[key] = dict(configuration=candidate, metrics=metrics, score=_score(metrics, objective))
+
+        for compression_method, compression_options in _get_available_candidate_codecs(backend):
+            run(make_candidate(chunk_shape, compression_method, compression_options))
+
+        best_codecs = sorted(benchmarks.values(), key=lambda benchmark: benchmark["score"], reverse=True)
+        for benchmark in best_codecs[:NUMBER_OF_CODECS_TO_RESHAPE]:
+            for candidate_chunk_shape in _get_candidate_chunk_shapes(chunk_shape, full_shape):
+                configuration = benchmark["configuration"]
+                run(
+                    make_candidate(
+                        candidate_chunk_shape, configuration["compression_method"], configuration["compression_options"]
+                    )
+                )
+
+    ranked = sorted(benchmarks.values(), key=lambda benchmark: benchmark["score"], reverse=True)
+
+    return ranked[:number_of_recommendations]
+
+
+def tune_backend_configuration(info: dict) -> dict:
+    """
+    Recommend chunk shapes and compression for every dataset of a session by benchmarking samples of its source data.
+
+    The top recommendation per dataset is returned under `results` in the same format `/neuroconv/configuration`
+    uses, so it can be applied directly; all ranked recommendations and their metrics are returned alongside.
+    """
+    from neuroconv.utils.json_schema import NWBMetaDataEncoder
+
+    backend = info.get("configuration", {}).get("backend", "hdf5")
+    sample_size_in_bytes = info.get("sample_size_in_mb", DEFAULT_TUNING_SAMPLE_SIZE_IN_MB) * 1e6
+    number_of_recommendations = info.get("number_of_recommendations", DEFAULT_NUMBER_OF_RECOMMENDATIONS)
+    objective = {**DEFAULT_TUNING_OBJECTIVE, **info.get("objective", dict())}
+
+    converter, metadata, __ = get_conversion_info(info)
+    nwbfile = build_in_memory_nwbfile(converter=converter, metadata=metadata)
+    backend_configuration = update_backend_configuration(info, nwbfile=nwbfile)
+
+    results = dict()
+    recommendations = dict()
+    skipped = dict()
+
+    for location_in_file, dataset_configuration in backend_configuration.dataset_configurations.items():
+        full_shape = tuple(dataset_configuration.full_shape)
+        if dataset_configuration.chunk_shape is None or len(full_shape) == 0 or full_shape[0] == 0:
+            skipped[location_in_file] = "The dataset is not chunked."
+            continue
+
+        if math.prod(full_shape) * dataset_configuration.dtype.itemsize < MINIMUM_TUNING_DATASET_SIZE_IN_MB * 1e6:
+            skipped[location_in_file] = "The dataset is too small to benefit from tuning."
+            continue
+
+        # Read enough rows to fill the sample budget, and at least one (configured) chunk
+        row_size_in_bytes = math.prod(full_shape[1:]) * dataset_configuration.dtype.itemsize
+        number_of_rows = max(int(sample_size_in_bytes // max(row_size_in_bytes, 1)), 1)
+        number_of_rows = min(full_shape[0], max(number_of_rows, dataset_configuration.chunk_shape[0]))
+
+        neurodata_object = nwbfile.objects[dataset_configuration.object_id]
+        data = getattr(neurodata_object, dataset_configuration.dataset_name)
+
+        try:
+            sample = read_sample(
+                data=data, full_shape=full_shape, dtype=dataset_configuration.dtype, number_of_rows=number_of_rows
+            )
+        except Exception as exception:
+            skipped[location_in_file] = str(exception)
+            continue
+
+        ranked = tune_dataset_configuration(
+            sample=sample,
+            dataset_configuration=dataset_configuration,
+            backend=backend,
+            objective=objective,
+            number_of_recommendations=number_of_recommendations,
+        )
+        if len(ranked) == 0:
+            skipped[location_in_file] = "No candidate configuration could be benchmarked."
+            continue
+
+        recommendations[location_in_file] = ranked
+        results[location_in_file] = dict(full_shape=list(full_shape), **ranked[0]["configuration"])
+
+    return json.loads(
+        json.dumps(
+            obj=dict(
+                backend=backend,
+                results=results,
+                recommendations=recommendations,
+                skipped=skipped,
+                objective=objective,
+            ),
+            cls=NWBMetaDataEncoder,
+        )
+    )
@@ -0,0 +1,77 @@
+"""In-memory caches of the server and its workers, bounded so that long-lived processes do not grow indefinitely."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    A mapping that evicts its least recently used entries beyond `max_entries`, or beyond `max_size` in total.
+
+    The size of each entry is measured by `get_size` (one per entry by default). Entries larger than `max_size` on
+    their own are not stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_size: Optional[int] = None,
+        get_size: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._get_size = get_size or (lambda value: 1)
+        self._entries = OrderedDict()
+        self._sizes = dict()
+        self._total_size = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        size = self._get_size(value)
+
+        with self._lock:
+            self._pop(key)
+            if self.max_size is not None and size > self.max_size:
+                return
+
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._total_size += size
+
+            while (self.max_entries is not None and len(self._entries) > self.max_entries) or (
+                self.max_size is not None and self._total_size > self.max_size
+            ):
+                self._pop(next(iter(self._entries)))
+
+    def _pop(self, key: Hashable) -> None:
+        if key in self._entries:
+            del self._entries[key]
+            self._total_size -= self._sizes.pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_size = 0
+
+    @property
+    def total_size(self) -> int:
+        return self._total_size
@@ -0,0 +1,116 @@
+"""Apply the backend configuration of a representative session, as a template, to every session of a project."""
+
+import math
+from typing import Dict, List
+
+from .backend_tuning import fit_buffer_shape
+from .manage_neuroconv import (
+    serialize_backend_configuration,
+    update_backend_configuration,
+)
+
+# Properties of a template entry that are copied to matching datasets as they are, since they do not depend on shape
+SHAPE_INDEPENDENT_PROPERTIES = ["compression_method", "compression_options", "filter_methods", "filter_options"]
+
+
+def adapt_shape(template_shape: List[int], template_full_shape: List[int], full_shape: List[int]) -> List[int]:
+    """
+    Adapt a chunk (or buffer) shape from the full shape of the template dataset to that of another dataset.
+
+    Axes spanned entirely in the template remain spanned (e.g. all channels, even if there are more of them); all other
+    axes keep their size, clipped to the new full shape. If spanning grows the number of elements, the first axis that
+    is not spanned (usually time) shrinks to keep it roughly the same as in the template.
+    """
+    if len(template_shape) != len(template_full_shape) or len(template_full_shape) != len(full_shape):
+        raise ValueError(
+            f"The template has {len(template_full_shape)} dimensions, whereas the dataset has {len(full_shape)}."
+        )
+
+    spanned = [axis == full_axis for axis, full_axis in zip(template_shape, template_full_shape)]
+    shape = [
+        full_axis if is_spanned else min(axis, full_axis)
+        for axis, full_axis, is_spanned in zip(template_shape, full_shape, spanned)
+    ]
+
+    number_of_elements = math.prod(template_shape)
+    if math.prod(shape) > number_of_elements and not all(spanned):
+        axis_to_shrink = spanned.index(False)
+        other_axes = math.prod(shape[:axis_to_shrink] + shape[axis_to_shrink + 1 :])
+        shape[axis_to_shrink] = max(1, min(shape[axis_to_shrink], number_of_elements // max(other_axes, 1)))
+
+    return shape
+
+
+def apply_backend_configuration_template(backend_configuration, template: Dict[str, dict]) -> Dict[str, str]:
+    """
+    Map a template (in the `results` format of the configuration page) onto the backend configuration of a session.
+
+    Datasets missing from the template keep their defaults. Returns the reason each matching dataset could not be
+    mapped, keyed by its location in the file.
+    """
+    errors = dict()
+    dataset_configurations = backend_configuration.dataset_configurations
+    for location_in_file, template_configuration in template.items():
+        if location_in_file not in dataset_configurations:
+            continue
+
+        dataset_configuration = dataset_configurations[location_in_file]
+        full_shape = list(dataset_configuration.full_shape)
+        template_full_shape = template_configuration.get("full_shape", full_shape)
+
+        updates = {
+            key: template_configuration[key] for key in SHAPE_INDEPENDENT_PROPERTIES if key in template_configuration
+        }
+        try:
+            if template_configuration.get("chunk_shape") is not None:
+                chunk_shape = tuple(adapt_shape(template_configuration["chunk_shape"], template_full_shape, full_shape))
+
+                # The default buffer of each session is bounded in memory, unlike one adapted from the template
+                buffer_shape = fit_buffer_shape(
+                    chunk_shape, tuple(dataset_configuration.buffer_shape), tuple(full_shape)
+                )
+                updates.update(chunk_shape=chunk_shape, buffer_shape=buffer_shape)
+
+            # Validate all properties at once, since they are only consistent with one another as a whole
+            dataset_configurations[location_in_file] = type(dataset_configuration)(
+                **{**dict(dataset_configuration), **updates}
+            )
+        except Exception as exception:
+            errors[location_in_file] = str(exception)
+
+    return errors
+
+
+def apply_configuration_template(info: dict) -> dict:
+    """
+    Resolve the backend configuration of every session in a project from the configuration of one of them.
+
+    The default configurations of sessions are cached by session fingerprint, so only sessions that have changed since
+    they were last configured instantiate their interfaces.
+    Only the sessions that could not be (fully) mapped are reported under `failed`, keyed by `nwbfile_path`.
+    """
+    template = info["template"]
+    backend = template.get("backend", "hdf5")
+    files = info["files"]
+
+    schema = None
+    configurations = dict()
+    failed = dict()
+    for session_info in files:
+        nwbfile_path = session_info["nwbfile_path"]
+        session_info["configuration"] = dict(backend=backend)  # Start from the defaults of each session
+        try:
+            backend_configuration = update_backend_configuration(session_info)
+        except Exception as exception:
+            failed[nwbfile_path] = dict(error=str(exception))
+            continue
+
+        errors = apply_backend_configuration_template(backend_configuration, template=template["results"])
+        if errors:
+            failed[nwbfile_path] = dict(datasets=errors)
+
+        resolved = serialize_backend_configuration(backend_configuration)
+        schema = resolved.pop("schema")  # Identical for all sessions with the same backend
+        configurations[nwbfile_path] = resolved
+
+    return dict(backend=backend, configurations=configurations, failed=failed, schema=schema)
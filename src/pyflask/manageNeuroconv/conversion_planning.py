@@ -0,0 +1,279 @@
+"""Pre-flight planning of a batch of conversions, which reports the issues that would stop it before anything is written."""
+
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+from .conversion_predictions import (
+    get_existing_parent,
+    get_output_volumes,
+    predict_conversion,
+)
+from .manage_neuroconv import (
+    build_in_memory_nwbfile,
+    get_appended_interfaces,
+    get_conversion_info,
+    get_conversion_path_info,
+    update_backend_configuration,
+)
+from .project_store import resolve_session_reference
+from .scheduling import FixedConcurrencyController, run_scheduled
+from .thread_limits import get_threads_per_worker
+from .worker_pool import get_worker_pool, get_worker_pool_size, with_thread_limit
+
+# Number of threads stating source paths at once, which mostly wait on (possibly network) file systems
+SOURCE_STAT_THREADS = 16
+
+# Free space to leave on each output volume, as a fraction of the size of the outputs planned on it
+DISK_SPACE_MARGIN = 0.05
+
+
+def _get_source_paths(source_data: dict) -> List[str]:
+    """All file and folder paths of the source data of a session, as recognized by `get_source_data_size`."""
+    paths = []
+
+    def collect(value, key: str = "") -> None:
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                collect(sub_value, sub_key)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item, key)
+        elif isinstance(value, str) and (key.endswith("_path") or key.endswith("_paths")):
+            paths.append(value)
+
+    collect(source_data)
+    return paths
+
+
+def _stat_source_path(path: str) -> dict:
+    path = Path(path)
+    try:
+        if path.is_dir():
+            size = sum(file_path.stat().st_size for file_path in path.rglob("*") if file_path.is_file())
+        else:
+            size = path.stat().st_size
+    except (OSError, ValueError):
+        return dict(exists=path.exists(), readable=False, size=0)
+
+    return dict(exists=True, readable=os.access(path, os.R_OK), size=size)
+
+
+def _get_existing_output_size(nwbfile_path: Path) -> int:
+    """Size of a previous output, which is removed before the session is converted again."""
+    try:
+        if nwbfile_path.is_dir():  # Zarr
+            return sum(file_path.stat().st_size for file_path in nwbfile_path.rglob("*") if file_path.is_file())
+        return nwbfile_path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _plan_session(info: dict, estimate_compression: bool) -> dict:
+    """
+    Configure a session and predict its output from a single instance of its interfaces, on a worker process.
+
+    Sessions that append interfaces are also checked for conflicts with their existing file.
+    """
+    from .appending import check_append, get_appended_metadata
+
+    converter, metadata, path_info = get_conversion_info(info)
+    appended = get_appended_interfaces(info) is not None
+    if appended:
+        metadata = get_appended_metadata(converter, metadata=metadata)
+    nwbfile = build_in_memory_nwbfile(converter=converter, metadata=metadata)
+
+    backend_configuration = update_backend_configuration(info, nwbfile=nwbfile)
+    if estimate_compression:
+        prediction = predict_conversion(info, backend_configuration=backend_configuration, nwbfile=nwbfile)["session"]
+    else:
+        # Assume that nothing compresses, which bounds the output size from above without reading any data
+        uncompressed_bytes = sum(
+            math.prod(dataset_configuration.full_shape) * dataset_configuration.dtype.itemsize
+            for dataset_configuration in backend_configuration.dataset_configurations.values()
+        )
+        prediction = dict(
+            uncompressed_bytes=uncompressed_bytes, compressed_bytes=uncompressed_bytes, estimated_write_time=None
+        )
+
+    conflicts = []
+    if appended:
+        backend = info.get("configuration", dict()).get("backend", "hdf5")
+        conflicts = check_append(
+            converter, metadata=metadata, nwbfile_path=path_info["file"], backend=backend, additions=nwbfile
+        )
+
+    return dict(prediction=prediction, conflicts=conflicts)
+
+
+def plan_conversions(info: dict) -> dict:
+    """
+    Check that a batch of conversions can run to completion, and estimate the data it reads and writes and its duration.
+
+    Every source path of every session is stated in parallel, and sessions are configured in parallel on the worker
+    pool. Output sizes are predicted from the backend configuration of each session (probing compression unless
+    `estimate_compression` is false) and compared against the free space of each output volume, including custom
+    output folders, net of the previous outputs that would be replaced. Sessions whose output is up to date are skipped
+    unless `force` is set, as in `convert_all_to_nwb`.
+
+    Files may also reference sessions of the project store, as for `convert_all_to_nwb`. Sessions that append
+    interfaces to their existing file are checked for conflicts with it, and only their additions are predicted.
+
+    The plan is `ready` if none of its `issues` is blocking.
+    """
+    from .manifest import (
+        get_conversion_fingerprint,
+        is_conversion_up_to_date,
+        load_conversion_manifest,
+    )
+
+    files = [resolve_session_reference(file_info) for file_info in info["files"]]
+    force = info.get("force", False)
+    estimate_compression = info.get("estimate_compression", True)
+
+    issues = []
+
+    def add_issue(kind: str, message: str, blocking: bool = True, **details) -> None:
+        issues.append(dict(type=kind, message=message, blocking=blocking, **details))
+
+    # State the sources of every session at once
+    source_paths = sorted({path for file_info in files for path in _get_source_paths(file_info.get("source_data", {}))})
+    with ThreadPoolExecutor(max_workers=SOURCE_STAT_THREADS) as executor:
+        source_stats = dict(zip(source_paths, executor.map(_stat_source_path, source_paths)))
+
+    sessions = dict()
+    sessions_to_configure = []
+    manifests = dict()  # By project output directory
+    for file_info in files:
+        path_info = get_conversion_path_info(file_info)
+        nwbfile_path = path_info["file"]
+        session_key = str(nwbfile_path)
+
+        # Appends only read the sources of the interfaces they add, and keep the existing output
+        source_data = file_info.get("source_data", {})
+        append_interfaces = get_appended_interfaces(file_info)
+        appended = append_interfaces is not None
+        if appended:
+            source_data = {name: source_data[name] for name in append_interfaces if name in source_data}
+
+        paths = _get_source_paths(source_data)
+        session = sessions[session_key] = dict(
+            source_bytes=sum(source_stats[path]["size"] for path in paths),
+            existing_output_bytes=(
+                _get_existing_output_size(nwbfile_path) if file_info.get("overwrite") and not appended else 0
+            ),
+        )
+
+        directory = path_info["directory"]
+        manifest = manifests.setdefault(directory, load_conversion_manifest(directory))
+        fingerprint = get_conversion_fingerprint(file_info)
+        if not force and is_conversion_up_to_date(file_info, manifest=manifest, fingerprint=fingerprint):
+            session.update(status="up_to_date", source_bytes=0, existing_output_bytes=0, compressed_bytes=0)
+            continue
+
+        session["status"] = "planned"
+
+        unavailable = False
+        for path in paths:
+            if not source_stats[path]["exists"]:
+                add_issue("missing_source", f"The source path '{path}' does not exist.", session=session_key)
+                unavailable = True
+            elif not source_stats[path]["readable"]:
+                add_issue("unreadable_source", f"The source path '{path}' cannot be read.", session=session_key)
+                unavailable = True
+
+        if unavailable:
+            session["compressed_bytes"] = session["source_bytes"]  # Assume the output is as large as the source
+            continue
+
+        sessions_to_configure.append((session_key, file_info))
+
+    # Sessions are configured, and their compression probed, on the workers of the server
+    if sessions_to_configure:
+        number_of_jobs = min(info.get("max_workers") or get_worker_pool_size(), get_worker_pool_size())
+        number_of_jobs = max(1, min(number_of_jobs, len(sessions_to_configure)))
+        jobs = [
+            (sessions[session_key]["source_bytes"], (file_info, estimate_compression), dict())
+            for session_key, file_info in sessions_to_configure
+        ]
+        plans = run_scheduled(
+            executor=get_worker_pool(),
+            function=with_thread_limit(_plan_session, number_of_threads=get_threads_per_worker(number_of_jobs)),
+            jobs=jobs,
+            max_workers=number_of_jobs,
+            controller=FixedConcurrencyController(max_workers=number_of_jobs),
+        )
+        futures = {timing["index"]: future for future, timing in plans}
+
+        for index, (session_key, __) in enumerate(sessions_to_configure):
+            session = sessions[session_key]
+            try:
+                plan = futures[index].result()
+            except Exception as exception:
+                session["compressed_bytes"] = session["source_bytes"]
+                add_issue("configuration", f"The session could not be configured: {exception}", session=session_key)
+                continue
+
+            session.update(plan["prediction"])
+            for conflict in plan["conflicts"]:
+                add_issue("append_conflict", conflict["message"], session=session_key, location=conflict["location"])
+
+    # Previous outputs are removed before their session is converted again
+    planned_sessions = {key: session for key, session in sessions.items() if session["status"] != "up_to_date"}
+    volumes = get_output_volumes(
+        {
+            session_key: max(session["compressed_bytes"] - session["existing_output_bytes"], 0)
+            for session_key, session in planned_sessions.items()
+        },
+        margin=DISK_SPACE_MARGIN,
+    )
+
+    for session_key in planned_sessions:
+        location = get_existing_parent(Path(session_key).parent)
+        if not os.access(location, os.W_OK):
+            add_issue("unwritable_output", f"The output folder '{location}' cannot be written to.", session=session_key)
+
+    for volume in volumes:
+        if not volume["sufficient"]:
+            add_issue(
+                "insufficient_space",
+                (
+                    f"The volume of '{volume['location']}' has {volume['free_bytes'] / 1e9:.2f} GB free, "
+                    f"but {volume['required_bytes'] / 1e9:.2f} GB are required."
+                ),
+                location=volume["location"],
+            )
+
+    # Sessions run in parallel, so the batch lasts at least as long as its longest session
+    planned = list(planned_sessions.values())
+    write_times = [session.get("estimated_write_time") for session in planned]
+    number_of_workers = max(1, min(info.get("max_workers") or os.cpu_count() or 1, len(planned)))
+    if planned and all(write_time is not None for write_time in write_times):
+        estimated_duration = max(max(write_times), sum(write_times) / number_of_workers)
+    else:
+        estimated_duration = None
+        if planned:
+            add_issue(
+                "unknown_duration",
+                "The duration could not be estimated without a previous conversion or a compression probe.",
+                blocking=False,
+            )
+
+    total = dict(
+        number_of_sessions=len(sessions),
+        number_of_planned_sessions=len(planned),
+        projected_bytes_read=sum(session["source_bytes"] for session in planned),
+        projected_bytes_written=sum(session["compressed_bytes"] for session in planned),
+        number_of_workers=number_of_workers,
+        estimated_duration=estimated_duration,
+    )
+
+    return dict(
+        ready=not any(issue["blocking"] for issue in issues),
+        issues=issues,
+        sessions=sessions,
+        volumes=volumes,
+        total=total,
+    )
@@ -0,0 +1,259 @@
+"""Predictions of the output size and write time of conversions, calibrated on previous conversions on this machine."""
+
+import json
+import math
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from shutil import disk_usage
+from typing import Dict, List, Optional
+
+from pynwb import NWBFile
+
+from .backend_tuning import benchmark_candidate, read_sample
+from .caches import LRUCache
+from .info import GUIDE_ROOT_FOLDER
+from .manage_neuroconv import (
+    build_in_memory_nwbfile,
+    get_conversion_info,
+    get_conversion_path_info,
+    get_session_fingerprint,
+    update_backend_configuration,
+)
+
+# Amount of source data compressed per dataset to estimate its compression ratio
+PROBE_SAMPLE_SIZE_IN_MB = 4
+
+# Datasets smaller than this are assumed to be stored uncompressed, since they barely affect the totals
+MINIMUM_PROBE_DATASET_SIZE_IN_MB = 1
+
+# Throughput of completed conversions, appended to by every worker
+CONVERSION_THROUGHPUT_LOG_PATH = Path(GUIDE_ROOT_FOLDER, "conversion_throughput.jsonl")
+
+# Number of most recent conversions (per backend) used for calibration
+NUMBER_OF_CALIBRATION_CONVERSIONS = 20
+
+# Conversions smaller than this are dominated by fixed overheads, so they are not used for calibration
+MINIMUM_CALIBRATION_SIZE_IN_MB = 10
+
+# Compression ratio and write throughput of sampled datasets, keyed by session fingerprint and dataset configuration
+COMPRESSION_PROBE_CACHE = LRUCache(max_entries=1024)
+
+
+def record_conversion_throughput(backend: str, uncompressed_bytes: int, duration: float) -> None:
+    """Log the throughput of a completed conversion so that later predictions can be calibrated against it."""
+    if uncompressed_bytes < MINIMUM_CALIBRATION_SIZE_IN_MB * 1e6 or duration <= 0:
+        return
+
+    entry = dict(backend=backend, uncompressed_bytes=int(uncompressed_bytes), duration=duration, time=time.time())
+
+    # Single appended lines are written atomically, so concurrent workers do not corrupt the log
+    CONVERSION_THROUGHPUT_LOG_PATH.parent.mkdir(exist_ok=True, parents=True)
+    with open(file=CONVERSION_THROUGHPUT_LOG_PATH, mode="a") as file:
+        file.write(json.dumps(entry) + "\n")
+
+
+def get_calibrated_throughput(backend: str) -> Optional[dict]:
+    """The median throughput (in MB/s of uncompressed data) of the most recent conversions with this backend."""
+    if not CONVERSION_THROUGHPUT_LOG_PATH.exists():
+        return None
+
+    throughputs = []
+    with open(file=CONVERSION_THROUGHPUT_LOG_PATH, mode="r") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:  # Partially written by an interrupted worker
+                continue
+
+            if entry.get("backend") == backend:
+                throughputs.append(entry["uncompressed_bytes"] / entry["duration"] / 1e6)
+
+    if len(throughputs) == 0:
+        return None
+
+    throughputs = throughputs[-NUMBER_OF_CALIBRATION_CONVERSIONS:]
+    return dict(throughput=statistics.median(throughputs), number_of_conversions=len(throughputs))
+
+
+def _get_probe_key(fingerprint: str, backend: str, dataset_configuration) -> tuple:
+    return (
+        fingerprint,
+        backend,
+        dataset_configuration.location_in_file,
+        repr(dataset_configuration.compression_method),
+        json.dumps(dataset_configuration.compression_options, sort_keys=True, default=str),
+        tuple(dataset_configuration.chunk_shape),
+    )
+
+
+def _probe_dataset(nwbfile: NWBFile, dataset_configuration, backend: str) -> dict:
+    """Compress a small sample of a dataset with its configured chunking and codec."""
+    full_shape = tuple(dataset_configuration.full_shape)
+    itemsize = dataset_configuration.dtype.itemsize
+
+    # Read enough rows to fill the probe, and at least one chunk
+    row_size_in_bytes = math.prod(full_shape[1:]) * itemsize
+    number_of_rows = max(int(PROBE_SAMPLE_SIZE_IN_MB * 1e6 // max(row_size_in_bytes, 1)), 1)
+    number_of_rows = min(full_shape[0], max(number_of_rows, dataset_configuration.chunk_shape[0]))
+
+    neurodata_object = nwbfile.objects[dataset_configuration.object_id]
+    data = getattr(neurodata_object, dataset_configuration.dataset_name)
+    sample = read_sample(
+        data=data, full_shape=full_shape, dtype=dataset_configuration.dtype, number_of_rows=number_of_rows
+    )
+
+    candidate = dict(
+        chunk_shape=dataset_configuration.chunk_shape,
+        compression_method=dataset_configuration.compression_method,
+        compression_options=dataset_configuration.compression_options,
+    )
+    with tempfile.TemporaryDirectory(prefix="nwb_guide_probe_") as folder_path:
+        metrics = benchmark_candidate(
+            sample=sample,
+            dataset_configuration=dataset_configuration,
+            candidate=candidate,
+            backend=backend,
+            folder_path=Path(folder_path),
+        )
+
+    return dict(compression_ratio=metrics["compression_ratio"], write_throughput=metrics["write_throughput"])
+
+
+def predict_conversion(info: dict, backend_configuration, nwbfile: Optional[NWBFile] = None) -> dict:
+    """
+    Predict the size of every dataset of a session, and of the whole file, as well as the time taken to write it.
+
+    Compression ratios are probed on a small sample of each dataset and cached per session fingerprint and dataset
+    configuration, so an in-memory file is only built (if not provided) when the chunking or codec has changed.
+    Write times are calibrated on the throughput of previous conversions on this machine when available, and otherwise
+    fall back to the (optimistic) throughput of the probes themselves.
+    """
+    fingerprint = get_session_fingerprint(info)
+    backend = backend_configuration.backend
+
+    datasets = dict()
+    probe_throughputs = []
+    for location_in_file, dataset_configuration in backend_configuration.dataset_configurations.items():
+        uncompressed_bytes = math.prod(dataset_configuration.full_shape) * dataset_configuration.dtype.itemsize
+
+        probe = None
+        if (
+            dataset_configuration.chunk_shape is not None
+            and uncompressed_bytes >= MINIMUM_PROBE_DATASET_SIZE_IN_MB * 1e6
+        ):
+            key = _get_probe_key(fingerprint=fingerprint, backend=backend, dataset_configuration=dataset_configuration)
+            probe = COMPRESSION_PROBE_CACHE.get(key)
+            if probe is None:
+                if nwbfile is None:
+                    converter, metadata, __ = get_conversion_info(info)
+                    nwbfile = build_in_memory_nwbfile(converter=converter, metadata=metadata)
+
+                try:
+                    probe = _probe_dataset(
+                        nwbfile=nwbfile, dataset_configuration=dataset_configuration, backend=backend
+                    )
+                except Exception:  # Data that cannot be sampled without consuming it is assumed incompressible
+                    probe = dict()
+
+                COMPRESSION_PROBE_CACHE[key] = probe
+
+        compression_ratio = probe["compression_ratio"] if probe else 1.0
+        if probe:
+            probe_throughputs.append(probe["write_throughput"])
+
+        datasets[location_in_file] = dict(
+            uncompressed_bytes=int(uncompressed_bytes),
+            compressed_bytes=int(uncompressed_bytes / compression_ratio),
+            compression_ratio=compression_ratio,
+            probed=probe is not None,
+        )
+
+    calibration = get_calibrated_throughput(backend=backend)
+    if calibration is not None:
+        throughput, source = calibration["throughput"], "history"
+    elif len(probe_throughputs) > 0:
+        throughput, source = statistics.median(probe_throughputs), "probe"
+    else:
+        throughput, source = None, None
+
+    for prediction in datasets.values():
+        prediction["estimated_write_time"] = prediction["uncompressed_bytes"] / 1e6 / throughput if throughput else None
+
+    uncompressed_bytes = sum(prediction["uncompressed_bytes"] for prediction in datasets.values())
+    session = dict(
+        uncompressed_bytes=uncompressed_bytes,
+        compressed_bytes=sum(prediction["compressed_bytes"] for prediction in datasets.values()),
+        estimated_write_time=uncompressed_bytes / 1e6 / throughput if throughput else None,
+        throughput=throughput,
+        calibration=source,
+        number_of_calibration_conversions=calibration["number_of_conversions"] if calibration else 0,
+    )
+
+    return dict(datasets=datasets, session=session)
+
+
+def get_existing_parent(path: Path) -> Path:
+    """The closest folder of a path that exists, such as that an output folder will be created in."""
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    return path
+
+
+def get_output_volumes(required_bytes: Dict[str, int], margin: float = 0.0) -> List[dict]:
+    """
+    Group output files, given as the bytes each requires by path, by the volume they are written to.
+
+    Each volume is summarized by its free space, the space its files require, and whether it is `sufficient` once a
+    `margin` (as a fraction of the required space) is left free.
+    """
+    volumes = dict()  # By device, since sessions may be written to different folders of the same volume
+    for file_path, size in required_bytes.items():
+        folder = Path(file_path).parent
+        location = get_existing_parent(folder)
+        device = location.stat().st_dev
+        if device not in volumes:
+            volumes[device] = dict(
+                location=str(location), free_bytes=disk_usage(location).free, required_bytes=0, folders=set()
+            )
+
+        volumes[device]["required_bytes"] += size
+        volumes[device]["folders"].add(str(folder))
+
+    for volume in volumes.values():
+        volume["folders"] = sorted(volume["folders"])
+        volume["sufficient"] = volume["free_bytes"] >= volume["required_bytes"] * (1 + margin)
+
+    return list(volumes.values())
+
+
+def get_project_predictions(info: dict) -> dict:
+    """
+    Roll up the predictions of every session in a project, and compare the output size against the free disk space.
+
+    The longest session bounds the duration of a parallel conversion from below, whereas the total write time is that
+    of a serial conversion; together these help decide how many workers are worth launching.
+    """
+    sessions = dict()
+    for session_info in info["files"]:
+        backend_configuration = update_backend_configuration(session_info)
+        predictions = predict_conversion(session_info, backend_configuration=backend_configuration)
+        nwbfile_path = get_conversion_path_info(session_info)["file"]
+        sessions[str(nwbfile_path)] = predictions["session"]
+
+    write_times = [session["estimated_write_time"] for session in sessions.values()]
+    known_write_times = [write_time for write_time in write_times if write_time is not None]
+    total = dict(
+        uncompressed_bytes=sum(session["uncompressed_bytes"] for session in sessions.values()),
+        compressed_bytes=sum(session["compressed_bytes"] for session in sessions.values()),
+        estimated_write_time=sum(known_write_times) if len(known_write_times) == len(write_times) else None,
+        longest_estimated_write_time=max(known_write_times, default=None),
+    )
+
+    # Sessions may be written to different locations, possibly on different drives
+    volumes = get_output_volumes(
+        {nwbfile_path: session["compressed_bytes"] for nwbfile_path, session in sessions.items()}
+    )
+
+    return dict(sessions=sessions, total=total, volumes=volumes)
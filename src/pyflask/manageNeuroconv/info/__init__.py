@@ -2,6 +2,7 @@ from .sse import format_sse
 from .urls import (
     CONVERSION_SAVE_FOLDER_PATH,
     GUIDE_ROOT_FOLDER,
+    PROJECT_SAVE_FOLDER_PATH,
     STUB_SAVE_FOLDER_PATH,
     is_packaged,
     resource_path,
@@ -0,0 +1,444 @@
+"""
+Job queue on a shared file system, through which conversions are distributed to headless workers on any machine.
+
+Each job is a JSON file that moves between the `pending`, `running`, `done`, and `failed` folders of the queue. Workers
+claim pending jobs atomically by renaming them, and report the progress of their conversion in the `progress` folder.
+
+Batch conversions given a `job_queue_folder` submit their full conversions to the queue as complete payloads, since
+workers may not have access to the project store of the server nor to its log endpoint, and relay the progress of each
+as it is reported. Each session must set an `output_folder` shared with the workers, which is pinned to its absolute
+path. Sessions keep their share of the memory budget, progress update rate, and CPU pinning, while previews always run
+on the server, whose cache they are stored in.
+
+Start a worker on each node with access to the queue (and to the source data and output folders) by running
+
+    python -m manageNeuroconv.job_queue <queue folder> [--number-of-processes N]
+
+from `src/pyflask`.
+"""
+
+import _thread
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .progress import initialize_progress_worker
+from .thread_limits import (
+    get_threads_per_worker,
+    initialize_worker_threads,
+    limit_native_threads,
+    pin_to_cpus,
+)
+
+JOB_STATES = ("pending", "running", "done", "failed")
+
+# Interval (in seconds) at which the queue is polled for new jobs and for the progress of running ones
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Interval at which workers mark their running job as alive
+HEARTBEAT_INTERVAL = 10.0
+
+# Running jobs not marked alive for this long are assumed to have lost their worker, and are returned to the queue
+STALE_JOB_TIMEOUT = 120.0
+
+# Maximum number of progress updates per second written by workers for each progress bar, which limits file system I/O
+JOB_PROGRESS_UPDATE_RATE = 1
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    # Replace the file atomically, so that no reader sees a partial write
+    temporary_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(file=temporary_path, mode="w") as file:
+        json.dump(obj=obj, fp=file, default=str)
+    os.replace(temporary_path, path)
+
+
+def _read_json(path: Path) -> Optional[Any]:
+    try:
+        with open(file=path, mode="r") as file:
+            return json.load(fp=file)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def get_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class JobProgressWriter:
+    """Stand-in for the progress queue of worker processes, which writes the latest update of each progress bar to a file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.updates = dict()
+        self.events = []
+
+    def put(self, update: dict) -> None:
+        if "event" in update:
+            self.events.append(update)
+        else:
+            self.updates[update.get("progress_bar_id")] = update
+
+        _write_json(self.path, dict(updates=list(self.updates.values()), events=self.events))
+
+
+class FileSystemJobQueue:
+    """A job queue held in a folder, which may be shared by many machines through a network file system."""
+
+    def __init__(self, folder: str):
+        self.folder = Path(folder)
+        for state in (*JOB_STATES, "progress"):
+            (self.folder / state).mkdir(parents=True, exist_ok=True)
+
+    def _get_path(self, state: str, job_id: str) -> Path:
+        return self.folder / state / f"{job_id}.json"
+
+    def _get_progress_path(self, job_id: str) -> Path:
+        return self.folder / "progress" / f"{job_id}.json"
+
+    def submit(
+        self,
+        info: dict,
+        priority: int = 0,
+        progress_update_rate: Optional[float] = None,
+        pin_cpus: bool = False,
+        **kwargs,
+    ) -> str:
+        """
+        Add the conversion of a session to the queue, along with any keyword arguments of `convert_to_nwb`.
+
+        Jobs are claimed in order of `priority` (lowest first), then of submission. The worker that runs the job reports
+        its progress at up to `progress_update_rate`, and is pinned to its own cores if `pin_cpus` is set.
+        """
+        job_id = f"{priority:06d}-{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+        job = dict(
+            job_id=job_id,
+            info=info,
+            kwargs=kwargs,
+            progress_update_rate=progress_update_rate,
+            pin_cpus=pin_cpus,
+            submitted=time.time(),
+        )
+        _write_json(self._get_path("pending", job_id), job)
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[dict]:
+        """Move the next pending job to the running jobs, unless another worker claimed it first."""
+        for name in sorted(os.listdir(self.folder / "pending")):
+            if not name.endswith(".json") or name.startswith("."):
+                continue
+
+            job_id = name[: -len(".json")]
+            running_path = self._get_path("running", job_id)
+            try:
+                os.rename(self._get_path("pending", job_id), running_path)  # Atomic, so only one worker succeeds
+                os.utime(running_path)  # Renaming keeps the time of submission, which would make the job appear stale
+            except FileNotFoundError:
+                continue
+
+            # Each claim is identified, as a job returned to the queue may be claimed again while its last claim runs
+            job = _read_json(running_path)
+            job.update(worker_id=worker_id, claim_id=uuid.uuid4().hex, started=time.time())
+            _write_json(running_path, job)
+            return job
+
+        return None
+
+    def holds_claim(self, job: dict) -> bool:
+        """Whether a claimed job is still running under that claim, rather than returned to the queue as stale."""
+        running_job = _read_json(self._get_path("running", job["job_id"]))
+        return running_job is not None and running_job.get("claim_id") == job["claim_id"]
+
+    def heartbeat(self, job: dict) -> bool:
+        """Mark a claimed job alive. Returns whether the claim is still held, as the job must be abandoned otherwise."""
+        if not self.holds_claim(job):
+            return False
+
+        try:
+            os.utime(self._get_path("running", job["job_id"]))
+        except FileNotFoundError:  # The job was returned to the queue as stale in the meantime
+            return False
+
+        return True
+
+    def _finish(self, job: dict, state: str, **details) -> bool:
+        # Only the current claim of a job may finish it, as a job returned to the queue may be running elsewhere
+        if not self.holds_claim(job):
+            return False
+
+        _write_json(self._get_path(state, job["job_id"]), dict(job, finished=time.time(), **details))
+        try:
+            os.remove(self._get_path("running", job["job_id"]))
+        except FileNotFoundError:
+            pass
+
+        return True
+
+    def complete(self, job: dict, result: dict) -> bool:
+        return self._finish(job, state="done", result=result)
+
+    def fail(self, job: dict, error: str, error_traceback: str) -> bool:
+        return self._finish(job, state="failed", error=error, traceback=error_traceback)
+
+    def requeue_stale_jobs(self, timeout: float = STALE_JOB_TIMEOUT) -> List[str]:
+        """Return the running jobs whose worker has not marked them alive within `timeout` seconds to the queue."""
+        requeued = []
+        for name in os.listdir(self.folder / "running"):
+            if not name.endswith(".json") or name.startswith("."):
+                continue
+
+            job_id = name[: -len(".json")]
+            running_path = self._get_path("running", job_id)
+            try:
+                if time.time() - running_path.stat().st_mtime < timeout:
+                    continue
+                os.rename(running_path, self._get_path("pending", job_id))
+            except FileNotFoundError:  # Completed in the meantime
+                continue
+
+            requeued.append(job_id)
+
+        return requeued
+
+    def get_state(self, job_id: str) -> Optional[str]:
+        for state in reversed(JOB_STATES):  # Jobs are written to their next state before being removed from the last
+            if self._get_path(state, job_id).exists():
+                return state
+
+        return None
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        state = self.get_state(job_id)
+        return None if state is None else dict(_read_json(self._get_path(state, job_id)) or dict(), state=state)
+
+    def get_progress(self, job_id: str) -> Optional[dict]:
+        return _read_json(self._get_progress_path(job_id))
+
+    def get_status(self, job_ids: Optional[List[str]] = None) -> dict:
+        """The number of jobs in each state, among the given jobs or across the whole queue."""
+        if job_ids is None:
+            return {
+                state: sum(1 for name in os.listdir(self.folder / state) if not name.startswith("."))
+                for state in JOB_STATES
+            }
+
+        status = {state: 0 for state in JOB_STATES}
+        for job_id in job_ids:
+            state = self.get_state(job_id)
+            if state is not None:
+                status[state] += 1
+
+        return status
+
+
+def run_job(queue: FileSystemJobQueue, job: dict, function: Optional[Callable] = None) -> bool:
+    """
+    Run a claimed job, reporting its progress to the queue and marking it alive until it completes.
+
+    If the job is returned to the queue as stale in the meantime, it is abandoned: the job is interrupted (when run on
+    the main thread) and its outcome is not recorded, since another worker may already be running it.
+    Returns whether the outcome of the job was recorded.
+    """
+    from .manage_neuroconv import convert_to_nwb
+
+    function = function or convert_to_nwb
+
+    # Progress is written to the shared file system no more often than the queue allows
+    update_rate = min(job.get("progress_update_rate") or JOB_PROGRESS_UPDATE_RATE, JOB_PROGRESS_UPDATE_RATE)
+    initialize_progress_worker(JobProgressWriter(queue._get_progress_path(job["job_id"])), update_rate=update_rate)
+
+    stop_heartbeat = threading.Event()
+    abandoned = threading.Event()
+    interrupt_job = threading.current_thread() is threading.main_thread()
+
+    def heartbeat():
+        while not stop_heartbeat.wait(HEARTBEAT_INTERVAL):
+            if not queue.heartbeat(job):
+                abandoned.set()
+                if interrupt_job:
+                    _thread.interrupt_main()  # Stop writing the output the new claim of the job will write
+                return
+
+    heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+    heartbeat_thread.start()
+
+    try:
+        try:
+            result = function(job["info"], **job["kwargs"])
+        finally:
+            stop_heartbeat.set()
+            heartbeat_thread.join()
+    except KeyboardInterrupt:
+        if not abandoned.is_set():
+            raise
+        return False
+    except Exception as exception:
+        return queue.fail(job, error=str(exception), error_traceback=traceback.format_exc())
+    else:
+        return queue.complete(job, result=result)
+    finally:
+        initialize_progress_worker(None)  # Announce any later progress directly
+
+
+def run_worker(
+    queue_folder: str,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    exit_when_empty: bool = False,
+    max_jobs: Optional[int] = None,
+    number_of_threads: Optional[int] = None,
+    pin_cpus: bool = False,
+    worker_index: int = 0,
+) -> int:
+    """
+    Claim and run jobs from the queue one at a time until it is empty (if `exit_when_empty`) or `max_jobs` have run.
+
+    The native libraries of the worker may be limited to `number_of_threads`, and the worker pinned to as many cores.
+
+    Returns the number of jobs run.
+    """
+    queue = FileSystemJobQueue(queue_folder)
+    worker_id = get_worker_id()
+
+    initialize_worker_threads(worker_index=worker_index)
+    if number_of_threads is not None:
+        limit_native_threads(number_of_threads)
+
+    number_of_jobs = 0
+    while max_jobs is None or number_of_jobs < max_jobs:
+        job = queue.claim(worker_id=worker_id)
+        if job is None:
+            if exit_when_empty:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        # Jobs may ask to be pinned, even if the worker was not started with `pin_cpus`
+        if number_of_threads is not None:
+            pin_to_cpus(number_of_threads if pin_cpus or job.get("pin_cpus") else None)
+
+        print(f"[{worker_id}] Running job {job['job_id']}", flush=True)
+        if not run_job(queue=queue, job=job):
+            print(f"[{worker_id}] Abandoned job {job['job_id']}, which was returned to the queue", flush=True)
+        number_of_jobs += 1
+
+    return number_of_jobs
+
+
+def run_workers(queue_folder: str, number_of_processes: int = 1, **kwargs) -> None:
+    """Run several workers on this machine, each in its own process and limited to its share of the logical cores."""
+    kwargs.setdefault("number_of_threads", get_threads_per_worker(number_of_processes))
+
+    if number_of_processes == 1:
+        run_worker(queue_folder, **kwargs)
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(queue_folder,), kwargs=dict(kwargs, worker_index=index))
+        for index in range(number_of_processes)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def run_queued(
+    queue: FileSystemJobQueue,
+    jobs: List[Tuple[int, tuple, dict]],
+    on_progress_update: Optional[Callable[[dict], None]] = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    progress_update_rate: Optional[float] = None,
+    pin_cpus: bool = False,
+) -> Iterator[Tuple[Future, Dict[str, Any]]]:
+    """
+    Submit jobs, given as (size, (info,), kwargs), to the queue largest-first and wait for workers to run them.
+
+    Like `run_scheduled`, yields a future for each completed job along with the time it spent queued and running (in
+    seconds). The latest progress updates of running jobs are passed to `on_progress_update` as they are reported.
+    """
+    order = sorted(range(len(jobs)), key=lambda index: jobs[index][0], reverse=True)
+    job_ids = dict()
+    for priority, index in enumerate(order):
+        __, (info,), kwargs = jobs[index]
+        job_id = queue.submit(
+            info, priority=priority, progress_update_rate=progress_update_rate, pin_cpus=pin_cpus, **kwargs
+        )
+        job_ids[job_id] = index
+
+    reported = dict()  # Modification time of the progress last reported for each job
+    number_of_events = dict()  # Number of events already reported for each job
+    while job_ids:
+        queue.requeue_stale_jobs()
+
+        for job_id, index in list(job_ids.items()):
+            state = queue.get_state(job_id)
+
+            if on_progress_update is not None and state in ("running", "done", "failed"):
+                progress_path = queue._get_progress_path(job_id)
+                try:
+                    modification_time = progress_path.stat().st_mtime_ns
+                except FileNotFoundError:
+                    modification_time = None
+
+                if modification_time is not None and reported.get(job_id) != modification_time:
+                    reported[job_id] = modification_time
+                    progress = queue.get_progress(job_id) or dict()
+                    events = progress.get("events", [])
+                    for update in [*progress.get("updates", []), *events[number_of_events.get(job_id, 0) :]]:
+                        on_progress_update(update)
+                    number_of_events[job_id] = len(events)
+
+            if state not in ("done", "failed"):
+                continue
+
+            job = queue.get_job(job_id)
+            future = Future()
+            if state == "done":
+                future.set_result(job["result"])
+            else:
+                future.set_exception(RuntimeError(f"Job {job_id} failed on {job.get('worker_id')}: {job['error']}"))
+
+            del job_ids[job_id]
+            started = job.get("started", job["finished"])
+            yield future, dict(
+                index=index,
+                queue_time=started - job["submitted"],
+                run_time=job["finished"] - started,
+                worker_id=job.get("worker_id"),
+            )
+
+        if job_ids:
+            time.sleep(poll_interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the conversion jobs submitted to a GUIDE job queue.")
+    parser.add_argument("queue_folder", help="Folder of the job queue, shared with the GUIDE server.")
+    parser.add_argument("--number-of-processes", type=int, default=1, help="Number of jobs run at once on this node.")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    parser.add_argument("--exit-when-empty", action="store_true", help="Stop once no jobs are pending.")
+    parser.add_argument("--max-jobs", type=int, default=None, help="Stop each process after this many jobs.")
+    parser.add_argument("--pin-cpus", action="store_true", help="Pin each process to its own cores (Linux only).")
+    arguments = parser.parse_args()
+
+    run_workers(
+        arguments.queue_folder,
+        number_of_processes=arguments.number_of_processes,
+        poll_interval=arguments.poll_interval,
+        exit_when_empty=arguments.exit_when_empty,
+        max_jobs=arguments.max_jobs,
+        pin_cpus=arguments.pin_cpus,
+    )
+
+
+if __name__ == "__main__":
+    main()
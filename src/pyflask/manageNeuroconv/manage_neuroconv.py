@@ -3,20 +3,23 @@
 import copy
 import hashlib
 import inspect
+import itertools
 import json
 import math
 import os
 import re
+import time
 import traceback
 import zoneinfo
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from shutil import copytree, rmtree
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 from pynwb import NWBFile
-from tqdm_publisher import TQDMProgressHandler
 
+from .caches import LRUCache
 from .info import (
     CONVERSION_SAVE_FOLDER_PATH,
     GUIDE_ROOT_FOLDER,
@@ -25,8 +28,19 @@ from .info import (
     resource_path,
 )
 from .info.sse import format_sse
-
-progress_handler = TQDMProgressHandler()
+from .progress import (
+    DEFAULT_PROGRESS_UPDATE_RATE,
+    announce_event,
+    create_progress_reporter,
+    progress_handler,
+)
+from .project_store import pin_session_reference, resolve_session_reference
+from .read_ahead import (
+    DEFAULT_READ_AHEAD_BUFFERS,
+    DEFAULT_READ_AHEAD_THREADS,
+    enable_read_ahead,
+)
+from .telemetry import ConversionTelemetry, record_phase, time_phase
 
 EXCLUDED_RECORDING_INTERFACE_PROPERTIES = ["contact_vector", "contact_shapes", "group", "location"]
 
@@ -92,6 +106,29 @@ DTYPE_DESCRIPTIONS = {
     "int64": "64-bit integer",
 }
 
+# Timestamps files are parsed in blocks of this many lines to bound the memory used by the text parser
+TIMESTAMPS_FILE_CHUNK_SIZE = 1_000_000
+
+# Memory that each process may hold in timestamps parsed from text files, kept to serve repeated alignment requests
+TIMESTAMPS_CACHE_SIZE_IN_BYTES = 256 * 1024**2
+
+# Number of timestamps converted and sent at once when streaming the timestamps of an interface
+TIMESTAMPS_STREAM_CHUNK_SIZE = 1_000_000
+
+# Aligned timestamps that never stray further than this fraction of a sampling period from a regular grid
+# are written as a starting time and rate instead of a full timestamps array
+DEFAULT_REGULAR_TIMESTAMPS_TOLERANCE = 0.05
+
+# Timeline overviews report a fixed-size envelope and at most this many of the longest gaps per interface
+DEFAULT_TIMELINE_OVERVIEW_BINS = 512
+MAX_TIMELINE_OVERVIEW_GAPS = 100
+
+# Intervals between timestamps longer than this multiple of the typical sampling period are reported as gaps
+TIMELINE_GAP_FACTOR = 10
+
+# Binary timestamps files without a header (e.g. `.bin`) are assumed to hold little-endian float64 values
+BINARY_TIMESTAMPS_FILE_SUFFIXES = [".bin", ".dat"]
+
 DTYPE_SCHEMA = {
     "type": "string",
     # "strict": False,
@@ -364,7 +401,12 @@ def get_custom_converter(interface_class_dict: dict, alignment_info: Union[dict,
         # Handle temporal alignment inside the converter
         # TODO: this currently works off of cross-scoping injection of `alignment_info` - refactor to be more explicit
         def temporally_align_data_interfaces(self):
+            # The same converter may be aligned before building an in-memory NWBFile and again when it is written
+            if getattr(self, "_is_temporally_aligned", False):
+                return
+
             set_interface_alignment(self, alignment_info=alignment_info)
+            self._is_temporally_aligned = True
 
         # From previous issue regarding SpikeGLX not generating previews of correct size
         def add_to_nwbfile(self, nwbfile: NWBFile, metadata, conversion_options: Optional[dict] = None) -> None:
@@ -736,15 +778,110 @@ def validate_metadata(
     return json.loads(json.dumps(result, cls=InspectorOutputJSONEncoder))
 
 
-def set_interface_alignment(converter: dict, alignment_info: dict) -> dict:
+def _count_lines(file_path: Path, block_size: int = 2**24) -> int:
+    """Count the lines of a text file by scanning raw blocks of bytes."""
+    number_of_lines = 0
+    last_block = b""
+    with open(file=file_path, mode="rb") as io:
+        while block := io.read(block_size):
+            number_of_lines += block.count(b"\n")
+            last_block = block
+
+    # Account for a final line without a trailing newline character
+    if last_block and not last_block.endswith(b"\n"):
+        number_of_lines += 1
+
+    return number_of_lines
 
+
+def _get_resident_size(timestamps: "np.ndarray") -> int:
+    import numpy as np
+
+    # Memory-mapped arrays are paged in from their file, rather than held by the process
+    return 0 if isinstance(timestamps, np.memmap) else timestamps.nbytes
+
+
+# Timestamps parsed from text files, keyed by path, modification time, and size
+# Bounded by bytes, as the workers of the persistent pool otherwise keep every array they loaded for their lifetime
+TIMESTAMPS_CACHE = LRUCache(max_size=TIMESTAMPS_CACHE_SIZE_IN_BYTES, get_size=_get_resident_size)
+
+
+def _load_timestamps_file(file_path: Path) -> "np.ndarray":
     import numpy as np
+    import pandas as pd
+
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+
+    if suffix == ".npy":
+        timestamps = np.load(file=file_path, mmap_mode="r")
+        return timestamps.ravel() if timestamps.ndim > 1 else timestamps
+
+    if suffix in BINARY_TIMESTAMPS_FILE_SUFFIXES:
+        return np.memmap(filename=file_path, dtype="<f8", mode="r")
+
+    # Can be .txt, .csv, .tsv, etc.
+    # Only the first column of each line is read as the timestamp
+    # Preallocate the output so the text parser only ever holds a single chunk in memory
+    timestamps = np.empty(shape=(_count_lines(file_path),), dtype="float64")
+
+    chunks = pd.read_csv(
+        file_path,
+        sep="\t" if suffix == ".tsv" else ",",
+        header=None,
+        usecols=[0],
+        dtype="float64",
+        engine="c",
+        chunksize=TIMESTAMPS_FILE_CHUNK_SIZE,
+    )
+
+    number_of_timestamps = 0
+    for chunk in chunks:
+        values = chunk.iloc[:, 0].to_numpy()
+        timestamps[number_of_timestamps : number_of_timestamps + values.shape[0]] = values
+        number_of_timestamps += values.shape[0]
+
+    # Blank lines are skipped by the parser
+    timestamps = timestamps[:number_of_timestamps]
+    timestamps.flags.writeable = False  # Cached arrays are shared across alignment requests
+
+    return timestamps
+
+
+def load_timestamps_file(file_path: Union[str, Path]) -> "np.ndarray":
+    """
+    Load a file of timestamps (in seconds) for temporal alignment.
+
+    Text files (.txt, .csv, .tsv, etc.) must hold one timestamp per line and are parsed in chunks.
+    Binary `.npy` files, or headerless little-endian float64 `.bin`/`.dat` files, are memory mapped.
+    Parsed arrays are cached by path, modification time, and size to serve repeated alignment requests.
+    """
+    file_path = Path(file_path).resolve()
+    file_stat = file_path.stat()
+
+    cache_key = (str(file_path), file_stat.st_mtime_ns, file_stat.st_size)
+    timestamps = TIMESTAMPS_CACHE.get(cache_key)
+    if timestamps is None:
+        timestamps = TIMESTAMPS_CACHE[cache_key] = _load_timestamps_file(file_path)
+
+    return timestamps
+
+
+def set_interface_alignment(converter: dict, alignment_info: dict) -> tuple:
+    """
+    Apply the temporal alignment selected for each interface.
+
+    Returns the errors raised per interface, as well as how the aligned timestamps of each interface
+    aligned by the 'timestamps' method will be written (as a starting time and rate, or as a full array).
+    """
+
     from neuroconv.datainterfaces.ecephys.basesortingextractorinterface import (
         BaseSortingExtractorInterface,
     )
     from neuroconv.tools.testing.mock_interfaces import MockRecordingInterface
 
     errors = {}
+    timing = {}
 
     for name, interface in converter.data_interface_objects.items():
 
@@ -763,11 +900,7 @@ def set_interface_alignment(converter: dict, alignment_info: dict) -> dict:
         try:
             if method == "timestamps":
 
-                # Open the input file for reading
-                # Can be .txt, .csv, .tsv, etc.
-                # But timestamps must be scalars separated by newline characters
-                with open(file=value, mode="r") as io:
-                    aligned_timestamps = np.array([float(line.strip()) for line in io.readlines()])
+                aligned_timestamps = load_timestamps_file(file_path=value)
 
                 # Special case for sorting interfaces; to set timestamps they must have a recording registered
                 must_set_mock_recording = (
@@ -777,7 +910,7 @@ def set_interface_alignment(converter: dict, alignment_info: dict) -> dict:
                 if must_set_mock_recording is True:
                     sorting_extractor = interface.sorting_extractor
                     sampling_frequency = sorting_extractor.get_sampling_frequency()
-                    end_frame = timestamps_array.shape[0]
+                    end_frame = aligned_timestamps.shape[0]
                     mock_recording_interface = MockRecordingInterface(
                         sampling_frequency=sampling_frequency,
                         durations=[end_frame / sampling_frequency],
@@ -785,7 +918,16 @@ def set_interface_alignment(converter: dict, alignment_info: dict) -> dict:
                     )
                     interface.register_recording(recording_interface=mock_recording_interface)
 
-                interface.set_aligned_timestamps(aligned_timestamps=aligned_timestamps)
+                # Avoid writing the full timestamps array when the timestamps are regular
+                tolerance = info.get("tolerance", DEFAULT_REGULAR_TIMESTAMPS_TOLERANCE)
+                regular_timing = set_regular_timing(
+                    interface=interface, aligned_timestamps=aligned_timestamps, tolerance=tolerance
+                )
+                if regular_timing is not None:
+                    timing[name] = dict(representation="rate", **regular_timing)
+                else:
+                    interface.set_aligned_timestamps(aligned_timestamps=aligned_timestamps)
+                    timing[name] = dict(representation="timestamps")
 
             # Special case for sorting interfaces; a recording interface to be converted may be registered/linked
             elif method == "linked":
@@ -797,10 +939,124 @@ def set_interface_alignment(converter: dict, alignment_info: dict) -> dict:
         except Exception as e:
             errors[name] = str(e)
 
-    return errors
+    return errors, timing
+
+
+def get_source_data_fingerprint(info: dict, include_alignment: bool = False) -> str:
+    """
+    Hash the interfaces and source data (and optionally the alignment) of a session into a fingerprint.
+
+    The size and modification time of every file referenced by the source data or alignment, including the files
+    within referenced folders, are included, so that the fingerprint changes when the underlying data does.
+    """
+
+    def describe_path(path: str) -> list:
+        try:
+            path_stat = Path(path).stat()
+            if not Path(path).is_dir():
+                return [path, path_stat.st_size, path_stat.st_mtime_ns]
+
+            # Files edited in place change neither the size nor the modification time of their folder
+            contents = []
+            for file_path in Path(path).rglob("*"):
+                if file_path.is_file():
+                    file_stat = file_path.stat()
+                    contents.append([str(file_path.relative_to(path)), file_stat.st_size, file_stat.st_mtime_ns])
+
+            return [path, hashlib.sha256(json.dumps(sorted(contents)).encode()).hexdigest()]
+        except (OSError, ValueError):
+            return [path, None, None]
+
+    def describe_source_data(value, key: str = "") -> Any:
+        if isinstance(value, dict):
+            return {sub_key: describe_source_data(sub_value, sub_key) for sub_key, sub_value in value.items()}
+        elif isinstance(value, list):
+            return [describe_source_data(item, key) for item in value]
+        elif isinstance(value, str) and (key.endswith("_path") or key.endswith("_paths") or key == "timestamps"):
+            return describe_path(value)
+        else:
+            return value
+
+    fingerprint_info = dict(
+        interfaces=info.get("interfaces", dict()), source_data=describe_source_data(info.get("source_data", dict()))
+    )
+    if include_alignment:
+        fingerprint_info["alignment"] = describe_source_data(info.get("alignment", dict()))
+
+    return hashlib.sha256(json.dumps(fingerprint_info, sort_keys=True, default=str).encode()).hexdigest()
 
 
-def get_compatible_interfaces(info: dict) -> dict:
+def get_source_data_size(info: dict) -> int:
+    """Estimate the input size of a session as the total size of the files (and folder contents) of its source data."""
+
+    def get_path_size(path: Path) -> int:
+        try:
+            if path.is_dir():
+                return sum(file_path.stat().st_size for file_path in path.rglob("*") if file_path.is_file())
+            return path.stat().st_size
+        except (OSError, ValueError):
+            return 0
+
+    def get_source_data_size_per_value(value, key: str = "") -> int:
+        if isinstance(value, dict):
+            return sum(get_source_data_size_per_value(sub_value, sub_key) for sub_key, sub_value in value.items())
+        elif isinstance(value, list):
+            return sum(get_source_data_size_per_value(item, key) for item in value)
+        elif isinstance(value, str) and (key.endswith("_path") or key.endswith("_paths")):
+            return get_path_size(Path(value))
+        else:
+            return 0
+
+    return get_source_data_size_per_value(info.get("source_data", dict()))
+
+
+# Compatibility between sorting and recording interfaces, keyed by source data fingerprint
+COMPATIBLE_INTERFACES_CACHE = LRUCache(max_entries=1024)
+
+# Timeline overviews of aligned interfaces, keyed by source data and alignment fingerprint
+TIMELINE_OVERVIEW_CACHE = LRUCache(max_entries=128)
+
+# Default backend configurations, keyed by session fingerprint and backend
+BACKEND_CONFIGURATION_CACHE = LRUCache(max_entries=64)
+
+# Configured NWB Inspector checks, keyed by the sorted names of the ignored checks
+INSPECTOR_CHECKS_CACHE = LRUCache(max_entries=16)
+
+# Fraction of the memory budget of a session given to the buffers of its iterators
+BUFFER_MEMORY_FRACTION = 0.5
+
+# Default size of iterator buffers (in GB), above which a memory budget never raises them
+DEFAULT_BUFFER_GB = 1.0
+
+# Smallest iterator buffer (in GB), which must still hold the default chunk of 10 MB
+MINIMUM_BUFFER_GB = 0.02
+
+
+def get_session_fingerprint(info: dict) -> str:
+    """Hash everything that determines the contents of a converted session: source data, alignment, and metadata."""
+    from neuroconv.utils.json_schema import NWBMetaDataEncoder
+
+    session_info = dict(
+        source=get_source_data_fingerprint(info, include_alignment=True),
+        metadata=info.get("metadata", dict()),
+        timezone=info.get("timezone"),
+    )
+
+    return hashlib.sha256(json.dumps(session_info, sort_keys=True, cls=NWBMetaDataEncoder).encode()).hexdigest()
+
+
+def _is_recording_compatible(sorting_interface, recording_interface) -> bool:
+    """Attempt to register a recording on a copy of the sorting extractor, leaving that of the interface untouched."""
+    sorting_extractor = copy.copy(sorting_interface.sorting_extractor)
+
+    try:
+        sorting_extractor.register_recording(recording=recording_interface.recording_extractor)
+        return True
+    except Exception:
+        return False
+
+
+def get_compatible_interfaces(converter: "NWBConverter", fingerprint: Optional[str] = None) -> dict:
 
     from neuroconv.datainterfaces.ecephys.baserecordingextractorinterface import (
         BaseRecordingExtractorInterface,
@@ -809,51 +1065,203 @@ def get_compatible_interfaces(info: dict) -> dict:
         BaseSortingExtractorInterface,
     )
 
-    converter = instantiate_custom_converter(source_data=info["source_data"], interface_class_dict=info["interfaces"])
-
-    compatible = {}
+    if fingerprint is not None and fingerprint in COMPATIBLE_INTERFACES_CACHE:
+        return copy.deepcopy(COMPATIBLE_INTERFACES_CACHE[fingerprint])
 
-    for name, interface in converter.data_interface_objects.items():
+    sorting_interfaces = {
+        name: interface
+        for name, interface in converter.data_interface_objects.items()
+        if isinstance(interface, BaseSortingExtractorInterface)
+    }
 
-        is_sorting = isinstance(interface, BaseSortingExtractorInterface)
+    # If at least one recording and sorting interface is selected on the formats page
+    # Then it is possible the two could be linked (the sorting was applied to the recording)
+    # But there are very strict conditions from SpikeInterface determining compatibility
+    # Those conditions are not easily exposed so we just 'try' to register them and skip on error
+    recording_interfaces = {
+        name: interface
+        for name, interface in converter.data_interface_objects.items()
+        if isinstance(interface, BaseRecordingExtractorInterface)
+    }
 
-        if is_sorting is True:
-            compatible[name] = []
-
-        # If at least one recording and sorting interface is selected on the formats page
-        # Then it is possible the two could be linked (the sorting was applied to the recording)
-        # But there are very strict conditions from SpikeInterface determining compatibility
-        # Those conditions are not easily exposed so we just 'try' to register them and skip on error
-        sibling_recording_interfaces = {
-            interface_key: interface
-            for interface_key, interface in converter.data_interface_objects.items()
-            if isinstance(interface, BaseRecordingExtractorInterface)
-        }
+    compatible = {
+        sorting_name: [
+            recording_name
+            for recording_name, recording_interface in recording_interfaces.items()
+            if _is_recording_compatible(sorting_interface=sorting_interface, recording_interface=recording_interface)
+        ]
+        for sorting_name, sorting_interface in sorting_interfaces.items()
+    }
 
-        for recording_interface_key, recording_interface in sibling_recording_interfaces.items():
-            try:
-                interface.register_recording(recording_interface=recording_interface)
-                compatible[name].append(recording_interface_key)
-            except Exception:
-                pass
+    if fingerprint is not None:
+        COMPATIBLE_INTERFACES_CACHE[fingerprint] = copy.deepcopy(compatible)
 
     return compatible
 
 
-def get_interface_alignment(info: dict) -> dict:
-
+def get_aligned_interface_timestamps(interface) -> Union["np.ndarray", None]:
+    """Resolve the (aligned) timestamps of a single interface as a flat array, or None if unavailable."""
+    import numpy as np
     from neuroconv.basetemporalalignmentinterface import BaseTemporalAlignmentInterface
+
+    if not isinstance(interface, BaseTemporalAlignmentInterface):
+        return None
+
+    # Note: it is technically possible to have a BaseTemporalAlignmentInterface that has not yet implemented
+    # the `get_timestamps` method; try to get this but skip on error
+    try:
+        interface_timestamps = interface.get_timestamps()
+    except Exception:
+        return None
+
+    if len(interface_timestamps) == 1:
+        interface_timestamps = interface_timestamps[0]
+
+    # Some interfaces, such as video or audio, may return a list of arrays
+    # corresponding to each file of their `file_paths` input
+    # Note: GUIDE only currently supports single files for these interfaces
+    # Thus, unpack only the first array
+    if isinstance(interface_timestamps, list):
+        interface_timestamps = interface_timestamps[0]
+
+    return np.asarray(interface_timestamps, dtype="float64").ravel()
+
+
+def summarize_timestamps(timestamps: "np.ndarray") -> dict:
+    """
+    Summarize a timestamps array without shipping the full array.
+
+    The estimated rate assumes regular spacing between the first and last timestamp;
+    `max_deviation` reports (in seconds) how far any timestamp strays from that regular grid.
+    """
+    import numpy as np
+
+    count = int(timestamps.shape[0])
+    if count == 0:
+        return dict(start=None, stop=None, count=0, rate=None, max_deviation=None)
+
+    start = float(timestamps[0])
+    stop = float(timestamps[-1])
+
+    if count == 1 or stop == start:
+        return dict(start=start, stop=stop, count=count, rate=None, max_deviation=0.0)
+
+    rate = (count - 1) / (stop - start)
+
+    # Compare against the regular grid in blocks to bound the size of temporary arrays
+    max_deviation = 0.0
+    for block_start in range(0, count, TIMESTAMPS_FILE_CHUNK_SIZE):
+        block = np.asarray(timestamps[block_start : block_start + TIMESTAMPS_FILE_CHUNK_SIZE])
+        regular_block = start + np.arange(block_start, block_start + block.shape[0]) / rate
+        max_deviation = max(max_deviation, float(np.max(np.abs(block - regular_block))))
+
+    return dict(start=start, stop=stop, count=count, rate=rate, max_deviation=max_deviation)
+
+
+def detect_regular_timestamps(
+    timestamps: "np.ndarray", tolerance: float = DEFAULT_REGULAR_TIMESTAMPS_TOLERANCE
+) -> Union[dict, None]:
+    """
+    Detect whether timestamps are regularly sampled, returning their starting time and rate if so.
+
+    The tolerance is expressed as a fraction of the estimated sampling period.
+    """
+    summary = summarize_timestamps(timestamps)
+    if summary["rate"] is None:
+        return None
+
+    if summary["max_deviation"] * summary["rate"] > tolerance:
+        return None
+
+    return dict(starting_time=summary["start"], rate=summary["rate"])
+
+
+def set_regular_timing(
+    interface, aligned_timestamps: "np.ndarray", tolerance: float = DEFAULT_REGULAR_TIMESTAMPS_TOLERANCE
+) -> Union[dict, None]:
+    """
+    Align a SpikeInterface-backed interface to the starting time of each segment instead of a full timestamps array.
+
+    Only applies if the timestamps of every segment are regular and their rate matches the native sampling frequency
+    closely enough that the accumulated drift over each segment stays within the tolerance. The timestamps are then
+    replaced by the regular grid of the native sampling frequency, which NeuroConv writes as a starting time and rate.
+    Returns the starting time of each segment and the rate written if the alignment was applied, or None otherwise.
+    """
+    import numpy as np
+    from neuroconv.datainterfaces.ecephys.baserecordingextractorinterface import (
+        BaseRecordingExtractorInterface,
+    )
     from neuroconv.datainterfaces.ecephys.basesortingextractorinterface import (
         BaseSortingExtractorInterface,
     )
 
+    if isinstance(interface, BaseRecordingExtractorInterface):
+        sampling_frequency = interface.recording_extractor.get_sampling_frequency()
+    elif isinstance(interface, BaseSortingExtractorInterface) and interface.sorting_extractor.has_recording():
+        sampling_frequency = interface.sorting_extractor.get_sampling_frequency()
+    else:
+        return None
+
+    # The aligned timestamps of every segment follow one another in the file
+    original_timestamps = interface.get_timestamps()
+    if not isinstance(original_timestamps, list):
+        original_timestamps = [original_timestamps]
+    segment_lengths = [len(segment_timestamps) for segment_timestamps in original_timestamps]
+    if sum(segment_lengths) != aligned_timestamps.shape[0]:
+        return None
+
+    segment_starting_times = []
+    for segment_timestamps in np.split(aligned_timestamps, np.cumsum(segment_lengths)[:-1]):
+        regular_timing = detect_regular_timestamps(timestamps=segment_timestamps, tolerance=tolerance)
+        if regular_timing is None:
+            return None
+
+        drift_in_periods = abs((len(segment_timestamps) - 1) * (sampling_frequency / regular_timing["rate"] - 1))
+        if drift_in_periods > tolerance:
+            return None
+
+        segment_starting_times.append(regular_timing["starting_time"])
+
+    regular_segment_timestamps = [
+        starting_time + np.arange(segment_length) / sampling_frequency
+        for starting_time, segment_length in zip(segment_starting_times, segment_lengths)
+    ]
+    if len(regular_segment_timestamps) == 1:
+        interface.set_aligned_timestamps(aligned_timestamps=regular_segment_timestamps[0])
+    else:
+        interface.set_aligned_segment_timestamps(aligned_segment_timestamps=regular_segment_timestamps)
+
+    return dict(
+        starting_time=segment_starting_times[0], rate=sampling_frequency, segment_starting_times=segment_starting_times
+    )
+
+
+def get_aligned_converter(info: dict, with_compatibility: bool = False) -> tuple:
+    """
+    Instantiate the converter for a session and apply any requested temporal alignment to it.
+
+    If requested, the sorting/recording compatibility is resolved on the same converter before alignment.
+    """
     alignment_info = info.get("alignment", dict())
 
     converter = instantiate_custom_converter(source_data=info["source_data"], interface_class_dict=info["interfaces"])
 
-    compatibility = get_compatible_interfaces(info)
+    compatibility = None
+    if with_compatibility:
+        compatibility = get_compatible_interfaces(converter=converter, fingerprint=get_source_data_fingerprint(info))
+
+    errors, timing = set_interface_alignment(converter=converter, alignment_info=alignment_info)
+
+    return converter, errors, timing, compatibility
 
-    errors = set_interface_alignment(converter=converter, alignment_info=alignment_info)
+
+def get_interface_alignment(info: dict) -> dict:
+
+    from neuroconv.datainterfaces.ecephys.basesortingextractorinterface import (
+        BaseSortingExtractorInterface,
+    )
+
+    converter, errors, timing, compatibility = get_aligned_converter(info, with_compatibility=True)
 
     metadata = dict()
     timestamps = dict()
@@ -868,35 +1276,157 @@ def get_interface_alignment(info: dict) -> dict:
         if is_sorting is True:
             metadata[name]["compatible"] = compatibility.get(name, None)
 
-        if not isinstance(interface, BaseTemporalAlignmentInterface):
-            timestamps[name] = []
-            continue
-
-        # Note: it is technically possible to have a BaseTemporalAlignmentInterface that has not yet implemented
-        # the `get_timestamps` method; try to get this but skip on error
-        try:
-            interface_timestamps = interface.get_timestamps()
-            if len(interface_timestamps) == 1:
-                interface_timestamps = interface_timestamps[0]
-
-            # Some interfaces, such as video or audio, may return a list of arrays
-            # corresponding to each file of their `file_paths` input
-            # Note: GUIDE only currently supports single files for these interfaces
-            # Thus, unpack only the first array
-            if isinstance(interface_timestamps, list):
-                interface_timestamps = interface_timestamps[0]
-
-            timestamps[name] = interface_timestamps.tolist()
-        except Exception:
-            timestamps[name] = []
+        interface_timestamps = get_aligned_interface_timestamps(interface)
+        timestamps[name] = None if interface_timestamps is None else summarize_timestamps(interface_timestamps)
 
     return dict(
         metadata=metadata,
         timestamps=timestamps,
+        timing=timing,
         errors=errors,
     )
 
 
+def summarize_timeline(timestamps: "np.ndarray", number_of_bins: int = DEFAULT_TIMELINE_OVERVIEW_BINS) -> dict:
+    """
+    Decimate a timestamps array into a fixed-size min/max envelope along with its longest gaps.
+
+    The timestamps are split into `number_of_bins` consecutive bins of (nearly) equal sample counts.
+    Gaps are intervals longer than `TIMELINE_GAP_FACTOR` times the median sampling period.
+    """
+    import numpy as np
+
+    count = int(timestamps.shape[0])
+    overview = dict(start=None, stop=None, count=count, envelope=dict(min=[], max=[]), gaps=[], truncated_gaps=False)
+    if count == 0:
+        return overview
+
+    overview.update(start=float(timestamps[0]), stop=float(timestamps[-1]))
+
+    bin_edges = np.unique(np.linspace(start=0, stop=count, num=min(number_of_bins, count) + 1, dtype="int64")[:-1])
+    overview["envelope"] = dict(
+        min=np.minimum.reduceat(timestamps, bin_edges).tolist(),
+        max=np.maximum.reduceat(timestamps, bin_edges).tolist(),
+    )
+
+    if count < 2:
+        return overview
+
+    # Estimate the typical sampling period from the first block to avoid differencing the whole array at once
+    first_block = np.asarray(timestamps[:TIMESTAMPS_FILE_CHUNK_SIZE])
+    gap_threshold = TIMELINE_GAP_FACTOR * float(np.median(np.diff(first_block)))
+
+    gap_starts = []
+    gap_stops = []
+    for block_start in range(0, count - 1, TIMESTAMPS_FILE_CHUNK_SIZE):
+        # Overlap consecutive blocks by one sample so the interval between them is not missed
+        block = np.asarray(timestamps[block_start : block_start + TIMESTAMPS_FILE_CHUNK_SIZE + 1])
+        gap_indices = np.flatnonzero(np.diff(block) > gap_threshold)
+        gap_starts.append(block[gap_indices])
+        gap_stops.append(block[gap_indices + 1])
+
+    gap_starts = np.concatenate(gap_starts)
+    gap_stops = np.concatenate(gap_stops)
+
+    # Only keep the longest gaps, reported in chronological order
+    if gap_starts.shape[0] > MAX_TIMELINE_OVERVIEW_GAPS:
+        longest = np.sort(np.argsort(gap_stops - gap_starts)[-MAX_TIMELINE_OVERVIEW_GAPS:])
+        gap_starts = gap_starts[longest]
+        gap_stops = gap_stops[longest]
+        overview["truncated_gaps"] = True
+
+    overview["gaps"] = np.stack([gap_starts, gap_stops], axis=1).tolist()
+
+    return overview
+
+
+def get_timeline_overview(info: dict) -> dict:
+    """
+    Summarize the aligned timeline of every interface in a session with a payload independent of recording length.
+
+    Results are cached by a fingerprint of the interfaces, source data, and alignment.
+    """
+    number_of_bins = info.get("number_of_bins", None) or DEFAULT_TIMELINE_OVERVIEW_BINS
+    if number_of_bins < 1:
+        raise ValueError(f"The number of bins must be a positive integer, but received {number_of_bins}.")
+
+    cache_key = (get_source_data_fingerprint(info, include_alignment=True), number_of_bins)
+    if cache_key in TIMELINE_OVERVIEW_CACHE:
+        return copy.deepcopy(TIMELINE_OVERVIEW_CACHE[cache_key])
+
+    converter, errors, _, _ = get_aligned_converter(info)
+
+    timelines = dict()
+    for name, interface in converter.data_interface_objects.items():
+        interface_timestamps = get_aligned_interface_timestamps(interface)
+        timelines[name] = (
+            None if interface_timestamps is None else summarize_timeline(interface_timestamps, number_of_bins)
+        )
+
+    overview = dict(timelines=timelines, number_of_bins=number_of_bins, errors=errors)
+    TIMELINE_OVERVIEW_CACHE[cache_key] = copy.deepcopy(overview)
+
+    return overview
+
+
+def get_interface_timestamps(info: dict) -> "np.ndarray":
+    """
+    Fetch the full or decimated timestamps of a single interface, as a view of its aligned timestamps.
+
+    The `start` and `stop` indices select a range of the timestamps and `step` keeps every n-th value within it.
+    """
+    import numpy as np
+
+    name = info["interface"]
+    start = info.get("start", None)
+    stop = info.get("stop", None)
+    step = info.get("step", None) or 1
+
+    if step < 1:
+        raise ValueError(f"The decimation step must be a positive integer, but received {step}.")
+
+    converter, errors, _, _ = get_aligned_converter(info)
+
+    if name not in converter.data_interface_objects:
+        raise KeyError(f"The interface '{name}' is not part of this session.")
+
+    if name in errors:
+        raise ValueError(f"Unable to align the interface '{name}': {errors[name]}")
+
+    interface_timestamps = get_aligned_interface_timestamps(converter.data_interface_objects[name])
+    if interface_timestamps is None:
+        interface_timestamps = np.empty(shape=(0,), dtype="float64")
+
+    return interface_timestamps[start:stop:step]
+
+
+def stream_interface_timestamps(info: dict) -> Iterator[bytes]:
+    """
+    Stream the timestamps selected by `get_interface_timestamps` as little-endian float64 binary data.
+
+    The timestamps are converted and sent a chunk at a time, rather than copied as a whole. Invalid requests raise
+    before the stream starts.
+    """
+    import numpy as np
+
+    timestamps = get_interface_timestamps(info)
+
+    def iterate_chunks():
+        for start in range(0, len(timestamps), TIMESTAMPS_STREAM_CHUNK_SIZE):
+            chunk = timestamps[start : start + TIMESTAMPS_STREAM_CHUNK_SIZE]
+            yield np.ascontiguousarray(chunk, dtype="<f8").tobytes()
+
+    return iterate_chunks()
+
+
+def get_app_version() -> str:
+    package_json_file_path = resource_path("package.json" if is_packaged() else "../package.json")
+    with open(file=package_json_file_path) as fp:
+        package_json = json.load(fp=fp)
+
+    return package_json["version"]
+
+
 def create_file(
     info: dict,
     log_url: Optional[str] = None,
@@ -912,42 +1442,76 @@ def create_file(
     overwrite = info.get("overwrite", False)
 
     # Progress update info
-    url = info.get("url")
     request_id = info.get("request_id")
 
-    # Backend configuration info
+    # Backend configuration info, including the number of threads writing Zarr datasets (`number_of_write_threads`)
     backend_configuration = info.get("configuration", {})
     backend = backend_configuration.get("backend", "hdf5")
 
-    converter, metadata, path_info = get_conversion_info(info)
+    # Read-ahead info, given as `True` or a dictionary with `number_of_buffers`, `number_of_threads`, and `memory_gb`
+    read_ahead = info.get("read_ahead", False)
+    read_ahead = dict() if read_ahead is True else read_ahead
+    read_ahead_executor = None
+
+    # Memory this session may use, as its share of the memory budget of all concurrent conversions
+    memory_budget_gb = info.get("memory_budget_gb")
+
+    # Time each phase of full conversions, and the reads and writes of each dataset
+    telemetry = None if run_stub_test else ConversionTelemetry(request_id=request_id)
+
+    # Interfaces added to the existing file, leaving those already converted in place
+    append_interfaces = get_appended_interfaces(info)
+
+    # Write heavy interfaces to HDF5 files of their own in parallel, linked from the NWB file (see `split_conversion.py`)
+    split_interfaces = (
+        info.get("split_interfaces", False) and backend == "hdf5" and not run_stub_test and append_interfaces is None
+    )
+    part_file_paths = None
+
+    converter, metadata, path_info = get_conversion_info(info, telemetry=telemetry)
 
     nwbfile_path = path_info["file"]
 
     try:
 
         # Delete files manually if using Zarr
-        if overwrite:
+        if overwrite and append_interfaces is None:
             if nwbfile_path.exists():
                 if nwbfile_path.is_dir():
                     rmtree(nwbfile_path)
                 else:
                     nwbfile_path.unlink()
 
-        def update_conversion_progress(message):
-            update_dict = dict(request_id=request_id, **message)
-            if url or not run_stub_test:
-                requests.post(url=url, json=update_dict)
-            else:
-                progress_handler.announce(update_dict)
+            # Along with the parts of a previous split conversion
+            from .split_conversion import get_parts_folder
+
+            if get_parts_folder(nwbfile_path).exists():
+                rmtree(get_parts_folder(nwbfile_path))
 
         progress_bar_options = dict(
             mininterval=0,
-            on_progress_update=update_conversion_progress,
+            on_progress_update=create_progress_reporter(request_id=request_id),
         )
 
+        iterator_options = dict(
+            display_progress=True,
+            progress_bar_class=TQDMProgressSubscriber,
+            progress_bar_options=progress_bar_options,
+        )
+
+        # Size the buffers so that those read ahead, along with the one being written, fit in the memory budget
+        if read_ahead and "memory_gb" in read_ahead:
+            number_of_buffers = read_ahead.get("number_of_buffers", DEFAULT_READ_AHEAD_BUFFERS)
+            iterator_options["buffer_gb"] = read_ahead["memory_gb"] / (number_of_buffers + 1)
+        elif memory_budget_gb is not None:
+            iterator_options["buffer_gb"] = get_buffer_gb(
+                memory_budget_gb=memory_budget_gb,
+                number_of_buffers=get_number_of_buffers_in_memory(backend_configuration, read_ahead=read_ahead),
+            )
+
         # Assume all interfaces have the same conversion options for now
         conversion_options_schema = converter.get_conversion_options_schema()
-        conversion_options = {interface: dict() for interface in info["source_data"]}
+        conversion_options = {interface: dict() for interface in converter.data_interface_objects}
 
         for interface_or_subconverter in conversion_options:
             conversion_options_schema_per_interface_or_converter = conversion_options_schema.get(
@@ -973,35 +1537,26 @@ def create_file(
 
                     # Only display per-file progress updates if not running a preview
                     if run_stub_test is False and "iterator_opts" in properties_per_subinterface:
-                        options_to_update["iterator_opts"] = dict(
-                            display_progress=True,
-                            progress_bar_class=TQDMProgressSubscriber,
-                            progress_bar_options=progress_bar_options,
-                        )
+                        options_to_update["iterator_opts"] = dict(iterator_options)
 
             # Object is a standard interface
             else:
                 interface = interface_or_subconverter
 
-                conversion_options_schema_per_interface = conversion_options_schema.get("properties", dict())
+                properties_per_interface = conversion_options_schema_per_interface_or_converter.get(
+                    "properties", dict()
+                )
                 options_to_update = conversion_options[interface]
 
-                if run_stub_test is True and "stub_test" in conversion_options_schema_per_interface:
-                    options_to_update[interface]["stub_test"] = True
+                if run_stub_test is True and "stub_test" in properties_per_interface:
+                    options_to_update["stub_test"] = True
 
                 # Only display per-file progress updates if not running a preview
-                if run_stub_test is False and "iterator_opts" in conversion_options_schema_per_interface:
-                    options_to_update[interface]["iterator_opts"] = dict(
-                        display_progress=True,
-                        progress_bar_class=TQDMProgressSubscriber,
-                        progress_bar_options=progress_bar_options,
-                    )
+                if run_stub_test is False and "iterator_opts" in properties_per_interface:
+                    options_to_update["iterator_opts"] = dict(iterator_options)
 
         # Add GUIDE watermark
-        package_json_file_path = resource_path("package.json" if is_packaged() else "../package.json")
-        with open(file=package_json_file_path) as fp:
-            package_json = json.load(fp=fp)
-        app_version = package_json["version"]
+        app_version = get_app_version()
         metadata["NWBFile"]["source_script"] = f"Created using NWB GUIDE v{app_version}"
         metadata["NWBFile"]["source_script_file_name"] = neuroconv.__file__  # Must be included to be valid
 
@@ -1013,58 +1568,254 @@ def create_file(
             backend=backend,
         )
 
-        # Only set full backend configuration if running a full conversion
+        # Only set full backend configuration if running a full conversion (appends configure the added datasets)
+        if run_stub_test is False and append_interfaces is None:
+            start_time = time.perf_counter()
+
+            # Build the in-memory file once, both to derive the backend configuration and to write it
+            telemetry.instrument_interfaces(converter)
+            if split_interfaces:
+                from .split_conversion import build_in_memory_nwbfile_by_part
+
+                nwbfile, object_ids_by_part = build_in_memory_nwbfile_by_part(
+                    converter=converter, metadata=metadata, conversion_options=conversion_options
+                )
+            else:
+                nwbfile = build_in_memory_nwbfile(
+                    converter=converter, metadata=metadata, conversion_options=conversion_options
+                )
+            with telemetry.phase("configure_backend", backend=backend):
+                full_backend_configuration = update_backend_configuration(info, nwbfile=nwbfile)
+            run_conversion_kwargs.update(dict(backend_configuration=full_backend_configuration))
+
+            # An in-memory file cannot be passed when appending to an existing file
+            if overwrite or not nwbfile_path.exists():
+                run_conversion_kwargs.update(dict(nwbfile=nwbfile))
+
+                # Overlap reading the next buffers from the source with compressing and writing the current one
+                if read_ahead:
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    read_ahead_executor = ThreadPoolExecutor(
+                        max_workers=read_ahead.get("number_of_threads", DEFAULT_READ_AHEAD_THREADS)
+                    )
+                    enable_read_ahead(
+                        nwbfile=nwbfile,
+                        executor=read_ahead_executor,
+                        number_of_buffers=read_ahead.get("number_of_buffers", DEFAULT_READ_AHEAD_BUFFERS),
+                    )
+
+                # The parallel Zarr writer interleaves the buffers of every dataset
+                telemetry.instrument_datasets(
+                    nwbfile=nwbfile,
+                    backend_configuration=full_backend_configuration,
+                    interleaved_writes=backend == "zarr",
+                )
+
+        with time_phase(telemetry, "write", backend=backend):
+            if append_interfaces is not None:
+                from .appending import append_to_nwbfile
+
+                start_time = time.perf_counter()
+                telemetry.instrument_interfaces(converter)
+                full_backend_configuration = append_to_nwbfile(
+                    converter=converter,
+                    metadata=metadata,
+                    nwbfile_path=nwbfile_path,
+                    backend=backend,
+                    conversion_options=conversion_options,
+                    dataset_configurations=backend_configuration.get("results", dict()).get(backend),
+                )
+
+            elif split_interfaces and "nwbfile" in run_conversion_kwargs:
+                from .split_conversion import write_split_nwbfile
+
+                # Parts are written without `run_conversion`, which otherwise validates the session first
+                converter.validate_metadata(metadata=metadata)
+                converter.validate_conversion_options(conversion_options=conversion_options)
+                part_file_paths = write_split_nwbfile(
+                    info=info,
+                    nwbfile=nwbfile,
+                    object_ids_by_part=object_ids_by_part,
+                    backend_configuration=full_backend_configuration,
+                    nwbfile_path=nwbfile_path,
+                    buffer_gb=iterator_options.get("buffer_gb"),
+                    telemetry=telemetry,
+                )
+
+                # Too few interfaces are heavy enough to gain from being written apart
+                if part_file_paths is None:
+                    converter.run_conversion(**run_conversion_kwargs)
+
+            # Compress and store the chunks of all Zarr datasets in parallel
+            elif backend == "zarr" and "nwbfile" in run_conversion_kwargs:
+                from .zarr_writing import write_zarr_nwbfile
+
+                converter.validate_metadata(metadata=metadata)
+                converter.validate_conversion_options(conversion_options=conversion_options)
+                write_zarr_nwbfile(
+                    nwbfile=nwbfile,
+                    nwbfile_path=nwbfile_path,
+                    backend_configuration=full_backend_configuration,
+                    number_of_threads=backend_configuration.get("number_of_write_threads"),
+                )
+            else:
+                converter.run_conversion(**run_conversion_kwargs)
+
+        # Calibrate future predictions of the write time on this machine
         if run_stub_test is False:
-            run_conversion_kwargs.update(dict(backend_configuration=update_backend_configuration(info)))
+            from .conversion_predictions import record_conversion_throughput
+
+            uncompressed_bytes = sum(
+                math.prod(dataset_configuration.full_shape) * dataset_configuration.dtype.itemsize
+                for dataset_configuration in full_backend_configuration.dataset_configurations.values()
+            )
+            record_conversion_throughput(
+                backend=backend, uncompressed_bytes=uncompressed_bytes, duration=time.perf_counter() - start_time
+            )
+
+            telemetry.record_storage(nwbfile_path=nwbfile_path, backend=backend)
+            telemetry.write_report(nwbfile_path=nwbfile_path, backend=backend)
 
-        converter.run_conversion(**run_conversion_kwargs)
+        return dict(parts=part_file_paths) if part_file_paths else dict()
 
     except Exception as e:
         if log_url:
-            requests.post(
-                url=log_url,
-                json=dict(
-                    header=f"Conversion failed for {project_name} — {nwbfile_path} (convert_to_nwb)",
-                    inputs=dict(info=info),
-                    traceback=traceback.format_exc(),
-                    type="error",
-                ),
-            )
+            # Logging is best-effort, so that the error of the conversion is the one raised
+            try:
+                requests.post(
+                    url=log_url,
+                    json=dict(
+                        header=f"Conversion failed for {project_name} — {nwbfile_path} (convert_to_nwb)",
+                        inputs=dict(info=info),
+                        traceback=traceback.format_exc(),
+                        type="error",
+                    ),
+                )
+            except requests.RequestException:
+                pass
 
         raise e
 
+    finally:
+        if read_ahead_executor is not None:
+            read_ahead_executor.shutdown(wait=True, cancel_futures=True)
 
-def update_backend_configuration(info: dict) -> dict:
 
-    from neuroconv.tools.nwb_helpers import (
-        get_default_backend_configuration,
-        make_nwbfile_from_metadata,
-    )
+def get_number_of_buffers_in_memory(backend_configuration: dict, read_ahead: Union[bool, dict] = False) -> int:
+    """The number of iterator buffers a conversion holds in memory at once: the one being written, and any ahead of it."""
+    number_of_buffers = 1
 
-    PROPS_TO_IGNORE = ["full_shape"]
+    if read_ahead:
+        number_of_buffers += read_ahead.get("number_of_buffers", DEFAULT_READ_AHEAD_BUFFERS)
+
+    # Parallel Zarr writes hold buffers until their chunks are compressed and stored
+    if backend_configuration.get("backend") == "zarr":
+        from .zarr_writing import PENDING_BUFFERS_PER_THREAD
+
+        number_of_threads = backend_configuration.get("number_of_write_threads") or os.cpu_count() or 1
+        number_of_buffers += number_of_threads * PENDING_BUFFERS_PER_THREAD
+
+    return number_of_buffers
+
+
+def get_buffer_gb(memory_budget_gb: float, number_of_buffers: int) -> float:
+    """
+    Size the buffers of the iterators of a session so that those held in memory at once fit in its memory budget.
+
+    Only part of the budget goes to the buffers, since the source files, the in-memory NWBFile, and compression use
+    the rest. Buffers are never larger than the default of the iterators, nor smaller than a single chunk.
+    """
+    buffer_gb = memory_budget_gb * BUFFER_MEMORY_FRACTION / number_of_buffers
+    return min(max(buffer_gb, MINIMUM_BUFFER_GB), DEFAULT_BUFFER_GB)
+
+
+def build_in_memory_nwbfile(
+    converter: "NWBConverter", metadata: dict, conversion_options: Optional[dict] = None
+) -> NWBFile:
+    """Temporally align the interfaces of a converter and add them to a new in-memory NWBFile."""
+    from neuroconv.tools.nwb_helpers import make_nwbfile_from_metadata
+
+    converter.temporally_align_data_interfaces()
+
+    nwbfile = make_nwbfile_from_metadata(metadata=metadata)
+    converter.add_to_nwbfile(nwbfile, metadata=metadata, conversion_options=conversion_options)
+
+    return nwbfile
+
+
+def _get_backend_configuration_cache_key(info: dict) -> tuple:
+    backend = info.get("configuration", {}).get("backend", "hdf5")
+
+    # Appends only configure the datasets of the interfaces they add
+    append_interfaces = get_appended_interfaces(info)
+    return (get_session_fingerprint(info), backend, tuple(append_interfaces) if append_interfaces else None)
+
+
+def update_backend_configuration(info: dict, nwbfile: Optional[NWBFile] = None) -> "BackendConfiguration":
+    """
+    Resolve the backend configuration of a session, applying any changes made on the frontend to the defaults.
+
+    The defaults are derived from the in-memory `nwbfile` if provided (otherwise one is built) and cached by session
+    fingerprint, so that revisiting the configuration of an unchanged session does not instantiate its interfaces.
+    """
+    from neuroconv.tools.nwb_helpers import get_default_backend_configuration
 
     info_from_frontend = info.get("configuration", {})
     backend = info_from_frontend.get("backend", "hdf5")
     backend_configuration_from_frontend = info_from_frontend.get("results", {}).get(backend, {})
 
-    converter, metadata, __ = get_conversion_info(info)
+    cache_key = _get_backend_configuration_cache_key(info)
+    cached_configuration = BACKEND_CONFIGURATION_CACHE.get(cache_key)
+    if cached_configuration is not None:
+        backend_configuration = copy.deepcopy(cached_configuration)
+    else:
+        if nwbfile is None:
+            converter, metadata, __ = get_conversion_info(info)
+            nwbfile = build_in_memory_nwbfile(converter=converter, metadata=metadata)
 
-    nwbfile = make_nwbfile_from_metadata(metadata=metadata)
-    converter.add_to_nwbfile(nwbfile, metadata=metadata)
+        backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend=backend)
+        BACKEND_CONFIGURATION_CACHE[cache_key] = copy.deepcopy(backend_configuration)
+
+    apply_dataset_configurations(backend_configuration, backend_configuration_from_frontend)
+
+    return backend_configuration
+
+
+def apply_dataset_configurations(
+    backend_configuration: "BackendConfiguration", dataset_configurations: Optional[dict], ignore_missing: bool = False
+) -> None:
+    """
+    Apply the changes made on the frontend to the dataset configurations of a backend configuration, by location.
+
+    If `ignore_missing` is set, changes to datasets that are not configured (such as those already written) are skipped.
+    """
+    PROPS_TO_IGNORE = ["full_shape"]
 
-    backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend=backend)
+    for location_in_file, dataset_configuration in (dataset_configurations or dict()).items():
+        if ignore_missing and location_in_file not in backend_configuration.dataset_configurations:
+            continue
 
-    for location_in_file, dataset_configuration in backend_configuration_from_frontend.items():
         for key, value in dataset_configuration.items():
             if key not in PROPS_TO_IGNORE:
                 # Pydantic models only allow setting of attributes
                 setattr(backend_configuration.dataset_configurations[location_in_file], key, value)
 
-    return backend_configuration
 
+@lru_cache(maxsize=None)
+def _get_dataset_configuration_schema(backend_configuration_class: type, props_to_remove: tuple) -> dict:
+    # The schema only depends on the configuration model, so it is generated once per backend
+    schema = list(backend_configuration_class.schema()["$defs"].values())[0]
+    for key in props_to_remove:
+        existed = schema["properties"].pop(key, None)  # Why is dtype not included but the rest are?
+        if existed:
+            schema["required"].remove(key)
+
+    return schema
 
-def get_backend_configuration(info: dict) -> dict:
 
+def serialize_backend_configuration(configuration: "BackendConfiguration") -> dict:
+    """Serialize the dataset configurations of a backend configuration, along with their schema and item sizes."""
     import numpy as np
 
     PROPS_TO_REMOVE = [
@@ -1075,11 +1826,6 @@ def get_backend_configuration(info: dict) -> dict:
         "dtype",
     ]
 
-    info["overwrite"] = True  # Always overwrite the file
-
-    backend = info.get("backend", "hdf5")
-    configuration = update_backend_configuration(info)
-
     def custom_encoder(obj):
         if isinstance(obj, np.ndarray):
             return obj.tolist()
@@ -1102,13 +1848,28 @@ def get_backend_configuration(info: dict) -> dict:
         for key in PROPS_TO_REMOVE:
             del dataset[key]
 
-    schema = list(configuration.schema()["$defs"].values())[0]
-    for key in PROPS_TO_REMOVE:
-        existed = schema["properties"].pop(key, None)  # Why is dtype not included but the rest are?
-        if existed:
-            schema["required"].remove(key)
+    schema = copy.deepcopy(_get_dataset_configuration_schema(type(configuration), tuple(PROPS_TO_REMOVE)))
+
+    return dict(results=dataset_configurations, schema=schema, itemsizes=itemsizes)
 
-    return dict(results=dataset_configurations, schema=schema, backend=backend, itemsizes=itemsizes)
+
+def get_backend_configuration(info: dict) -> dict:
+    from .conversion_predictions import predict_conversion
+
+    info["overwrite"] = True  # Always overwrite the file
+
+    backend = info.get("backend", "hdf5")
+
+    # Share a single in-memory file between the defaults and the compression probes when neither is cached yet
+    nwbfile = None
+    if _get_backend_configuration_cache_key(info) not in BACKEND_CONFIGURATION_CACHE:
+        converter, metadata, __ = get_conversion_info(info)
+        nwbfile = build_in_memory_nwbfile(converter=converter, metadata=metadata)
+
+    configuration = update_backend_configuration(info, nwbfile=nwbfile)
+    predictions = predict_conversion(info, backend_configuration=configuration, nwbfile=nwbfile)
+
+    return dict(**serialize_backend_configuration(configuration), backend=backend, predictions=predictions)
 
 
 def get_conversion_path_info(info: dict) -> dict:
@@ -1129,7 +1890,19 @@ def get_conversion_path_info(info: dict) -> dict:
     return dict(file=resolved_output_path, directory=resolved_output_directory, default=default_output_directory)
 
 
-def get_conversion_info(info: dict) -> dict:
+def get_appended_interfaces(info: dict) -> Optional[List[str]]:
+    """
+    The interfaces to append to the existing file of a full conversion, if only some are converted.
+
+    Previews always convert every interface.
+    """
+    if info.get("stub_test", False):
+        return None
+
+    return info.get("append_interfaces")
+
+
+def get_conversion_info(info: dict, telemetry: Optional["ConversionTelemetry"] = None) -> dict:
     """Function used to organize the required information for conversion."""
 
     from neuroconv import NWBConverter
@@ -1145,16 +1918,29 @@ def get_conversion_info(info: dict) -> dict:
 
     resolved_output_path.parent.mkdir(exist_ok=True, parents=True)  # Ensure all parent directories exist
 
+    start_time = time.perf_counter()
+
+    # Only instantiate the interfaces appended to an existing file
+    interfaces = info["interfaces"]
+    source_data = info["source_data"]
+    append_interfaces = get_appended_interfaces(info)
+    if append_interfaces is not None:
+        interfaces = {name: interfaces[name] for name in append_interfaces}
+        source_data = {name: source_data[name] for name in append_interfaces if name in source_data}
+
     resolved_source_data = replace_none_with_nan(
-        info["source_data"], resolve_references(get_custom_converter(info["interfaces"]).get_source_schema())
+        source_data, resolve_references(get_custom_converter(interfaces).get_source_schema())
     )
 
     converter = instantiate_custom_converter(
         source_data=resolved_source_data,
-        interface_class_dict=info["interfaces"],
+        interface_class_dict=interfaces,
         alignment_info=info.get("alignment", dict()),
     )
 
+    record_phase(telemetry, "instantiate_interfaces", start_time=start_time)
+    start_time = time.perf_counter()
+
     # Ensure Ophys NaN values are resolved
     resolved_metadata = replace_none_with_nan(info["metadata"], resolve_references(converter.get_metadata_schema()))
 
@@ -1198,6 +1984,9 @@ def get_conversion_info(info: dict) -> dict:
                 elif len(name_split) == 2:
                     sub_interface, sub_sub_interface = name_split
 
+                if sub_interface not in converter.data_interface_objects:
+                    continue  # Not appended
+
                 interface_or_subconverter = converter.data_interface_objects[sub_interface]
 
                 if isinstance(interface_or_subconverter, NWBConverter):
@@ -1233,6 +2022,8 @@ def get_conversion_info(info: dict) -> dict:
             resolved_metadata["Subject"]["date_of_birth"]
         ).replace(tzinfo=zoneinfo.ZoneInfo(info["timezone"]))
 
+    record_phase(telemetry, "resolve_metadata", start_time=start_time)
+
     return (
         converter,
         resolved_metadata,
@@ -1244,14 +2035,20 @@ def convert_to_nwb(
     info: dict,
     log_url: Optional[str] = None,
 ) -> str:
-    """Function used to convert the source data to NWB format using the specified metadata."""
+    """
+    Function used to convert the source data to NWB format using the specified metadata.
+
+    The `info` may also reference a session of the project store, whose payload is then loaded by the worker.
+    """
+
+    info = resolve_session_reference(info)
 
     path_info = get_conversion_path_info(info)
     output_path = path_info["file"]
     resolved_output_directory = path_info["directory"]
     default_output_directory = path_info["default"]
 
-    create_file(info, log_url=log_url)
+    result = create_file(info, log_url=log_url)
 
     # Create a symlink between the fake data and custom data
     if not resolved_output_directory == default_output_directory:
@@ -1272,23 +2069,73 @@ def convert_to_nwb(
         if not default_output_directory.exists():
             os.symlink(resolved_output_directory, default_output_directory)
 
-    return dict(file=str(output_path))
+    return dict(file=str(output_path), **result)
 
 
 def convert_all_to_nwb(
-    url: str,
     files: List[dict],
     request_id: Optional[str],
-    max_workers: int = 1,
+    max_workers: Optional[int] = None,
     log_url: Optional[str] = None,
-) -> List[str]:
-
-    from concurrent.futures import ProcessPoolExecutor, as_completed
+    progress_update_rate: float = DEFAULT_PROGRESS_UPDATE_RATE,
+    force: bool = False,
+    preview_cache_quota_gb: Optional[float] = None,
+    memory_budget_gb: Optional[float] = None,
+    job_queue_folder: Optional[str] = None,
+    pin_cpus: bool = False,
+    consolidate: bool = False,
+) -> List[dict]:
+    """
+    Convert many sessions in parallel, scheduling the largest sessions first, and report the time each session spent
+    queued and running alongside its output file.
+
+    Concurrency adapts to the resources of the machine within `max_workers` and `memory_budget_gb` (see
+    `scheduling.py`). Full conversions that are up to date with the manifest of their output directory are skipped
+    unless `force` is set (see `manifest.py`), and previews are served from a cache evicted under
+    `preview_cache_quota_gb` (see `preview_cache.py`). Split conversions are consolidated before returning if
+    `consolidate` is set (see `split_conversion.py`). Given a `job_queue_folder`, conversions run on headless workers
+    instead (see `job_queue.py`).
+    """
+    from concurrent.futures import as_completed
 
     from tqdm_publisher import TQDMProgressSubscriber
 
+    from .manifest import (
+        get_conversion_fingerprint,
+        is_conversion_up_to_date,
+        load_conversion_manifest,
+        record_conversion,
+        save_conversion_manifest,
+    )
+    from .preview_cache import (
+        DEFAULT_PREVIEW_CACHE_QUOTA_IN_GB,
+        evict_previews,
+        get_preview_fingerprint,
+        prepare_preview_output,
+        restore_preview,
+        store_preview,
+    )
+    from .scheduling import ConcurrencyController, run_scheduled
+    from .split_conversion import submit_consolidation
+    from .thread_limits import get_threads_per_worker
+    from .worker_pool import (
+        get_worker_pool,
+        get_worker_pool_size,
+        with_progress_update_rate,
+        with_thread_limit,
+    )
+
+    controller = None
+
     def on_progress_update(message):
         message["progress_bar_id"] = request_id  # Ensure request_id matches
+        if controller is not None:
+            message["memory"] = dict(
+                resident_gb=controller.worker_memory_gb,
+                peak_gb=controller.peak_worker_memory_gb,
+                budget_gb=memory_budget_gb,
+            )
+
         progress_handler.announce(
             dict(
                 request_id=request_id,
@@ -1296,38 +2143,175 @@ def convert_all_to_nwb(
             )
         )
 
-    futures = []
-    file_paths = []
+    # The server resolves references to stored sessions to fingerprint them, while workers load their own payload
+    references = [pin_session_reference(file_info) for file_info in files]
+    files = [resolve_session_reference(reference) for reference in references]
+
+    results = []
+    manifests = dict()  # By project output directory
+    fingerprints = dict()  # By index of the file to convert
+    consolidations = dict()  # Futures of the consolidations, to their index in the files and in the results
+    preview_fingerprints = dict()  # By index of the file to preview
+    number_of_preview_hits = 0
+
+    # Workers of a shared queue write where the server reads the outputs, rather than to their own default folder
+    if job_queue_folder is not None:
+        unpinned_files = [
+            file_info["nwbfile_path"]
+            for file_info in files
+            if not file_info.get("stub_test", False) and not file_info.get("output_folder")
+        ]
+        if unpinned_files:
+            raise ValueError(
+                "Conversions run on a job queue must set an output folder shared with its workers, which these "
+                f"sessions do not: {', '.join(unpinned_files)}"
+            )
 
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+    jobs = []
+    indices = []
+    local_positions = []  # Positions of the jobs run by the server
+    queued_positions = []  # Positions of the jobs submitted to the job queue
+    for index, file_info in enumerate(files):
+        if file_info.get("stub_test", False):
+            preview_fingerprints[index] = get_preview_fingerprint(file_info)
+
+            if not force and restore_preview(file_info, fingerprint=preview_fingerprints[index]):
+                results.append(dict(file=str(get_conversion_path_info(file_info)["file"]), cached=True))
+                number_of_preview_hits += 1
+                continue
 
-        for file_info in files:
+            prepare_preview_output(file_info)  # Never write through a link into the cache
+        else:
+            directory = get_conversion_path_info(file_info)["directory"]
+            manifest = manifests.setdefault(directory, load_conversion_manifest(directory))
+            fingerprints[index] = get_conversion_fingerprint(file_info)
 
-            futures.append(
-                executor.submit(
-                    convert_to_nwb,
-                    dict(
-                        url=url,
-                        request_id=request_id,
-                        **file_info,
-                    ),
-                    log_url=log_url,
-                )
+            if not force and is_conversion_up_to_date(file_info, manifest=manifest, fingerprint=fingerprints[index]):
+                results.append(dict(file=str(get_conversion_path_info(file_info)["file"]), cached=True))
+                continue
+
+        # Previews always run on the server, whose cache they are stored in
+        if job_queue_folder is not None and index not in preview_fingerprints:
+            # Workers of a shared queue may not have access to the project store of the server, nor to its log endpoint
+            output_folder = Path(file_info["output_folder"]).expanduser().resolve()
+            job_info, job_kwargs = dict(file_info, output_folder=str(output_folder)), dict()
+            queued_positions.append(len(jobs))
+        else:
+            job_info, job_kwargs = references[index], dict(log_url=log_url)
+            local_positions.append(len(jobs))
+
+        indices.append(index)
+        jobs.append((get_source_data_size(file_info), (dict(job_info, request_id=request_id),), job_kwargs))
+
+    def in_batch_order(conversions, positions):
+        for future, timing in conversions:
+            yield future, dict(timing, index=positions[timing["index"]])
+
+    if len(jobs) > 0:
+        max_workers = max(1, min(max_workers or get_worker_pool_size(), get_worker_pool_size(), len(jobs)))
+
+        # Each session may use its share of the memory budget when every worker is busy
+        session_memory_gb = DEFAULT_BUFFER_GB
+        if memory_budget_gb is not None:
+            session_memory_gb = memory_budget_gb / max_workers
+            for __, (job_info,), __ in jobs:
+                job_info["memory_budget_gb"] = session_memory_gb
+
+        conversions = []
+        if local_positions:
+            # Conversions run on the workers of the server, which report progress over a queue
+            controller = ConcurrencyController(
+                max_workers=max_workers, memory_budget_gb=memory_budget_gb, session_memory_gb=session_memory_gb
+            )
+            local_conversions = run_scheduled(
+                executor=get_worker_pool(),
+                function=with_thread_limit(
+                    with_progress_update_rate(convert_to_nwb, progress_update_rate),
+                    number_of_threads=get_threads_per_worker(max_workers),
+                    pin_cpus=pin_cpus,
+                ),
+                jobs=[jobs[position] for position in local_positions],
+                max_workers=max_workers,
+                controller=controller,
             )
+            conversions = itertools.chain(conversions, in_batch_order(local_conversions, local_positions))
+
+        if queued_positions:
+            from .job_queue import FileSystemJobQueue, run_queued
+
+            # Conversions run on workers that claim them from a shared queue, which report progress through files
+            queued_conversions = run_queued(
+                queue=FileSystemJobQueue(job_queue_folder),
+                jobs=[jobs[position] for position in queued_positions],
+                on_progress_update=progress_handler.announce,
+                progress_update_rate=progress_update_rate,
+                pin_cpus=pin_cpus,
+            )
+            conversions = itertools.chain(conversions, in_batch_order(queued_conversions, queued_positions))
 
-        inspection_iterable = TQDMProgressSubscriber(
-            iterable=as_completed(futures),
+        conversion_iterable = TQDMProgressSubscriber(
+            iterable=conversions,
             desc="Total files converted",
-            total=len(futures),
+            total=len(jobs),
             mininterval=0,
             on_progress_update=on_progress_update,
         )
 
-        for future in inspection_iterable:
-            output_filepath = future.result()
-            file_paths.append(output_filepath)
+        for future, timing in conversion_iterable:
+            result = future.result()
+            results.append(
+                dict(
+                    **result,
+                    cached=False,
+                    source_size=jobs[timing["index"]][0],
+                    queue_time=timing["queue_time"],
+                    run_time=timing["run_time"],
+                )
+            )
 
-        return file_paths
+            # Record each conversion as soon as it completes, so that an interrupted batch can be resumed
+            index = indices[timing["index"]]
+            if index in preview_fingerprints:
+                store_preview(files[index], fingerprint=preview_fingerprints[index])
+            if index in fingerprints:
+                file_info = files[index]
+                directory = get_conversion_path_info(file_info)["directory"]
+                record_conversion(file_info, manifest=manifests[directory], fingerprint=fingerprints[index])
+                save_conversion_manifest(directory, manifest=manifests[directory])
+
+            # Consolidation does not hold up the remaining conversions
+            if consolidate and result.get("parts"):
+                consolidations[submit_consolidation(result["file"])] = (index, len(results) - 1)
+
+    for future in as_completed(consolidations):
+        index, result_index = consolidations[future]
+        file_path = results[result_index]["file"]
+        results[result_index]["consolidated"] = future.exception() is None
+        if future.exception() is not None:
+            results[result_index]["consolidation_error"] = str(future.exception())
+            announce_event(
+                event=dict(type="consolidation_failed", file=file_path, error=str(future.exception())),
+                request_id=request_id,
+            )
+            continue
+
+        # The consolidated file replaces the output recorded when the conversion completed
+        if index in fingerprints:
+            directory = get_conversion_path_info(files[index])["directory"]
+            record_conversion(files[index], manifest=manifests[directory], fingerprint=fingerprints[index])
+            save_conversion_manifest(directory, manifest=manifests[directory])
+
+        announce_event(event=dict(type="consolidated", file=file_path), request_id=request_id)
+
+    if preview_fingerprints:
+        quota_gb = DEFAULT_PREVIEW_CACHE_QUOTA_IN_GB if preview_cache_quota_gb is None else preview_cache_quota_gb
+        preview_cache = evict_previews(quota_in_bytes=quota_gb * 1e9, keep=list(preview_fingerprints.values()))
+        preview_cache["number_of_hits"] = number_of_preview_hits
+        preview_cache["number_of_misses"] = len(preview_fingerprints) - number_of_preview_hits
+        for result in results:
+            result["preview_cache"] = preview_cache
+
+    return results
 
 
 def upload_multiple_filesystem_objects_to_dandi(**kwargs) -> list[Path]:
@@ -1342,6 +2326,18 @@ def upload_multiple_filesystem_objects_to_dandi(**kwargs) -> list[Path]:
     return results
 
 
+def _check_consolidated(nwb_folder_path: Path) -> None:
+    """Refuse to upload NWB files that still link to the datasets of their parts, which would not be uploaded with them."""
+    from .split_conversion import get_unconsolidated_files
+
+    unconsolidated_files = get_unconsolidated_files(nwb_folder_path)
+    if unconsolidated_files:
+        raise ValueError(
+            "These files link to the data of their parts, and must be consolidated before they are uploaded: "
+            f"{', '.join(str(file_path) for file_path in unconsolidated_files)}"
+        )
+
+
 def upload_folder_to_dandi(
     dandiset_id: str,
     api_key: str,
@@ -1354,6 +2350,8 @@ def upload_folder_to_dandi(
 ) -> list[Path]:
     from neuroconv.tools.data_transfers import automatic_dandi_upload
 
+    _check_consolidated(Path(nwb_folder_path))
+
     os.environ["DANDI_API_KEY"] = api_key  # Update API Key
 
     if ignore_cache:
@@ -1385,6 +2383,8 @@ def upload_project_to_dandi(
 
     # CONVERSION_SAVE_FOLDER_PATH.mkdir(exist_ok=True, parents=True)  # Ensure base directory exists
 
+    _check_consolidated(CONVERSION_SAVE_FOLDER_PATH / project)
+
     os.environ["DANDI_API_KEY"] = api_key  # Update API Key
 
     if ignore_cache:
@@ -1452,27 +2452,38 @@ def generate_dataset(input_path: str, output_path: str) -> dict:
     return {"output_path": str(output_path)}
 
 
+def get_inspector_checks(ignore: Optional[List[str]] = None) -> list:
+    """The checks of the DANDI configuration of the NWB Inspector, configured once per set of ignored checks."""
+    import nwbinspector
+
+    key = tuple(sorted(ignore or []))
+    checks = INSPECTOR_CHECKS_CACHE.get(key)
+    if checks is None:
+        checks = nwbinspector.configure_checks(
+            checks=nwbinspector.available_checks,
+            config=nwbinspector.load_config(filepath_or_keyword="dandi"),
+            ignore=ignore,
+        )
+        INSPECTOR_CHECKS_CACHE[key] = checks
+
+    return checks
+
+
 def _inspect_file_per_job(
     nwbfile_path: str,
-    url,
     ignore: Optional[List[str]] = None,
     request_id: Optional[str] = None,
 ) -> list:
 
     import nwbinspector
-    import requests
     from pynwb import NWBHDF5IO
     from tqdm_publisher import TQDMProgressSubscriber
 
-    checks = nwbinspector.configure_checks(
-        checks=nwbinspector.available_checks,
-        config=nwbinspector.load_config(filepath_or_keyword="dandi"),
-        ignore=ignore,
-    )
+    checks = get_inspector_checks(ignore=ignore)
 
     progress_bar_options = dict(
         mininterval=0,
-        on_progress_update=lambda message: requests.post(url=url, json=dict(request_id=request_id, **message)),
+        on_progress_update=create_progress_reporter(request_id=request_id),
     )
 
     with NWBHDF5IO(path=nwbfile_path, mode="r", load_namespaces=True) as io:
@@ -1492,17 +2503,28 @@ def _inspect_file_per_job(
         return messages
 
 
-def _inspect_all(url, config):
-
-    from concurrent.futures import ProcessPoolExecutor, as_completed
+def _inspect_all(config):
 
     from nwbinspector.utils import calculate_number_of_cpu
     from tqdm_publisher import TQDMProgressSubscriber
 
+    from .scheduling import FixedConcurrencyController, run_scheduled
+    from .thread_limits import get_threads_per_worker
+    from .worker_pool import (
+        get_worker_pool,
+        get_worker_pool_size,
+        with_progress_update_rate,
+        with_thread_limit,
+    )
+
     path = config.pop("path", None)
 
     paths = [path] if path else config.pop("paths", [])
 
+    # Sessions of the project store are inspected at their output path
+    for session in config.pop("sessions", []):
+        paths.append(str(get_conversion_path_info(resolve_session_reference(session))["file"]))
+
     nwbfile_paths = []
     for path in paths:
         posix_path = Path(path)
@@ -1514,63 +2536,72 @@ def _inspect_all(url, config):
     request_id = config.pop("request_id", None)
 
     n_jobs = config.get("n_jobs", -2)  # Default to all but one CPU
-    n_jobs = calculate_number_of_cpu(requested_cpu=n_jobs)
-    n_jobs = None if n_jobs == -1 else n_jobs
-
-    futures = list()
-
-    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
-        for nwbfile_path in nwbfile_paths:
-            futures.append(
-                executor.submit(
-                    _inspect_file_per_job,
-                    nwbfile_path=str(nwbfile_path),
-                    ignore=config.get("ignore"),
-                    url=url,
-                    request_id=request_id,
-                )
-            )
+    try:
+        n_jobs = calculate_number_of_cpu(requested_cpu=n_jobs)
+    except AssertionError:  # More CPUs requested or left out than are available, such as all but one of a single CPU
+        n_jobs = 1 if n_jobs < 0 else n_jobs
+    n_jobs = min(n_jobs if n_jobs > 0 else get_worker_pool_size(), get_worker_pool_size(), len(nwbfile_paths) or 1)
+
+    # Inspect the largest files first on the workers of the server, which report progress over a queue
+    jobs = [
+        (
+            nwbfile_path.stat().st_size,
+            (),
+            dict(nwbfile_path=str(nwbfile_path), ignore=config.get("ignore"), request_id=request_id),
+        )
+        for nwbfile_path in nwbfile_paths
+    ]
+    inspections = run_scheduled(
+        executor=get_worker_pool(),
+        function=with_thread_limit(
+            with_progress_update_rate(
+                _inspect_file_per_job, config.get("progress_update_rate", DEFAULT_PROGRESS_UPDATE_RATE)
+            ),
+            number_of_threads=get_threads_per_worker(n_jobs),
+        ),
+        jobs=jobs,
+        max_workers=n_jobs,
+        controller=FixedConcurrencyController(max_workers=n_jobs),
+    )
 
-        messages = list()
+    messages = list()
 
-        # Announce directly
-        def on_progress_update(message):
-            message["progress_bar_id"] = request_id  # Ensure request_id matches
-            progress_handler.announce(
-                dict(
-                    request_id=request_id,
-                    **message,
-                )
+    # Announce directly
+    def on_progress_update(message):
+        message["progress_bar_id"] = request_id  # Ensure request_id matches
+        progress_handler.announce(
+            dict(
+                request_id=request_id,
+                **message,
             )
-
-        inspection_iterable = TQDMProgressSubscriber(
-            iterable=as_completed(futures),
-            desc="Total files inspected",
-            total=len(futures),
-            mininterval=0,
-            on_progress_update=on_progress_update,
         )
 
-        i = 0
-        for future in inspection_iterable:
-            i += 1
-            for message in future.result():
-                messages.append(message)
+    inspection_iterable = TQDMProgressSubscriber(
+        iterable=inspections,
+        desc="Total files inspected",
+        total=len(jobs),
+        mininterval=0,
+        on_progress_update=on_progress_update,
+    )
+
+    for future, __ in inspection_iterable:
+        for message in future.result():
+            messages.append(message)
 
     return messages
 
 
-def inspect_all(url, payload) -> dict:
+def inspect_all(payload) -> dict:
     from pickle import PicklingError
 
     import nwbinspector
 
     try:
-        messages = _inspect_all(url, payload)
+        messages = _inspect_all(payload)
     except PicklingError as exception:
         if "attribute lookup auto_parse_some_output on nwbinspector.register_checks failed" in str(exception):
             del payload["n_jobs"]
-            messages = _inspect_all(url, payload)
+            messages = _inspect_all(payload)
         else:
             raise exception
     except Exception as exception:
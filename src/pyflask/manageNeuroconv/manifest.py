@@ -0,0 +1,84 @@
+"""Manifest of the sessions converted into a project output directory, used to skip sessions that are up to date."""
+
+import hashlib
+import json
+import os
+import time
+from importlib.metadata import version
+from pathlib import Path
+from typing import Optional
+
+from .manage_neuroconv import (
+    get_app_version,
+    get_conversion_path_info,
+    get_session_fingerprint,
+)
+
+CONVERSION_MANIFEST_FILE_NAME = "conversion_manifest.json"
+
+
+def load_conversion_manifest(directory: Path) -> dict:
+    manifest_file_path = Path(directory) / CONVERSION_MANIFEST_FILE_NAME
+    if not manifest_file_path.exists():
+        return dict()
+
+    try:
+        with open(file=manifest_file_path, mode="r") as file:
+            return json.load(fp=file)
+    except (OSError, json.JSONDecodeError):  # A corrupted manifest only means that every session is converted again
+        return dict()
+
+
+def save_conversion_manifest(directory: Path, manifest: dict) -> None:
+    directory = Path(directory)
+    directory.mkdir(exist_ok=True, parents=True)
+
+    # Replace the manifest atomically, so that an interrupted write cannot corrupt it
+    temporary_file_path = directory / f".{CONVERSION_MANIFEST_FILE_NAME}.tmp"
+    with open(file=temporary_file_path, mode="w") as file:
+        json.dump(obj=manifest, fp=file, indent=4)
+    os.replace(temporary_file_path, directory / CONVERSION_MANIFEST_FILE_NAME)
+
+
+def get_conversion_fingerprint(info: dict) -> str:
+    """Hash everything that determines the output of a conversion: the session, its backend configuration, and versions."""
+    conversion_info = dict(
+        session=get_session_fingerprint(info),
+        configuration=info.get("configuration", dict()),
+        neuroconv_version=version("neuroconv"),
+        guide_version=get_app_version(),
+    )
+
+    return hashlib.sha256(json.dumps(conversion_info, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _describe_output(nwbfile_path: Path) -> Optional[dict]:
+    try:
+        path_stat = nwbfile_path.stat()
+    except OSError:
+        return None
+
+    return dict(size=path_stat.st_size, modification_time=path_stat.st_mtime_ns)
+
+
+def is_conversion_up_to_date(info: dict, manifest: dict, fingerprint: str) -> bool:
+    """Whether the manifest records a conversion of this session with the same fingerprint, whose output is unchanged."""
+    entry = manifest.get(str(info["nwbfile_path"]))
+    if entry is None:
+        return False
+
+    nwbfile_path = get_conversion_path_info(info)["file"]
+    output = _describe_output(nwbfile_path)
+
+    return output is not None and entry["output"] == output and entry["fingerprint"] == fingerprint
+
+
+def record_conversion(info: dict, manifest: dict, fingerprint: str) -> None:
+    nwbfile_path = get_conversion_path_info(info)["file"]
+    manifest[str(info["nwbfile_path"])] = dict(
+        fingerprint=fingerprint,
+        output=_describe_output(nwbfile_path),
+        neuroconv_version=version("neuroconv"),
+        guide_version=get_app_version(),
+        converted_at=time.time(),
+    )
@@ -0,0 +1,141 @@
+"""Content-addressed cache of stub previews, evicted least-recently-used first under a disk quota."""
+
+import hashlib
+import json
+import os
+import shutil
+from importlib.metadata import version
+from pathlib import Path
+from typing import List
+
+from .info import STUB_SAVE_FOLDER_PATH
+from .manage_neuroconv import (
+    get_app_version,
+    get_conversion_path_info,
+    get_session_fingerprint,
+)
+
+PREVIEW_CACHE_FOLDER_PATH = Path(STUB_SAVE_FOLDER_PATH, ".cache")
+
+# Total size of the cached previews above which the least recently used are evicted
+DEFAULT_PREVIEW_CACHE_QUOTA_IN_GB = 5
+
+
+def get_preview_fingerprint(info: dict) -> str:
+    """Hash everything that determines the contents of a preview: the session, its backend, and versions."""
+    preview_info = dict(
+        session=get_session_fingerprint(info),
+        backend=info.get("configuration", dict()).get("backend", "hdf5"),
+        neuroconv_version=version("neuroconv"),
+        guide_version=get_app_version(),
+    )
+
+    return hashlib.sha256(json.dumps(preview_info, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _get_cache_entry_path(info: dict, fingerprint: str) -> Path:
+    nwbfile_path = get_conversion_path_info(info)["file"]
+    return PREVIEW_CACHE_FOLDER_PATH / f"{fingerprint}{''.join(nwbfile_path.suffixes)}"
+
+
+def _get_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(file_path.stat().st_size for file_path in path.rglob("*") if file_path.is_file())
+    return path.stat().st_size
+
+
+def _remove(path: Path) -> None:
+    if path.is_symlink() or path.is_file():
+        path.unlink()
+    elif path.is_dir():
+        shutil.rmtree(path)
+
+
+def _link(cache_entry_path: Path, nwbfile_path: Path) -> None:
+    """Expose a cached preview at the path of the session, falling back to a copy where symlinks are not permitted."""
+    _remove(nwbfile_path)
+    nwbfile_path.parent.mkdir(exist_ok=True, parents=True)
+    try:
+        nwbfile_path.symlink_to(cache_entry_path, target_is_directory=cache_entry_path.is_dir())
+    except OSError:
+        if cache_entry_path.is_dir():
+            shutil.copytree(cache_entry_path, nwbfile_path)
+        else:
+            shutil.copy2(cache_entry_path, nwbfile_path)
+
+
+def prepare_preview_output(info: dict) -> None:
+    """Remove a previous preview (or link to a cached one) so that the conversion never writes into the cache."""
+    _remove(get_conversion_path_info(info)["file"])
+
+
+def restore_preview(info: dict, fingerprint: str) -> bool:
+    """Expose the cached preview of a session at its path if there is one, marking it as recently used."""
+    cache_entry_path = _get_cache_entry_path(info, fingerprint)
+    if not cache_entry_path.exists():
+        return False
+
+    os.utime(cache_entry_path)  # The modification time orders entries for eviction
+    _link(cache_entry_path, get_conversion_path_info(info)["file"])
+    return True
+
+
+def store_preview(info: dict, fingerprint: str) -> None:
+    """Move a newly converted preview into the cache, and link it back to the path of the session."""
+    nwbfile_path = get_conversion_path_info(info)["file"]
+    cache_entry_path = _get_cache_entry_path(info, fingerprint)
+
+    PREVIEW_CACHE_FOLDER_PATH.mkdir(exist_ok=True, parents=True)
+    _remove(cache_entry_path)
+    shutil.move(str(nwbfile_path), str(cache_entry_path))
+    os.utime(cache_entry_path)
+    _link(cache_entry_path, nwbfile_path)
+
+
+def _unlink_links_to(entry_paths: List[Path]) -> None:
+    """Remove the links of sessions to evicted previews, which would otherwise be left dangling."""
+    entry_paths = set(entry_paths)
+    for directory, folder_names, file_names in os.walk(PREVIEW_CACHE_FOLDER_PATH.parent):
+        # Skip the cache itself
+        folder_names[:] = [name for name in folder_names if Path(directory, name) != PREVIEW_CACHE_FOLDER_PATH]
+        for name in [*folder_names, *file_names]:
+            path = Path(directory, name)
+            if path.is_symlink() and Path(os.readlink(path)) in entry_paths:
+                path.unlink()
+
+
+def evict_previews(quota_in_bytes: float, keep: List[str] = ()) -> dict:
+    """
+    Evict the least recently used previews until the cache fits within the quota, and summarize the cache.
+
+    Entries whose fingerprint is in `keep` (e.g. those of the current request) are never evicted.
+    """
+    if not PREVIEW_CACHE_FOLDER_PATH.exists():
+        return dict(number_of_entries=0, size=0, quota=quota_in_bytes, number_evicted=0)
+
+    entries = []
+    for entry_path in PREVIEW_CACHE_FOLDER_PATH.iterdir():
+        entries.append((entry_path.stat().st_mtime, _get_size(entry_path), entry_path))
+
+    total_size = sum(size for __, size, __ in entries)
+    evicted_paths = []
+    for __, size, entry_path in sorted(entries, key=lambda entry: entry[0]):
+        if total_size <= quota_in_bytes:
+            break
+        if entry_path.name.split(".")[0] in keep:
+            continue
+
+        _remove(entry_path)
+        total_size -= size
+        evicted_paths.append(entry_path)
+
+    if evicted_paths:
+        _unlink_links_to(evicted_paths)
+
+    number_evicted = len(evicted_paths)
+    return dict(
+        number_of_entries=len(entries) - number_evicted,
+        size=total_size,
+        quota=quota_in_bytes,
+        number_evicted=number_evicted,
+    )
@@ -0,0 +1,121 @@
+"""Transport of progress updates from worker processes to the progress handler of the server."""
+
+import math
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from tqdm_publisher import TQDMProgressHandler
+
+progress_handler = TQDMProgressHandler()
+
+# Maximum number of updates per second sent by a worker for each of its progress bars
+DEFAULT_PROGRESS_UPDATE_RATE = 10
+
+# Updates received by the server within this interval are coalesced to the latest one per progress bar
+PROGRESS_FLUSH_INTERVAL = 0.05
+
+_server_queue = None
+_server_queue_lock = threading.Lock()
+
+# Set in each worker process by `initialize_progress_worker`
+_worker_queue = None
+_worker_update_rate = DEFAULT_PROGRESS_UPDATE_RATE
+
+
+def _drain_progress_queue(progress_queue: "multiprocessing.Queue") -> None:
+    pending = dict()
+    next_flush = time.monotonic()
+    while True:
+        timeout = max(next_flush - time.monotonic(), 0) if pending else None
+        try:
+            message = progress_queue.get(timeout=timeout)
+            if "event" in message:  # Structured events are never coalesced
+                pending[id(message)] = message
+            else:
+                pending[(message.get("request_id"), message.get("progress_bar_id"))] = message
+        except queue.Empty:
+            pass
+        except (EOFError, OSError):  # The queue was closed as the server shuts down
+            return
+
+        if pending and time.monotonic() >= next_flush:
+            for message in pending.values():
+                progress_handler.announce(message)
+            pending.clear()
+            next_flush = time.monotonic() + PROGRESS_FLUSH_INTERVAL
+
+
+def get_progress_queue() -> "multiprocessing.Queue":
+    """The queue worker processes report progress on, which a single thread of the server drains into the handler."""
+    global _server_queue
+
+    with _server_queue_lock:
+        if _server_queue is None:
+            _server_queue = multiprocessing.Queue()
+            threading.Thread(target=_drain_progress_queue, args=(_server_queue,), daemon=True).start()
+
+    return _server_queue
+
+
+def initialize_progress_worker(
+    progress_queue: "multiprocessing.Queue", update_rate: Optional[float] = DEFAULT_PROGRESS_UPDATE_RATE
+) -> None:
+    """Initializer of process pools, since queues can only be shared with worker processes as they are created."""
+    global _worker_queue
+
+    _worker_queue = progress_queue
+    set_progress_update_rate(update_rate)
+
+
+def get_worker_progress_queue() -> Optional["multiprocessing.Queue"]:
+    """The queue this worker process reports progress on, to share with the processes it starts in turn."""
+    return _worker_queue
+
+
+def set_progress_update_rate(update_rate: Optional[float] = DEFAULT_PROGRESS_UPDATE_RATE) -> None:
+    """Set the maximum number of updates per second reported by the progress bars subsequently created."""
+    global _worker_update_rate
+
+    _worker_update_rate = update_rate or DEFAULT_PROGRESS_UPDATE_RATE
+
+
+def create_progress_reporter(request_id: Optional[str] = None) -> Callable[[dict], None]:
+    """
+    Create an `on_progress_update` callback that reports the updates of each progress bar at a limited rate.
+
+    Updates are put on the progress queue from worker processes, and announced directly from the server process.
+    The final update of each progress bar is always reported.
+    """
+    interval = 1 / _worker_update_rate
+    last_reported = dict()
+
+    def report(message: dict) -> None:
+        format_dict = message.get("format_dict", dict())
+        total = format_dict.get("total", None)
+        is_complete = total is not None and format_dict.get("n", 0) >= total
+
+        progress_bar_id = message.get("progress_bar_id")
+        now = time.monotonic()
+        if not is_complete and now - last_reported.get(progress_bar_id, -math.inf) < interval:
+            return
+        last_reported[progress_bar_id] = now
+
+        update = dict(request_id=request_id, **message)
+        if _worker_queue is not None:
+            _worker_queue.put(update)
+        else:
+            progress_handler.announce(update)
+
+    return report
+
+
+def announce_event(event: dict, request_id: Optional[str] = None) -> None:
+    """Report a structured event (such as conversion telemetry) alongside progress updates, without throttling."""
+    update = dict(request_id=request_id, event=event)
+    if _worker_queue is not None:
+        _worker_queue.put(update)
+    else:
+        progress_handler.announce(update)
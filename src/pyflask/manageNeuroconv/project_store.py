@@ -0,0 +1,161 @@
+"""
+Server-side store of the conversion payload of each session, which the frontend syncs incrementally.
+
+Conversion and inspection requests then reference sessions by id, rather than carrying the source data, metadata, and
+configuration of every session, and workers load the payload of their session from the store themselves.
+
+Payloads are content-addressed: each is saved once under the hash of its contents, and the index of each project maps
+session ids to the hash of their current payload.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .info import GUIDE_ROOT_FOLDER
+
+PROJECT_STORE_FOLDER_PATH = Path(GUIDE_ROOT_FOLDER, "store")
+
+PROJECT_STORE_INDEX_FILE_NAME = "index.json"
+
+# Payloads no longer referenced by the index are kept this long, so that conversions pinned to them can still run
+UNREFERENCED_OBJECT_LIFETIME_IN_SECONDS = 24 * 60 * 60
+
+# Keys of a session reference that are not overrides of the stored payload
+SESSION_REFERENCE_KEYS = ("session_id", "session_hash")
+
+_index_lock = threading.Lock()
+
+
+def _get_project_store_path(project_name: str) -> Path:
+    return PROJECT_STORE_FOLDER_PATH / project_name
+
+
+def _get_object_path(project_name: str, session_hash: str) -> Path:
+    return _get_project_store_path(project_name) / "objects" / f"{session_hash}.json"
+
+
+def _write_atomically(file_path: Path, contents: str) -> None:
+    file_path.parent.mkdir(exist_ok=True, parents=True)
+    temporary_file_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(file=temporary_file_path, mode="w") as file:
+        file.write(contents)
+    os.replace(temporary_file_path, file_path)
+
+
+def get_session_hash(info: dict) -> str:
+    return hashlib.sha256(json.dumps(info, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_project_index(project_name: str) -> Dict[str, str]:
+    """The hash of the stored payload of each session of a project, by session id."""
+    index_file_path = _get_project_store_path(project_name) / PROJECT_STORE_INDEX_FILE_NAME
+    if not index_file_path.exists():
+        return dict()
+
+    with open(file=index_file_path, mode="r") as file:
+        return json.load(fp=file)
+
+
+def _remove_unreferenced_objects(project_name: str, index: Dict[str, str]) -> None:
+    referenced = set(index.values())
+    cutoff = time.time() - UNREFERENCED_OBJECT_LIFETIME_IN_SECONDS
+    for object_path in (_get_project_store_path(project_name) / "objects").glob("*.json"):
+        try:
+            if object_path.stem not in referenced and object_path.stat().st_mtime < cutoff:
+                object_path.unlink()
+        except OSError:  # Removed concurrently
+            continue
+
+
+def update_project_store(
+    project_name: str, sessions: Optional[Dict[str, dict]] = None, remove: Optional[List[str]] = None
+) -> Dict[str, str]:
+    """
+    Store the payloads of some sessions of a project, by session id, and remove others from its index.
+
+    Only payloads whose contents changed are written. Returns the updated index.
+    """
+    sessions = sessions or dict()
+
+    hashes = dict()
+    for session_id, info in sessions.items():
+        session_hash = hashes[session_id] = get_session_hash(info)
+        object_path = _get_object_path(project_name, session_hash)
+        if object_path.exists():
+            os.utime(object_path)  # Restart the lifetime of payloads that are referenced again
+        else:
+            _write_atomically(object_path, json.dumps(info, default=str))
+
+    with _index_lock:
+        index = get_project_index(project_name)
+        index.update(hashes)
+        for session_id in remove or []:
+            index.pop(session_id, None)
+
+        _write_atomically(
+            _get_project_store_path(project_name) / PROJECT_STORE_INDEX_FILE_NAME, json.dumps(index, indent=4)
+        )
+        _remove_unreferenced_objects(project_name, index)
+
+    return index
+
+
+def load_stored_session(project_name: str, session_id: str, session_hash: Optional[str] = None) -> dict:
+    """Load the payload of a session, either as currently indexed or the version of `session_hash`."""
+    if session_hash is None:
+        index = get_project_index(project_name)
+        if session_id not in index:
+            raise KeyError(f"The session '{session_id}' of the project '{project_name}' has not been stored.")
+        session_hash = index[session_id]
+
+    object_path = _get_object_path(project_name, session_hash)
+    if not object_path.exists():
+        raise KeyError(f"The stored version of the session '{session_id}' of the project '{project_name}' was removed.")
+
+    with open(file=object_path, mode="r") as file:
+        return json.load(fp=file)
+
+
+def is_session_reference(info: dict) -> bool:
+    return "session_id" in info
+
+
+def pin_session_reference(info: dict) -> dict:
+    """Pin a session reference to the current version of its payload, which later syncs will not change."""
+    if not is_session_reference(info) or "session_hash" in info:
+        return info
+
+    index = get_project_index(info["project_name"])
+    if info["session_id"] not in index:
+        raise KeyError(
+            f"The session '{info['session_id']}' of the project '{info['project_name']}' has not been stored."
+        )
+
+    return dict(info, session_hash=index[info["session_id"]])
+
+
+def resolve_session_reference(info: dict) -> dict:
+    """
+    The payload of a session given a reference to it (with the `project_name` and `session_id` of a stored session).
+
+    Other keys of the reference override those of the stored payload, and are removed from it if null.
+    Full payloads are returned as they are.
+    """
+    if not is_session_reference(info):
+        return info
+
+    resolved = load_stored_session(info["project_name"], info["session_id"], session_hash=info.get("session_hash"))
+    for key, value in info.items():
+        if key in SESSION_REFERENCE_KEYS:
+            continue
+        if value is None:
+            resolved.pop(key, None)
+        else:
+            resolved[key] = value
+
+    return resolved
@@ -0,0 +1,115 @@
+"""Saved GUIDE projects, and the per-session conversion payloads the frontend builds from them."""
+
+import copy
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .info import PROJECT_SAVE_FOLDER_PATH
+
+
+def load_project(project: str) -> dict:
+    """Load a saved project, given either the path to its file or its name among the projects saved by the GUIDE."""
+    project_file_path = Path(project)
+    if not project_file_path.is_file():
+        project_file_path = PROJECT_SAVE_FOLDER_PATH / f"{project}.json"
+
+    if not project_file_path.is_file():
+        raise FileNotFoundError(f"No GUIDE project was found at '{project}' or '{project_file_path}'.")
+
+    with open(file=project_file_path, mode="r") as file:
+        return json.load(fp=file)
+
+
+def _merge(to_merge: dict, target: dict) -> dict:
+    """Deep merge `to_merge` into `target`, replacing arrays and primitive values."""
+    for key, value in to_merge.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            target[key] = _merge(value, target[key])
+        else:
+            target[key] = value
+
+    return target
+
+
+def _resolve_properties(properties: dict, target: dict, globals: Optional[dict] = None) -> dict:
+    """Fill in the properties of a schema missing from the metadata of a session with project-wide values or defaults."""
+    globals = globals or dict()
+    if "properties" in properties and "type" in properties:  # A schema was passed instead of its properties
+        properties = properties["properties"]
+
+    for name, info in properties.items():
+        nested_properties = info.get("properties")
+
+        if name not in target:
+            if target.get("__disabled", dict()).get(name):
+                continue
+
+            if nested_properties is not None:
+                target[name] = dict()
+
+            if name in globals:
+                target[name] = globals[name]
+            elif info.get("default"):
+                target[name] = info["default"]
+
+        if target.get(name) and isinstance(target[name], dict):
+            _resolve_properties(nested_properties or dict(), target[name], globals.get(name))
+
+    return target
+
+
+def resolve_session_metadata(project: dict, subject: str, session: str) -> dict:
+    """Resolve the metadata of a session from its own form, the subject, and the project-wide metadata."""
+    overrides = copy.deepcopy(project.get("project", dict()))
+
+    subject_metadata = copy.deepcopy(project.get("subjects", dict()).get(subject, dict()))
+    subject_metadata.pop("sessions", None)
+    _merge(subject_metadata, overrides.setdefault("Subject", dict()))
+
+    metadata = copy.deepcopy(project["results"][subject][session]["metadata"])
+    schema = project.get("schema", dict()).get("metadata", dict()).get(subject, dict()).get(session, dict())
+    return _resolve_properties(schema, metadata, overrides)
+
+
+def get_project_sessions(project: dict) -> List[Tuple[str, str]]:
+    return [(subject, session) for subject, sessions in project.get("results", dict()).items() for session in sessions]
+
+
+def select_shard(sessions: list, shard: int, number_of_shards: int) -> list:
+    """Assign the sessions of a project, in a stable order, to one of `number_of_shards` array jobs (counted from 0)."""
+    if not 0 <= shard < number_of_shards:
+        raise ValueError(f"Shard {shard} is out of range for {number_of_shards} shards (counted from 0).")
+
+    return sorted(sessions)[shard::number_of_shards]
+
+
+def get_conversion_payload(project: dict, subject: str, session: str, stub_test: bool = False) -> dict:
+    """The `info` of a session passed to `convert_to_nwb`, as built by the conversion pages of the frontend."""
+    project_info = project.get("project", dict())
+    workflow = project_info.get("workflow", dict())
+    session_results = project["results"][subject][session]
+
+    configuration = dict(session_results.get("configuration") or dict())
+    configuration.setdefault("backend", workflow.get("file_format", "hdf5"))
+
+    payload = dict(
+        project_name=project_info["name"],
+        nwbfile_path=f"sub-{subject}/sub-{subject}_ses-{session}.nwb",
+        overwrite=True,
+        configuration=configuration,
+        metadata=resolve_session_metadata(project, subject=subject, session=session),
+        source_data=_merge(
+            copy.deepcopy(project_info.get("SourceData", dict())), copy.deepcopy(session_results["source_data"])
+        ),
+        interfaces=project.get("interfaces", dict()),
+        alignment=project_info.get("alignment"),
+        timezone=workflow.get("timezone"),
+    )
+
+    if stub_test:
+        payload["stub_test"] = True
+    elif project_info.get("conversion_output_folder"):
+        payload["output_folder"] = project_info["conversion_output_folder"]
+
+    return payload
@@ -0,0 +1,76 @@
+"""Read-ahead of the buffers of data chunk iterators, overlapping reads from the source with compression and writes."""
+
+import collections
+from concurrent.futures import Executor
+from typing import Iterator, Optional
+
+from pynwb import NWBFile
+
+# Number of buffers read ahead of the one being written
+DEFAULT_READ_AHEAD_BUFFERS = 2
+
+# Number of background threads reading from the source; more than one requires thread-safe extractors
+DEFAULT_READ_AHEAD_THREADS = 1
+
+
+class ReadAhead:
+    """
+    Read the buffers of a `GenericDataChunkIterator` in order on background threads, ahead of their consumption.
+
+    At most `number_of_buffers` buffers are held beyond the one currently being written, which bounds the memory used.
+    """
+
+    def __init__(self, iterator: "GenericDataChunkIterator", number_of_buffers: int, executor: Executor):
+        self._read = iterator._get_data
+        self._selections = iterator.buffer_selection_generator
+        self._number_of_buffers = max(number_of_buffers, 1)
+        self._executor = executor
+
+        self._pending = collections.deque()
+        self._current = None
+
+    def _fill(self) -> None:
+        while len(self._pending) < self._number_of_buffers:
+            selection = next(self._selections, None)
+            if selection is None:
+                return
+            self._pending.append((selection, self._executor.submit(self._read, selection=selection)))
+
+    def selections(self) -> Iterator[tuple]:
+        self._fill()
+        while self._pending:
+            selection, self._current = self._pending.popleft()
+            self._fill()
+            yield selection
+
+    def get_data(self, selection: tuple) -> "np.ndarray":
+        return self._current.result()  # The iterator always reads the selection it was last given
+
+
+def enable_read_ahead(
+    nwbfile: NWBFile, executor: Executor, number_of_buffers: Optional[int] = DEFAULT_READ_AHEAD_BUFFERS
+) -> int:
+    """
+    Read ahead on every data chunk iterator of an in-memory NWBFile that has not started iterating yet.
+
+    Returns the number of iterators that now read ahead.
+    """
+    from hdmf.data_utils import DataIO, GenericDataChunkIterator
+
+    number_of_buffers = number_of_buffers or DEFAULT_READ_AHEAD_BUFFERS
+
+    iterators = dict()
+    for neurodata_object in nwbfile.objects.values():
+        for value in neurodata_object.fields.values():
+            data = value.data if isinstance(value, DataIO) else value
+            if isinstance(data, GenericDataChunkIterator):
+                iterators[id(data)] = data
+
+    for iterator in iterators.values():
+        read_ahead = ReadAhead(iterator=iterator, number_of_buffers=number_of_buffers, executor=executor)
+
+        # Instance attributes take precedence over the methods of the iterator class
+        iterator.buffer_selection_generator = read_ahead.selections()
+        iterator._get_data = read_ahead.get_data
+
+    return len(iterators)
@@ -0,0 +1,216 @@
+"""
+Size-aware scheduling of sessions on a process pool, with concurrency adapted to the resources of the machine.
+
+Sessions are submitted largest-first, and the number run concurrently adapts to the available CPU, memory, and disk
+throughput, up to `max_workers` (all logical cores by default). The native libraries of each worker (BLAS, Blosc, and
+the HDF5 filters) are limited to its share of the logical cores at `max_workers`, so that concurrent sessions do not
+oversubscribe the CPUs, and `pin_cpus` also pins each worker to its own cores on Linux (see `thread_limits.py`).
+
+Given a total `memory_budget_gb`, the buffers of each session are sized to its share of the budget, and no further
+sessions are started while the workers near it. Progress updates report the resident memory of the workers, and its
+peak, against the budget.
+"""
+
+import math
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+# Interval at which resource usage is sampled and the concurrency limit revised
+SCHEDULER_INTERVAL = 1.0
+
+# No further sessions are started while system-wide CPU usage (in percent) is above this
+MAXIMUM_CPU_PERCENT = 90
+
+# Concurrency is reduced while less memory than this (in GB) is available
+MINIMUM_AVAILABLE_MEMORY_IN_GB = 2
+
+# Relative gain in disk write throughput required to keep an additional concurrent session
+MINIMUM_DISK_THROUGHPUT_GAIN = 0.1
+
+# Number of samples at a given concurrency before it is compared against another or ramped up from
+MINIMUM_SAMPLES_PER_CONCURRENCY = 3
+
+# Time (in seconds) for which concurrency stays capped once the disk is saturated, before it is measured again
+DISK_THROUGHPUT_CAP_DURATION = 30
+
+# No further sessions are started while the worker processes use more than this fraction of the memory budget
+MEMORY_BUDGET_ADMISSION_FRACTION = 0.8
+
+
+def get_worker_memory_in_gb() -> float:
+    """
+    Resident memory of the workers running jobs, along with the processes they started.
+
+    Idle workers of the persistent pool are excluded, as they only hold the libraries imported ahead of any job.
+    """
+    import psutil
+
+    from .worker_pool import get_busy_worker_pids
+
+    resident_memory = 0
+    for pid in get_busy_worker_pids():
+        try:
+            worker = psutil.Process(pid)
+            for process in [worker, *worker.children(recursive=True)]:
+                resident_memory += process.memory_info().rss
+        except psutil.Error:  # The process exited in the meantime
+            continue
+
+    return resident_memory / 1e9
+
+
+class ConcurrencyController:
+    """
+    Adapt the number of sessions run concurrently to the observed CPU usage, memory headroom, and disk throughput.
+
+    Concurrency starts at `max_workers`, or at the number of sessions of `session_memory_gb` that fit in the available
+    memory if fewer. It backs off when memory runs low, and ramps back up by one session every few intervals while the
+    CPU is not saturated and memory is available. Once running more sessions no longer increases the disk write
+    throughput, the disk is considered saturated, and concurrency is capped below that number of sessions for a while,
+    after which the throughput is measured again.
+
+    Given a `memory_budget_gb`, no further sessions are admitted while the resident memory of the workers nears the
+    budget, and concurrency backs off once it is exceeded. The peak resident memory is tracked for reporting.
+    """
+
+    def __init__(
+        self, max_workers: int, memory_budget_gb: Optional[float] = None, session_memory_gb: Optional[float] = None
+    ):
+        import psutil
+
+        self.max_workers = max_workers
+        self.memory_budget_gb = memory_budget_gb
+
+        self.limit = max_workers
+        if session_memory_gb:
+            available_memory_in_gb = psutil.virtual_memory().available / 1e9 - MINIMUM_AVAILABLE_MEMORY_IN_GB
+            self.limit = max(1, min(max_workers, math.floor(available_memory_in_gb / session_memory_gb)))
+
+        self.disk_throughput_cap = None
+        self._disk_throughput_cap_expiry = None
+
+        self.worker_memory_gb = 0.0
+        self.peak_worker_memory_gb = 0.0
+
+        self._disk_throughputs = dict()  # Disk write throughput samples (MB/s) by number of running sessions
+        self._number_of_samples = dict()
+        self._last_disk_counters = psutil.disk_io_counters()
+        self._last_sample_time = time.monotonic()
+        psutil.cpu_percent(interval=None)  # The first call only sets the reference for the next one
+
+    def _sample_disk_throughput(self, elapsed: float) -> Optional[float]:
+        import psutil
+
+        counters = psutil.disk_io_counters()
+        if counters is None or self._last_disk_counters is None:
+            return None  # Disk counters are not available in every environment
+
+        throughput = (counters.write_bytes - self._last_disk_counters.write_bytes) / elapsed / 1e6
+        self._last_disk_counters = counters
+
+        return throughput
+
+    def update(self, number_running: int) -> int:
+        """Sample resource usage while `number_running` sessions are running and return the new limit."""
+        import psutil
+
+        now = time.monotonic()
+        elapsed = now - self._last_sample_time
+        if elapsed < SCHEDULER_INTERVAL:
+            return self.limit  # Shorter samples are dominated by noise
+        self._last_sample_time = now
+
+        cpu_percent = psutil.cpu_percent(interval=None)
+        available_memory_in_gb = psutil.virtual_memory().available / 1e9
+
+        disk_throughput = self._sample_disk_throughput(elapsed=elapsed)
+        if number_running > 0:
+            self._number_of_samples[number_running] = self._number_of_samples.get(number_running, 0) + 1
+            if disk_throughput is not None:
+                self._disk_throughputs.setdefault(number_running, []).append(disk_throughput)
+
+        # Lift an expired cap, and measure the throughput anew, since other sessions are running by now
+        if self._disk_throughput_cap_expiry is not None and now >= self._disk_throughput_cap_expiry:
+            self.disk_throughput_cap = self._disk_throughput_cap_expiry = None
+            self._disk_throughputs.clear()
+
+        # Cap concurrency below the number of sessions that did not write (sufficiently) faster than one fewer
+        fewer_throughputs = self._disk_throughputs.get(number_running - 1, [])
+        current_throughputs = self._disk_throughputs.get(number_running, [])
+        if (
+            len(fewer_throughputs) >= MINIMUM_SAMPLES_PER_CONCURRENCY
+            and len(current_throughputs) >= MINIMUM_SAMPLES_PER_CONCURRENCY
+            and statistics.median(current_throughputs)
+            < statistics.median(fewer_throughputs) * (1 + MINIMUM_DISK_THROUGHPUT_GAIN)
+        ):
+            self.disk_throughput_cap = max(1, number_running - 1)
+            self._disk_throughput_cap_expiry = now + DISK_THROUGHPUT_CAP_DURATION
+
+        self.worker_memory_gb = get_worker_memory_in_gb()
+        self.peak_worker_memory_gb = max(self.peak_worker_memory_gb, self.worker_memory_gb)
+        memory_budget_gb = self.memory_budget_gb or math.inf
+
+        if available_memory_in_gb < MINIMUM_AVAILABLE_MEMORY_IN_GB or self.worker_memory_gb > memory_budget_gb:
+            self.limit = max(1, min(self.limit, number_running) - 1)
+        elif self.worker_memory_gb > memory_budget_gb * MEMORY_BUDGET_ADMISSION_FRACTION:
+            self.limit = max(1, min(self.limit, number_running))  # Admit no further sessions
+        elif (
+            cpu_percent < MAXIMUM_CPU_PERCENT
+            and number_running >= self.limit
+            and self._number_of_samples.get(number_running, 0) >= MINIMUM_SAMPLES_PER_CONCURRENCY
+        ):
+            self.limit += 1
+
+        self.limit = min(self.limit, self.max_workers, self.disk_throughput_cap or self.max_workers)
+
+        return self.limit
+
+
+class FixedConcurrencyController:
+    """Run a fixed number of jobs concurrently, for jobs too short for resource usage to be sampled meaningfully."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = self.limit = max_workers
+
+    def update(self, number_running: int) -> int:
+        return self.limit
+
+
+def run_scheduled(
+    executor: Executor,
+    function: Callable,
+    jobs: List[Tuple[int, tuple, dict]],
+    max_workers: int,
+    controller: Optional[Union[ConcurrencyController, FixedConcurrencyController]] = None,
+) -> Iterator[Tuple[Future, Dict[str, Any]]]:
+    """
+    Submit jobs, given as (size, args, kwargs), to an executor largest-first as the concurrency limit allows.
+
+    Yields each completed future along with the time its job spent queued and running (in seconds).
+    """
+    controller = controller or ConcurrencyController(max_workers=max_workers)
+
+    start_time = time.monotonic()
+    pending = sorted(range(len(jobs)), key=lambda index: jobs[index][0], reverse=True)
+    running = dict()
+
+    while pending or running:
+        while pending and len(running) < controller.limit:
+            index = pending.pop(0)
+            __, args, kwargs = jobs[index]
+            running[executor.submit(function, *args, **kwargs)] = dict(index=index, submitted=time.monotonic())
+
+        done, __ = wait(running, timeout=SCHEDULER_INTERVAL, return_when=FIRST_COMPLETED)
+        controller.update(number_running=len(running))
+
+        for future in done:
+            job = running.pop(future)
+            completed = time.monotonic()
+            timing = dict(
+                index=job["index"],
+                queue_time=job["submitted"] - start_time,
+                run_time=completed - job["submitted"],
+            )
+            yield future, timing
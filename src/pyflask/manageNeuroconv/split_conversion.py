@@ -0,0 +1,326 @@
+"""
+Conversion of a session into one HDF5 file per heavy interface, written in parallel by separate processes.
+
+HDF5 files have a single writer, so the interfaces of a session are otherwise written one after another. Instead, the
+heavy datasets of each interface (such as each probe of a SpikeGLX converter) are written to a part file of their own,
+while the NWB file of the session holds everything else and links to the datasets of the parts. Consolidation later
+copies the linked datasets into the NWB file, so that it no longer depends on its parts.
+
+Full HDF5 conversions opt in by setting `split_interfaces`, and report the paths of their `parts`. Given `consolidate`,
+batch conversions consolidate each file on the worker pool while the remaining sessions convert, announcing it as a
+`consolidated` event, and only return once every file is consolidated (so that none is read while it is replaced).
+"""
+
+import math
+import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from shutil import rmtree
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from pynwb import NWBContainer, NWBFile
+
+from .manage_neuroconv import (
+    DEFAULT_BUFFER_GB,
+    MINIMUM_BUFFER_GB,
+    apply_dataset_configurations,
+    get_conversion_info,
+)
+from .progress import (
+    create_progress_reporter,
+    get_worker_progress_queue,
+    initialize_progress_worker,
+)
+from .telemetry import ConversionTelemetry
+from .thread_limits import get_number_of_cpus, get_thread_limit
+from .worker_pool import get_worker_pool, with_thread_limit
+
+# Interfaces whose datasets are smaller than this are written to the NWB file of the session itself
+MINIMUM_PART_SIZE_IN_GB = 0.1
+
+PARTS_FOLDER_SUFFIX = "_parts"
+
+
+def get_parts_folder(nwbfile_path: Path) -> Path:
+    """The folder holding the part files linked from an NWB file, next to it."""
+    nwbfile_path = Path(nwbfile_path)
+    return nwbfile_path.parent / f"{nwbfile_path.stem}{PARTS_FOLDER_SUFFIX}"
+
+
+def _get_part_file_path(nwbfile_path: Path, part: Tuple[str, ...]) -> Path:
+    part_name = re.sub(r"[^\w.-]", "_", "-".join(part))
+    return get_parts_folder(nwbfile_path) / f"{part_name}.nwb"
+
+
+def _get_part_info(info: dict, part: Tuple[str, ...]) -> dict:
+    """
+    The conversion info of a session restricted to the interface (or nested converter) of a part.
+
+    Sorting interfaces linked to a recording interface for their alignment keep it.
+    """
+    names = [part[0]]
+    alignment_info = info.get("alignment", dict()).get(part[0], dict())
+    if alignment_info.get("selected") == "linked":
+        names.append(alignment_info["values"]["linked"])
+
+    return dict(
+        info,
+        interfaces={name: info["interfaces"][name] for name in names},
+        source_data={name: info["source_data"][name] for name in names if name in info["source_data"]},
+    )
+
+
+def iterate_parts(converter, conversion_options: Optional[dict] = None) -> Iterator[tuple]:
+    """
+    The interfaces of a converter that may be written separately, with their conversion options.
+
+    Nested converters are split into their own interfaces, which are identified by the names of both.
+    """
+    import inspect
+
+    from neuroconv import NWBConverter
+
+    conversion_options = conversion_options or dict()
+    for name, interface_or_subconverter in converter.data_interface_objects.items():
+        options = conversion_options.get(name, dict())
+        if not isinstance(interface_or_subconverter, NWBConverter):
+            yield (name,), interface_or_subconverter, options
+            continue
+
+        # Subconverters either take the options of each of their interfaces, or the same options for all of them
+        has_nested_options = (
+            "conversion_options" in inspect.signature(interface_or_subconverter.add_to_nwbfile).parameters
+        )
+        for sub_name, interface in interface_or_subconverter.data_interface_objects.items():
+            yield (name, sub_name), interface, options.get(sub_name, dict()) if has_nested_options else options
+
+
+def build_in_memory_nwbfile_by_part(
+    converter, metadata: dict, conversion_options: Optional[dict] = None
+) -> Tuple[NWBFile, Dict[tuple, Set[str]]]:
+    """
+    Temporally align the interfaces of a converter and add them to a new in-memory NWBFile one by one.
+
+    Returns the NWBFile, along with the ids of the objects added by each part.
+    """
+    from neuroconv.tools.nwb_helpers import make_nwbfile_from_metadata
+
+    converter.temporally_align_data_interfaces()
+
+    nwbfile = make_nwbfile_from_metadata(metadata=metadata)
+    object_ids_by_part = dict()
+    for part, interface, options in iterate_parts(converter, conversion_options=conversion_options):
+        # Unlike `nwbfile.objects`, which is only collected once, this also refreshes it
+        existing_object_ids = {child.object_id for child in nwbfile.all_children()}
+        interface.add_to_nwbfile(nwbfile=nwbfile, metadata=metadata, **options)
+        object_ids_by_part[part] = {child.object_id for child in nwbfile.all_children()} - existing_object_ids
+
+    return nwbfile, object_ids_by_part
+
+
+def get_heavy_parts(
+    nwbfile: NWBFile,
+    object_ids_by_part: Dict[tuple, Set[str]],
+    backend_configuration: "BackendConfiguration",
+    minimum_part_size_in_gb: float = MINIMUM_PART_SIZE_IN_GB,
+) -> Dict[tuple, List[str]]:
+    """
+    The locations of the datasets to write separately, by part.
+
+    Only the data and timestamps of neurodata objects are linked, as table columns cannot be written by another file.
+    """
+    part_by_object_id = {object_id: part for part, object_ids in object_ids_by_part.items() for object_id in object_ids}
+
+    locations_by_part = dict()
+    bytes_by_part = dict()
+    for location_in_file, dataset_configuration in backend_configuration.dataset_configurations.items():
+        part = part_by_object_id.get(dataset_configuration.object_id)
+        if part is None or not isinstance(nwbfile.objects[dataset_configuration.object_id], NWBContainer):
+            continue
+
+        locations_by_part.setdefault(part, []).append(location_in_file)
+        bytes_by_part[part] = bytes_by_part.get(part, 0) + (
+            math.prod(dataset_configuration.full_shape) * dataset_configuration.dtype.itemsize
+        )
+
+    return {
+        part: locations
+        for part, locations in locations_by_part.items()
+        if bytes_by_part[part] >= minimum_part_size_in_gb * 1e9
+    }
+
+
+def _get_part_conversion_options(interface, request_id: Optional[str], buffer_gb: Optional[float]) -> dict:
+    from tqdm_publisher import TQDMProgressSubscriber
+
+    properties = interface.get_conversion_options_schema().get("properties", dict())
+    if "iterator_opts" not in properties:
+        return dict()
+
+    iterator_options = dict(
+        display_progress=True,
+        progress_bar_class=TQDMProgressSubscriber,
+        progress_bar_options=dict(mininterval=0, on_progress_update=create_progress_reporter(request_id=request_id)),
+    )
+    if buffer_gb is not None:
+        iterator_options["buffer_gb"] = buffer_gb
+
+    return dict(iterator_opts=iterator_options)
+
+
+def write_part(
+    info: dict, part: Tuple[str, ...], part_file_path: str, request_id: Optional[str], buffer_gb: Optional[float]
+) -> dict:
+    """
+    Write a single part of a session to its own NWB file, in a process of its own.
+
+    Only the interface of the part is instantiated. Returns the path of the part file, along with the phases and
+    datasets timed while writing it.
+    """
+    from neuroconv.tools.nwb_helpers import (
+        configure_backend,
+        get_default_backend_configuration,
+        make_nwbfile_from_metadata,
+    )
+    from pynwb import NWBHDF5IO
+
+    telemetry = ConversionTelemetry(request_id=request_id)
+    converter, metadata, __ = get_conversion_info(_get_part_info(info, part), telemetry=telemetry)
+    converter.temporally_align_data_interfaces()
+
+    interface = next(interface for key, interface, __ in iterate_parts(converter) if key == part)
+    nwbfile = make_nwbfile_from_metadata(metadata=metadata)
+    with telemetry.phase("add_to_nwbfile", interface="-".join(part)):
+        interface.add_to_nwbfile(
+            nwbfile=nwbfile, metadata=metadata, **_get_part_conversion_options(interface, request_id, buffer_gb)
+        )
+
+    with telemetry.phase("configure_backend", backend="hdf5"):
+        backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend="hdf5")
+        dataset_configurations = info.get("configuration", dict()).get("results", dict()).get("hdf5")
+        apply_dataset_configurations(backend_configuration, dataset_configurations, ignore_missing=True)
+    telemetry.instrument_datasets(nwbfile=nwbfile, backend_configuration=backend_configuration)
+    configure_backend(nwbfile=nwbfile, backend_configuration=backend_configuration)
+
+    with telemetry.phase("write_part", backend="hdf5"):
+        with NWBHDF5IO(path=part_file_path, mode="w") as io:
+            io.write(nwbfile)
+    telemetry.record_storage(nwbfile_path=part_file_path, backend="hdf5")
+
+    return dict(path=part_file_path, phases=telemetry.phases, datasets=telemetry.datasets)
+
+
+def write_split_nwbfile(
+    info: dict,
+    nwbfile: NWBFile,
+    object_ids_by_part: Dict[tuple, Set[str]],
+    backend_configuration: "BackendConfiguration",
+    nwbfile_path: Path,
+    buffer_gb: Optional[float] = None,
+    telemetry: Optional[ConversionTelemetry] = None,
+) -> Optional[List[str]]:
+    """
+    Write the heavy parts of a session to their own files in parallel, then the NWB file of the session linking to them.
+
+    Each part is written by a separate process, which shares the native threads and the `buffer_gb` of this one. The
+    phases and datasets timed by each process are added to the `telemetry` of the session. Returns the paths of the
+    parts, or `None` without writing anything if fewer than two parts are heavy enough to gain from it.
+    """
+    import h5py
+    from neuroconv.tools.nwb_helpers import configure_backend
+    from pynwb import NWBHDF5IO
+
+    # Cached configurations refer to the objects of the file they were derived from
+    locations_to_remap = backend_configuration.find_locations_requiring_remapping(nwbfile=nwbfile)
+    if any(locations_to_remap):
+        backend_configuration = backend_configuration.build_remapped_backend(locations_to_remap=locations_to_remap)
+
+    heavy_parts = get_heavy_parts(
+        nwbfile,
+        object_ids_by_part,
+        backend_configuration=backend_configuration,
+        minimum_part_size_in_gb=MINIMUM_PART_SIZE_IN_GB,
+    )
+    if len(heavy_parts) < 2:
+        return None
+
+    parts_folder = get_parts_folder(nwbfile_path)
+    if parts_folder.exists():
+        rmtree(parts_folder)
+    parts_folder.mkdir(parents=True)
+
+    number_of_threads = max(1, (get_thread_limit() or get_number_of_cpus()) // len(heavy_parts))
+    part_buffer_gb = max((buffer_gb or DEFAULT_BUFFER_GB) / len(heavy_parts), MINIMUM_BUFFER_GB)
+    with ProcessPoolExecutor(
+        max_workers=len(heavy_parts),
+        initializer=initialize_progress_worker,
+        initargs=(get_worker_progress_queue(),),
+    ) as executor:
+        futures = {
+            part: executor.submit(
+                with_thread_limit(write_part, number_of_threads=number_of_threads),
+                info,
+                part,
+                str(_get_part_file_path(nwbfile_path, part)),
+                info.get("request_id"),
+                part_buffer_gb,
+            )
+            for part in heavy_parts
+        }
+        written_parts = {part: future.result() for part, future in futures.items()}
+
+    part_file_paths = {part: written_part["path"] for part, written_part in written_parts.items()}
+    if telemetry is not None:
+        for part, written_part in written_parts.items():
+            telemetry.record_part("-".join(part), phases=written_part["phases"], datasets=written_part["datasets"])
+
+    # Replace the heavy datasets of the configured in-memory file with those of the parts, written as external links
+    configure_backend(nwbfile=nwbfile, backend_configuration=backend_configuration)
+    part_files = [h5py.File(part_file_path, mode="r") for part_file_path in part_file_paths.values()]
+    try:
+        for part_file, locations in zip(part_files, heavy_parts.values()):
+            for location_in_file in locations:
+                dataset_configuration = backend_configuration.dataset_configurations[location_in_file]
+                neurodata_object = nwbfile.objects[dataset_configuration.object_id]
+                neurodata_object.fields[dataset_configuration.dataset_name] = part_file[location_in_file]
+
+        with NWBHDF5IO(path=str(nwbfile_path), mode="w") as io:
+            io.write(nwbfile)
+    finally:
+        for part_file in part_files:
+            part_file.close()
+
+    return list(part_file_paths.values())
+
+
+def consolidate_nwbfile(nwbfile_path: str) -> str:
+    """Copy the datasets an NWB file links to from its parts into a single file that replaces it, then remove them."""
+    from pynwb import NWBHDF5IO
+
+    nwbfile_path = Path(nwbfile_path)
+    consolidated_file_path = nwbfile_path.with_name(f".{nwbfile_path.name}.consolidating")
+
+    # Chunks are copied as they are, without being compressed again
+    with NWBHDF5IO(path=str(nwbfile_path), mode="r") as read_io:
+        with NWBHDF5IO(path=str(consolidated_file_path), mode="w") as export_io:
+            export_io.export(src_io=read_io, write_args=dict(link_data=False))
+
+    os.replace(consolidated_file_path, nwbfile_path)
+    rmtree(get_parts_folder(nwbfile_path), ignore_errors=True)
+
+    return str(nwbfile_path)
+
+
+def submit_consolidation(nwbfile_path: str) -> Future:
+    """Consolidate an NWB file on the worker pool, alongside any conversions still running."""
+    return get_worker_pool().submit(consolidate_nwbfile, str(nwbfile_path))
+
+
+def get_unconsolidated_files(folder_path: Path) -> List[Path]:
+    """The NWB files of a folder (following links to them) that still link to the datasets of their parts."""
+    return sorted(
+        nwbfile_path
+        for nwbfile_path in Path(folder_path).rglob("*.nwb")
+        if get_parts_folder(nwbfile_path.resolve()).exists()
+    )
@@ -0,0 +1,213 @@
+"""Per-phase timing of conversions, reported on the progress stream and as a JSON report next to the NWB file."""
+
+import contextlib
+import functools
+import json
+import math
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from pynwb import NWBFile
+
+from .progress import announce_event
+
+TELEMETRY_REPORT_SUFFIX = ".telemetry.json"
+
+
+class ConversionTelemetry:
+    """
+    Time the phases of the conversion of a session, and the source reads and writes of each of its datasets.
+
+    Each phase is announced as an event on the progress stream as soon as it completes. Dataset timings are measured
+    on the thread that writes the file: `read_time` is the time spent waiting on the source for each buffer (after any
+    read-ahead), and `write_time` the time spent compressing and writing between buffers.
+
+    When the buffers of all datasets are written at once (as by the parallel Zarr writer), the time between buffers
+    of a dataset also covers the compression of the others, so no `write_time` is reported per dataset. The total
+    `write_time` is then the wall time of the whole write phase.
+
+    The parts of a split conversion are timed by the processes that write them, and labelled with their part. As they
+    are written in parallel, their total `read_time` and `write_time` may exceed the wall time of the write phase.
+    """
+
+    def __init__(self, request_id: Optional[str] = None):
+        self.request_id = request_id
+        self.phases = []
+        self.datasets = dict()
+        self.interleaved_writes = False
+        self._start_time = time.perf_counter()
+
+    def record_phase(self, name: str, start_time: float, **details) -> None:
+        """Record a phase that started at `start_time` (from `time.perf_counter`) and has just completed."""
+        record = dict(phase=name, duration=time.perf_counter() - start_time, **details)
+        self.phases.append(record)
+        announce_event(event=dict(type="conversion_phase", **record), request_id=self.request_id)
+
+    @contextlib.contextmanager
+    def phase(self, name: str, **details) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, start_time=start_time, **details)
+
+    def record_part(self, part: str, phases: List[dict], datasets: Dict[str, dict]) -> None:
+        """Add the phases and datasets timed by the process that wrote a part of a split conversion."""
+        self.phases.extend(dict(phase, part=part) for phase in phases)
+        self.datasets.update(datasets)
+
+    def instrument_interfaces(self, converter: "NWBConverter") -> None:
+        """Time the addition of each interface (or nested converter) to the in-memory NWBFile."""
+        for name, interface in converter.data_interface_objects.items():
+            interface.add_to_nwbfile = self._timed(interface.add_to_nwbfile, phase="add_to_nwbfile", interface=name)
+
+    def _timed(self, function, phase: str, **details):
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            with self.phase(phase, **details):
+                return function(*args, **kwargs)
+
+        return timed_function
+
+    def instrument_datasets(
+        self, nwbfile: NWBFile, backend_configuration: "BackendConfiguration", interleaved_writes: bool = False
+    ) -> None:
+        """
+        Measure the reads and writes of every dataset that is written from a data chunk iterator.
+
+        With `interleaved_writes`, only the reads of each dataset are measured.
+        """
+        from hdmf.data_utils import DataIO, GenericDataChunkIterator
+
+        self.interleaved_writes = interleaved_writes
+
+        # Cached configurations refer to the objects of the file they were derived from
+        locations_to_remap = backend_configuration.find_locations_requiring_remapping(nwbfile=nwbfile)
+        if any(locations_to_remap):
+            backend_configuration = backend_configuration.build_remapped_backend(locations_to_remap=locations_to_remap)
+
+        for location_in_file, dataset_configuration in backend_configuration.dataset_configurations.items():
+            record = dict(
+                uncompressed_bytes=math.prod(dataset_configuration.full_shape) * dataset_configuration.dtype.itemsize,
+                bytes_read=0,
+                bytes_written=None,
+                read_time=None,
+                write_time=None,
+                number_of_buffers=0,
+            )
+            self.datasets[location_in_file] = record
+
+            neurodata_object = nwbfile.objects[dataset_configuration.object_id]
+            value = neurodata_object.fields.get(dataset_configuration.dataset_name)
+            data = value.data if isinstance(value, DataIO) else value
+            if isinstance(data, GenericDataChunkIterator):
+                _instrument_iterator(iterator=data, record=record, time_writes=not interleaved_writes)
+
+    def record_storage(self, nwbfile_path: Path, backend: str) -> None:
+        """Record the size each dataset occupies in the written file."""
+        if backend == "zarr":
+            import zarr
+
+            file = zarr.open(str(nwbfile_path), mode="r")
+            for location_in_file, record in self.datasets.items():
+                if location_in_file in file:
+                    record["bytes_written"] = file[location_in_file].nbytes_stored
+        else:
+            import h5py
+
+            with h5py.File(nwbfile_path, mode="r") as file:
+                for location_in_file, record in self.datasets.items():
+                    if location_in_file in file:
+                        record["bytes_written"] = file[location_in_file].id.get_storage_size()
+
+    def get_report(self, **details) -> dict:
+        duration = time.perf_counter() - self._start_time
+        bytes_read = sum(record["bytes_read"] for record in self.datasets.values())
+        bytes_written = sum(record["bytes_written"] or 0 for record in self.datasets.values())
+        read_time = sum(record["read_time"] or 0 for record in self.datasets.values())
+        if self.interleaved_writes:
+            write_time = sum(phase["duration"] for phase in self.phases if phase["phase"] == "write")
+        else:
+            write_time = sum(record["write_time"] or 0 for record in self.datasets.values())
+
+        return dict(
+            **details,
+            duration=duration,
+            phases=self.phases,
+            datasets=self.datasets,
+            total=dict(
+                interleaved_writes=self.interleaved_writes,
+                bytes_read=bytes_read,
+                bytes_written=bytes_written,
+                read_time=read_time,
+                write_time=write_time,
+                read_throughput=bytes_read / 1e6 / read_time if read_time else None,  # MB/s
+                write_throughput=bytes_written / 1e6 / write_time if write_time else None,  # MB/s
+            ),
+        )
+
+    def write_report(self, nwbfile_path: Path, **details) -> Path:
+        """Write the report next to the NWB file, and announce its totals on the progress stream."""
+        report = self.get_report(nwbfile_path=str(nwbfile_path), **details)
+
+        report_path = Path(f"{nwbfile_path}{TELEMETRY_REPORT_SUFFIX}")
+        with open(file=report_path, mode="w") as file:
+            json.dump(obj=report, fp=file, indent=4)
+
+        announce_event(
+            event=dict(
+                type="conversion_report",
+                report_path=str(report_path),
+                duration=report["duration"],
+                total=report["total"],
+            ),
+            request_id=self.request_id,
+        )
+
+        return report_path
+
+
+def time_phase(telemetry: Optional[ConversionTelemetry], name: str, **details) -> contextlib.AbstractContextManager:
+    """Time a phase if the conversion is instrumented."""
+    return contextlib.nullcontext() if telemetry is None else telemetry.phase(name, **details)
+
+
+def record_phase(telemetry: Optional[ConversionTelemetry], name: str, start_time: float, **details) -> None:
+    """Record a completed phase if the conversion is instrumented."""
+    if telemetry is not None:
+        telemetry.record_phase(name, start_time=start_time, **details)
+
+
+def _instrument_iterator(iterator: "GenericDataChunkIterator", record: dict, time_writes: bool = True) -> None:
+    """Wrap the selections and reads of an iterator, as the writer requests each buffer in turn."""
+    selections = iterator.buffer_selection_generator
+    get_data = iterator._get_data
+    record.update(read_time=0.0, write_time=0.0 if time_writes else None)
+    last_returned = None
+
+    def timed_selections():
+        nonlocal last_returned
+        for selection in selections:
+            if last_returned is not None and time_writes:
+                record["write_time"] += time.perf_counter() - last_returned
+            yield selection
+
+        if last_returned is not None and time_writes:
+            record["write_time"] += time.perf_counter() - last_returned
+        last_returned = None
+
+    def timed_get_data(selection):
+        nonlocal last_returned
+        start_time = time.perf_counter()
+        data = get_data(selection=selection)
+        last_returned = time.perf_counter()
+
+        record["read_time"] += last_returned - start_time
+        record["bytes_read"] += getattr(data, "nbytes", 0)
+        record["number_of_buffers"] += 1
+        return data
+
+    # Instance attributes take precedence over the methods of the iterator class
+    iterator.buffer_selection_generator = timed_selections()
+    iterator._get_data = timed_get_data
@@ -0,0 +1,139 @@
+"""Limits on the threads started by native libraries in each worker process, so that concurrent workers share the CPUs."""
+
+import os
+from typing import List, Optional
+
+# Environment variables read by native libraries as they start their thread pools, or (for Blosc) at every call
+THREAD_LIMIT_ENVIRONMENT_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "BLOSC_NTHREADS",
+)
+
+# Set in each worker process as it starts
+_worker_index = 0
+_available_cpus = None
+
+# Process ids of the jobs each available core is claimed by (otherwise 0), shared between the workers of a pool
+_cpu_claims = None
+
+_thread_limit = None
+
+
+def get_number_of_cpus() -> int:
+    """The number of logical cores this process may run on, as reported by `/system/cpus` unless restricted."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+
+    return os.cpu_count() or 1
+
+
+def get_threads_per_worker(number_of_workers: int) -> int:
+    """Share the logical cores evenly between concurrent workers."""
+    return max(1, get_number_of_cpus() // max(1, number_of_workers))
+
+
+def get_thread_limit() -> Optional[int]:
+    """The number of threads native libraries of this process are limited to, if any."""
+    return _thread_limit
+
+
+def initialize_worker_threads(worker_index: int, cpu_claims: Optional["multiprocessing.Array"] = None) -> None:
+    """
+    Record the index of a worker process, and the cores it may run on, before any job pins it.
+
+    Workers given the same `cpu_claims` (one entry per available core) claim their cores from it as jobs are pinned,
+    rather than by worker index.
+    """
+    global _worker_index, _available_cpus, _cpu_claims
+
+    _worker_index = worker_index
+    if hasattr(os, "sched_getaffinity"):
+        _available_cpus = sorted(os.sched_getaffinity(0))
+    _cpu_claims = cpu_claims
+
+
+def limit_native_threads(number_of_threads: int) -> None:
+    """Limit the thread pools of BLAS, OpenMP, and Blosc (both through NumCodecs and the HDF5 filters)."""
+    global _thread_limit
+
+    _thread_limit = number_of_threads
+
+    # Libraries loaded later, and the Blosc filters of HDF5, read these when they start threads
+    for name in THREAD_LIMIT_ENVIRONMENT_VARIABLES:
+        os.environ[name] = str(number_of_threads)
+
+    # Libraries already loaded (such as the BLAS of NumPy) are limited through their API
+    try:
+        from threadpoolctl import threadpool_limits
+
+        threadpool_limits(limits=number_of_threads)
+    except ImportError:
+        pass
+
+    try:
+        from numcodecs import blosc
+
+        blosc.set_nthreads(number_of_threads)
+    except ImportError:
+        pass
+
+
+def _claim_cpus(number_of_cpus: int) -> Optional[List[int]]:
+    """Claim the first block of `number_of_cpus` cores no other job is pinned to, if any."""
+    pid = os.getpid()
+    number_of_claims = min(len(_cpu_claims), len(_available_cpus))
+
+    with _cpu_claims.get_lock():
+        for start in range(0, number_of_claims - number_of_cpus + 1, number_of_cpus):
+            block = range(start, start + number_of_cpus)
+            if all(_cpu_claims[position] == 0 for position in block):
+                for position in block:
+                    _cpu_claims[position] = pid
+                return [_available_cpus[position] for position in block]
+
+    return None
+
+
+def release_cpus() -> None:
+    """Release the cores claimed by this worker, and unpin it, once its job completes."""
+    if _available_cpus is None:
+        return
+
+    if _cpu_claims is not None:
+        pid = os.getpid()
+        with _cpu_claims.get_lock():
+            for position, claim in enumerate(_cpu_claims[:]):
+                if claim == pid:
+                    _cpu_claims[position] = 0
+
+    os.sched_setaffinity(0, _available_cpus)
+
+
+def pin_to_cpus(number_of_cpus: Optional[int]) -> None:
+    """
+    Pin this worker to its own block of `number_of_cpus` cores (Linux only), or unpin it if `None`.
+
+    Workers sharing core claims are pinned to a block no running job holds, and left unpinned if every block is held.
+    Otherwise, blocks are assigned by worker index, so concurrent workers run on distinct cores as long as there are as
+    many blocks as workers.
+    """
+    if _available_cpus is None:
+        return
+
+    release_cpus()
+    if number_of_cpus is None:
+        return
+
+    if _cpu_claims is not None:
+        cpus = _claim_cpus(number_of_cpus)
+        if cpus is not None:
+            os.sched_setaffinity(0, cpus)
+        return
+
+    number_of_blocks = max(1, len(_available_cpus) // number_of_cpus)
+    block = _worker_index % number_of_blocks
+    os.sched_setaffinity(0, _available_cpus[block * number_of_cpus : (block + 1) * number_of_cpus])
@@ -0,0 +1,172 @@
+"""Long-lived pool of worker processes owned by the server, which import the conversion and inspection stack once."""
+
+import contextlib
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+from .manage_neuroconv import get_inspector_checks
+from .progress import (
+    DEFAULT_PROGRESS_UPDATE_RATE,
+    get_progress_queue,
+    initialize_progress_worker,
+    set_progress_update_rate,
+)
+from .thread_limits import (
+    get_number_of_cpus,
+    initialize_worker_threads,
+    limit_native_threads,
+    pin_to_cpus,
+    release_cpus,
+)
+
+# Maximum number of worker processes; all logical cores by default
+WORKER_POOL_SIZE = None
+
+# Number of worker processes started ahead of the first job
+DEFAULT_WARM_WORKERS = 2
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+# Process ids of the workers running a job (otherwise 0) by worker index, shared between the server and its workers
+_busy_worker_pids = None
+
+# Index of this worker process in the pool (`None` in the server)
+_worker_index = None
+
+
+def _initialize_worker(
+    progress_queue: "multiprocessing.Queue",
+    worker_counter: "multiprocessing.Value",
+    busy_worker_pids: "multiprocessing.Array",
+    cpu_claims: "multiprocessing.Array",
+) -> None:
+    """Import the libraries used by conversion and inspection jobs as the worker process starts, rather than per job."""
+    global _busy_worker_pids, _worker_index
+
+    initialize_progress_worker(progress_queue)
+
+    with worker_counter.get_lock():
+        _worker_index = worker_counter.value
+        initialize_worker_threads(worker_index=_worker_index, cpu_claims=cpu_claims)
+        worker_counter.value += 1
+    _busy_worker_pids = busy_worker_pids
+
+    try:
+        import neuroconv.datainterfaces  # noqa: F401 (also imports pynwb and the extractor libraries)
+        import nwbinspector  # noqa: F401
+
+        get_inspector_checks()  # Configure the default checks once per worker
+    except ImportError:  # Jobs report any missing dependency themselves
+        pass
+
+
+@contextlib.contextmanager
+def _mark_busy():
+    """Mark this worker as running a job while in the context, so that the server accounts for its memory."""
+    if _worker_index is None or _worker_index >= len(_busy_worker_pids):
+        yield
+        return
+
+    previous_pid = _busy_worker_pids[_worker_index]  # Wrapped jobs are marked by each of their wrappers
+    _busy_worker_pids[_worker_index] = os.getpid()
+    try:
+        yield
+    finally:
+        _busy_worker_pids[_worker_index] = previous_pid
+
+
+def _run_job(function: Callable, progress_update_rate: Optional[float], *args, **kwargs):
+    set_progress_update_rate(progress_update_rate)
+    with _mark_busy():
+        return function(*args, **kwargs)
+
+
+def _run_limited_job(function: Callable, number_of_threads: int, pin_cpus: bool, *args, **kwargs):
+    limit_native_threads(number_of_threads)
+    pin_to_cpus(number_of_threads if pin_cpus else None)
+    try:
+        with _mark_busy():
+            return function(*args, **kwargs)
+    finally:
+        release_cpus()  # Free the cores for the next job pinned by any worker
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """
+    The process pool shared by every conversion and inspection request, created on first use.
+
+    Worker processes are started as jobs are submitted, up to `WORKER_POOL_SIZE`, and kept for the lifetime of the
+    server. The pool is replaced if a worker process terminated abruptly.
+    """
+    global _busy_worker_pids, _worker_pool
+
+    with _worker_pool_lock:
+        if _worker_pool is None or getattr(_worker_pool, "_broken", False):
+            max_workers = WORKER_POOL_SIZE or os.cpu_count() or 1
+            _busy_worker_pids = multiprocessing.Array("i", max_workers)
+            _worker_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_initialize_worker,
+                initargs=(
+                    get_progress_queue(),
+                    multiprocessing.Value("i", 0),
+                    _busy_worker_pids,
+                    multiprocessing.Array("i", get_number_of_cpus()),
+                ),
+            )
+
+    return _worker_pool
+
+
+def get_busy_worker_pids() -> List[int]:
+    """Process ids of the workers currently running a job, as opposed to those idle in the pool."""
+    if _busy_worker_pids is None:
+        return []
+
+    return [pid for pid in _busy_worker_pids[:] if pid != 0]
+
+
+def get_worker_pool_size() -> int:
+    return get_worker_pool()._max_workers
+
+
+def with_progress_update_rate(
+    function: Callable, progress_update_rate: Optional[float] = DEFAULT_PROGRESS_UPDATE_RATE
+) -> Callable:
+    """Wrap a job so that its progress bars report at the given rate in whichever worker runs it."""
+    return functools.partial(_run_job, function, progress_update_rate)
+
+
+def with_thread_limit(function: Callable, number_of_threads: int, pin_cpus: bool = False) -> Callable:
+    """
+    Wrap a job so that the native libraries of whichever worker runs it start at most `number_of_threads` threads.
+
+    If `pin_cpus` is set, the worker is also pinned to a block of that many cores no other running job is pinned to
+    (on Linux), which it releases once the job completes.
+    """
+    return functools.partial(_run_limited_job, function, number_of_threads, pin_cpus)
+
+
+def warm_worker_pool(number_of_workers: int = DEFAULT_WARM_WORKERS) -> None:
+    """Start worker processes ahead of the first job, without waiting for them to be ready."""
+    worker_pool = get_worker_pool()
+    for _ in range(min(number_of_workers, get_worker_pool_size())):
+        worker_pool.submit(_warm_up)
+
+
+def shutdown_worker_pool() -> None:
+    global _worker_pool
+
+    with _worker_pool_lock:
+        if _worker_pool is not None:
+            _worker_pool.shutdown(wait=False, cancel_futures=True)
+            _worker_pool = None
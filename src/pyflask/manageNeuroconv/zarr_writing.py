@@ -0,0 +1,128 @@
+"""Parallel writes for the Zarr backend, compressing and storing the chunks of all datasets on a thread pool."""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
+
+from hdmf.data_utils import DataChunk, GenericDataChunkIterator
+from hdmf_zarr.nwb import NWBZarrIO
+from hdmf_zarr.utils import ZarrIODataChunkIteratorQueue
+
+from .thread_limits import get_thread_limit
+
+# Number of buffers waiting to be compressed and stored per thread, which bounds the memory used
+PENDING_BUFFERS_PER_THREAD = 2
+
+# Private attribute of `ZarrIO` holding the queue of chunk iterators written at the end of each write
+QUEUE_ATTRIBUTE_NAME = "_ZarrIO__dci_queue"
+
+
+def _is_chunk_aligned(dataset: "zarr.Array", iterator: GenericDataChunkIterator) -> bool:
+    """Whether each chunk of the dataset is covered by exactly one buffer, so that no two threads store the same chunk."""
+    if dataset.chunks is None or len(dataset.chunks) != len(iterator.buffer_shape):
+        return False
+
+    return all(
+        buffer_axis % chunk_axis == 0 or buffer_axis == full_axis
+        for buffer_axis, chunk_axis, full_axis in zip(iterator.buffer_shape, dataset.chunks, dataset.shape)
+    )
+
+
+def _interleave_buffers(queue: list) -> Iterator[tuple]:
+    """Read the buffers of every dataset in turn, so that all datasets are being written at the same time."""
+    active = [(dataset, iter(iterator)) for dataset, iterator in queue]
+
+    while active:
+        remaining = []
+        for dataset, buffers in active:
+            buffer = next(buffers, None)
+            if buffer is not None:
+                remaining.append((dataset, buffers))
+                yield dataset, buffer
+        active = remaining
+
+
+def _store_buffer(dataset: "zarr.Array", buffer: DataChunk) -> None:
+    dataset[buffer.selection] = buffer.data  # Compression and the writes of each chunk file release the GIL
+
+
+class ThreadedDataChunkIteratorQueue(ZarrIODataChunkIteratorQueue):
+    """
+    Write the queued data chunk iterators concurrently, reading their buffers in turn on the calling thread.
+
+    Buffers of `GenericDataChunkIterator`s that align with the chunks of their dataset are compressed and stored on a
+    thread pool; the remaining iterators are written sequentially, as they may need to resize their dataset.
+    """
+
+    def __init__(self, number_of_threads: Optional[int] = None):
+        super().__init__()
+        self.number_of_threads = number_of_threads or get_thread_limit() or os.cpu_count() or 1
+
+    def exhaust_queue(self):
+        parallelizable, sequential = [], []
+        for dataset, iterator in self:
+            if isinstance(iterator, GenericDataChunkIterator) and _is_chunk_aligned(dataset, iterator):
+                parallelizable.append((dataset, iterator))
+            else:
+                sequential.append((dataset, iterator))
+
+        self.clear()
+        self.extend(sequential)
+        super().exhaust_queue()
+
+        if not parallelizable:
+            return
+
+        maximum_pending = self.number_of_threads * PENDING_BUFFERS_PER_THREAD
+        with ThreadPoolExecutor(max_workers=self.number_of_threads) as executor:
+            pending = set()
+            for dataset, buffer in _interleave_buffers(parallelizable):
+                if len(pending) >= maximum_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()  # Raise any error as soon as possible
+
+                pending.add(executor.submit(_store_buffer, dataset=dataset, buffer=buffer))
+
+            for future in pending:
+                future.result()
+
+
+class ParallelNWBZarrIO(NWBZarrIO):
+    """
+    An `NWBZarrIO` that writes all datasets at once, compressing and storing their chunks on a thread pool.
+
+    Metadata is consolidated once every dataset has been written.
+    """
+
+    def __init__(self, *args, number_of_threads: Optional[int] = None, **kwargs):
+        self.number_of_threads = number_of_threads
+        super().__init__(*args, **kwargs)
+
+    def write(self, *args, **kwargs):
+        kwargs.setdefault("exhaust_dci", False)  # Queue the iterators of every dataset until the end of the write
+        kwargs.setdefault("consolidate_metadata", True)
+        super().write(*args, **kwargs)
+
+    def write_builder(self, *args, **kwargs):
+        # The queue of ZarrIO is private and recreated at each write, with no public hook to replace it
+        # This relies on the name-mangled attribute of the pinned hdmf_zarr version, as checked by `test_zarr_writing.py`
+        if not hasattr(self, QUEUE_ATTRIBUTE_NAME):
+            raise RuntimeError(
+                f"This version of hdmf_zarr no longer holds its chunk iterator queue as '{QUEUE_ATTRIBUTE_NAME}'."
+            )
+
+        setattr(self, QUEUE_ATTRIBUTE_NAME, ThreadedDataChunkIteratorQueue(number_of_threads=self.number_of_threads))
+        super().write_builder(*args, **kwargs)
+
+
+def write_zarr_nwbfile(
+    nwbfile: "NWBFile", nwbfile_path: str, backend_configuration: "ZarrBackendConfiguration", **io_kwargs
+) -> None:
+    """Configure the datasets of an in-memory NWBFile and write it to Zarr in parallel."""
+    from neuroconv.tools.nwb_helpers import configure_backend
+
+    configure_backend(nwbfile=nwbfile, backend_configuration=backend_configuration)
+
+    with ParallelNWBZarrIO(str(nwbfile_path), mode="w", **io_kwargs) as io:
+        io.write(nwbfile)
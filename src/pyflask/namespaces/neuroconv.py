@@ -3,6 +3,7 @@
 from flask import Response, request
 from flask_restx import Namespace, Resource, reqparse
 from manageNeuroconv import (
+    apply_configuration_template,
     autocomplete_format_string,
     convert_all_to_nwb,
     get_all_converter_info,
@@ -10,11 +11,18 @@ from manageNeuroconv import (
     get_backend_configuration,
     get_interface_alignment,
     get_metadata_schema,
+    get_project_index,
+    get_project_predictions,
     get_source_schema,
+    get_timeline_overview,
     inspect_all,
     listen_to_neuroconv_progress_events,
     locate_data,
+    plan_conversions,
     progress_handler,
+    stream_interface_timestamps,
+    tune_backend_configuration,
+    update_project_store,
     upload_folder_to_dandi,
     upload_multiple_filesystem_objects_to_dandi,
     upload_project_to_dandi,
@@ -76,15 +84,46 @@ class Convert(Resource):
     def post(self):
 
         log_url = f"{request.url_root}log"
-        url = f"{request.url_root}neuroconv/announce/progress"
 
         return convert_all_to_nwb(
-            url,
             **neuroconv_namespace.payload,
             log_url=log_url,
         )
 
 
+@neuroconv_namespace.route("/convert/plan")
+class PlanConversions(Resource):
+    @neuroconv_namespace.doc(
+        description=(
+            "Check that the sources of every session are readable and that each output volume has enough free space, "
+            "and estimate the data read and written and the duration of the conversion, before running it."
+        ),
+        responses={200: "Success", 400: "Bad Request", 500: "Internal server error"},
+    )
+    def post(self):
+        return plan_conversions(neuroconv_namespace.payload)
+
+
+@neuroconv_namespace.route("/store/<string:project_name>")
+class ProjectStore(Resource):
+    @neuroconv_namespace.doc(
+        description="The hash of the stored conversion payload of each session of a project, by session id.",
+        responses={200: "Success", 400: "Bad Request", 500: "Internal server error"},
+    )
+    def get(self, project_name):
+        return get_project_index(project_name)
+
+    @neuroconv_namespace.doc(
+        description=(
+            "Store the conversion payloads of some sessions of a project (`sessions`, by session id) and remove others "
+            "(`remove`), so that conversion and inspection requests can reference them by id."
+        ),
+        responses={200: "Success", 400: "Bad Request", 500: "Internal server error"},
+    )
+    def post(self, project_name):
+        return update_project_store(project_name, **neuroconv_namespace.payload)
+
+
 @neuroconv_namespace.route("/alignment")
 class Alignment(Resource):
     @neuroconv_namespace.doc(responses={200: "Success", 400: "Bad Request", 500: "Internal server error"})
@@ -92,6 +131,31 @@ class Alignment(Resource):
         return get_interface_alignment(neuroconv_namespace.payload)
 
 
+@neuroconv_namespace.route("/alignment/overview")
+class AlignmentOverview(Resource):
+    @neuroconv_namespace.doc(
+        description=(
+            "Request a fixed-size min/max envelope and the longest gaps of the aligned timeline of every interface."
+        ),
+        responses={200: "Success", 400: "Bad Request", 500: "Internal server error"},
+    )
+    def post(self):
+        return get_timeline_overview(neuroconv_namespace.payload)
+
+
+@neuroconv_namespace.route("/alignment/timestamps")
+class AlignmentTimestamps(Resource):
+    @neuroconv_namespace.doc(
+        description=(
+            "Stream the (optionally ranged and decimated) timestamps of a single interface "
+            "as little-endian float64 binary data."
+        ),
+        responses={200: "Success", 400: "Bad Request", 500: "Internal server error"},
+    )
+    def post(self):
+        return Response(stream_interface_timestamps(neuroconv_namespace.payload), mimetype="application/octet-stream")
+
+
 @neuroconv_namespace.route("/configuration")
 class GetBackendConfiguration(Resource):
     @neuroconv_namespace.doc(responses={200: "Success", 400: "Bad Request", 500: "Internal server error"})
@@ -99,6 +163,45 @@ class GetBackendConfiguration(Resource):
         return get_backend_configuration(neuroconv_namespace.payload)
 
 
+@neuroconv_namespace.route("/configuration/template")
+class ApplyConfigurationTemplate(Resource):
+    @neuroconv_namespace.doc(
+        description=(
+            "Resolve the backend configuration of many sessions in parallel from the configuration of one of them, "
+            "adapting chunk shapes to the shape of each dataset. Sessions that could not be mapped are reported."
+        ),
+        responses={200: "Success", 400: "Bad Request", 500: "Internal server error"},
+    )
+    def post(self):
+        return apply_configuration_template(neuroconv_namespace.payload)
+
+
+@neuroconv_namespace.route("/configuration/predictions")
+class GetProjectPredictions(Resource):
+    @neuroconv_namespace.doc(
+        description=(
+            "Predict the output size and write time of every session in a project, "
+            "and compare the total output size against the free disk space."
+        ),
+        responses={200: "Success", 400: "Bad Request", 500: "Internal server error"},
+    )
+    def post(self):
+        return get_project_predictions(neuroconv_namespace.payload)
+
+
+@neuroconv_namespace.route("/configuration/tune")
+class TuneBackendConfiguration(Resource):
+    @neuroconv_namespace.doc(
+        description=(
+            "Benchmark chunk shapes and codecs on samples of the source data of each dataset "
+            "and return ranked recommendations for the backend configuration."
+        ),
+        responses={200: "Success", 400: "Bad Request", 500: "Internal server error"},
+    )
+    def post(self):
+        return tune_backend_configuration(neuroconv_namespace.payload)
+
+
 validate_parser = neuroconv_namespace.parser()
 validate_parser.add_argument("parent", type=dict, required=True)
 validate_parser.add_argument("function_name", type=str, required=True)
@@ -175,8 +278,7 @@ class InspectNWBFolder(Resource):
 class InspectNWBFolder(Resource):
     @neuroconv_namespace.doc(responses={200: "Success", 400: "Bad Request", 500: "Internal server error"})
     def post(self):
-        url = f"{request.url_root}neuroconv/announce/progress"
-        return inspect_all(url, neuroconv_namespace.payload)
+        return inspect_all(neuroconv_namespace.payload)
 
 
 @neuroconv_namespace.route("/html")
@@ -30,10 +30,15 @@ class PreloadImports(Resource):
     Python caches all modules that have been imported at least once in the same kernel,
     even if their namespace is not always exposed to a given scope. This means that later imports
     simply expose the cached namespaces to their scope instead of retriggering the entire import.
+
+    The worker processes that run conversions and inspections are also started, and import the same modules.
     """
 
     @startup_namespace.doc(responses={200: "Success", 400: "Bad Request", 500: "Internal server error"})
     def get(self):
         import neuroconv
+        from manageNeuroconv import warm_worker_pool
+
+        warm_worker_pool()
 
         return True
@@ -27,6 +27,20 @@ def runner(app):
     return app.test_cli_runner()
 
 
+@pytest.fixture()
+def worker_pool():
+    """
+    A fresh shared worker pool, shut down after the test so that later tests do not inherit the state of its workers.
+
+    Its workers are forked once the test has started, so they see any of its monkeypatches.
+    """
+    from manageNeuroconv.worker_pool import get_worker_pool, shutdown_worker_pool
+
+    shutdown_worker_pool()
+    yield get_worker_pool()
+    shutdown_worker_pool()
+
+
 # @pytest.fixture()
 # def all_interfaces(client):
 #     response = client.get("/neuroconv", follow_redirects=True)
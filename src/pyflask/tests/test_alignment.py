@@ -0,0 +1,182 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from utils import post, post_binary
+
+
+@pytest.fixture(scope="module")
+def session_info(client, tmp_path_factory) -> dict:
+    data_path = tmp_path_factory.mktemp("alignment_data")
+    post(path="/data/generate", json=dict(output_path=str(data_path)), client=client)
+
+    ap_file_path = Path(data_path) / "spikeglx" / "Session1_g0" / "Session1_g0_imec0" / "Session1_g0_t0.imec0.ap.bin"
+    phy_folder_path = Path(data_path) / "phy"
+    return dict(
+        interfaces=dict(ap="SpikeGLXRecordingInterface", phy="PhySortingInterface"),
+        source_data=dict(ap=dict(file_path=str(ap_file_path)), phy=dict(folder_path=str(phy_folder_path))),
+        alignment=dict(),
+    )
+
+
+def test_alignment_returns_timestamp_summaries(client, session_info):
+    result = post(path="/neuroconv/alignment", json=session_info, client=client)
+
+    summary = result["timestamps"]["ap"]
+    assert summary["count"] == 90_000
+    assert summary["start"] == pytest.approx(0.0)
+    assert summary["stop"] == pytest.approx((90_000 - 1) / 30_000.0)
+    assert summary["rate"] == pytest.approx(30_000.0)
+    assert summary["max_deviation"] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_alignment_reports_compatible_recordings(client, session_info):
+    for _ in range(2):  # The second request is served from the compatibility cache
+        result = post(path="/neuroconv/alignment", json=session_info, client=client)
+
+        assert result["metadata"]["phy"] == dict(sorting=True, compatible=["ap"])
+        assert result["metadata"]["ap"] == dict(sorting=False)
+        assert result["timestamps"]["phy"] is None  # No recording is registered until linked
+
+
+def test_alignment_timestamps_are_streamed_as_binary(client, session_info, monkeypatch):
+    from manageNeuroconv import manage_neuroconv
+
+    # Stream the timestamps in several chunks, the last of which is partial
+    monkeypatch.setattr(manage_neuroconv, "TIMESTAMPS_STREAM_CHUNK_SIZE", 4)
+    content = post_binary(
+        path="/neuroconv/alignment/timestamps",
+        json=dict(**session_info, interface="ap", start=10, stop=1_010, step=100),
+        client=client,
+    )
+
+    timestamps = np.frombuffer(content, dtype="<f8")
+    np.testing.assert_allclose(timestamps, np.arange(10, 1_010, 100) / 30_000.0)
+
+
+@pytest.mark.parametrize("suffix", [".txt", ".csv", ".tsv", ".npy", ".bin"])
+def test_load_timestamps_file(tmp_path: Path, suffix: str):
+    from manageNeuroconv.manage_neuroconv import load_timestamps_file
+
+    expected_timestamps = np.linspace(start=1.5, stop=11.5, num=1_001)
+
+    file_path = tmp_path / f"timestamps{suffix}"
+    if suffix == ".npy":
+        np.save(file=file_path, arr=expected_timestamps)
+    elif suffix == ".bin":
+        expected_timestamps.astype("<f8").tofile(file_path)
+    else:
+        file_path.write_text("\n".join(repr(timestamp) for timestamp in expected_timestamps))
+
+    np.testing.assert_allclose(load_timestamps_file(file_path=file_path), expected_timestamps, rtol=1e-15)
+
+
+def test_timestamps_cache_is_bounded(tmp_path: Path, monkeypatch):
+    from manageNeuroconv import manage_neuroconv
+    from manageNeuroconv.caches import LRUCache
+    from manageNeuroconv.manage_neuroconv import load_timestamps_file
+
+    monkeypatch.setattr(
+        manage_neuroconv, "TIMESTAMPS_CACHE", LRUCache(max_size=1_500 * 8, get_size=lambda value: value.nbytes)
+    )
+
+    file_paths = [tmp_path / f"timestamps_{index}.txt" for index in range(2)]
+    for file_path in file_paths:
+        file_path.write_text("\n".join(str(timestamp) for timestamp in range(1_000)))
+
+    # Repeated requests are served from the cache, until other files evict it
+    assert load_timestamps_file(file_path=file_paths[0]) is load_timestamps_file(file_path=file_paths[0])
+    load_timestamps_file(file_path=file_paths[1])
+    assert len(manage_neuroconv.TIMESTAMPS_CACHE) == 1
+    assert manage_neuroconv.TIMESTAMPS_CACHE.total_size == 1_000 * 8
+
+    # Files changed in place are parsed again
+    file_paths[1].write_text("\n".join(str(timestamp) for timestamp in range(10)))
+    assert load_timestamps_file(file_path=file_paths[1]).shape == (10,)
+
+
+@pytest.mark.parametrize("jitter,representation", [(0.0, "rate"), (1e-5, "timestamps")])
+def test_alignment_detects_regular_timestamps(client, session_info, tmp_path: Path, jitter: float, representation):
+    rng = np.random.default_rng(seed=0)
+    aligned_timestamps = 2.0 + np.arange(90_000) / 30_000.0 + rng.uniform(low=-jitter, high=jitter, size=90_000)
+
+    timestamps_file_path = tmp_path / "aligned_timestamps.npy"
+    np.save(file=timestamps_file_path, arr=aligned_timestamps)
+
+    alignment = dict(ap=dict(selected="timestamps", values=dict(timestamps=str(timestamps_file_path))))
+    result = post(path="/neuroconv/alignment", json=dict(session_info, alignment=alignment), client=client)
+
+    assert result["errors"] == dict()
+    assert result["timing"]["ap"]["representation"] == representation
+    if representation == "rate":
+        assert result["timing"]["ap"]["rate"] == 30_000.0  # The rate written, rather than the one detected
+    assert result["timestamps"]["ap"]["start"] == pytest.approx(aligned_timestamps[0])
+
+
+def test_regular_timing_is_written_at_the_native_rate():
+    from manageNeuroconv.manage_neuroconv import set_regular_timing
+    from neuroconv.tools.nwb_helpers import make_nwbfile_from_metadata
+    from neuroconv.tools.testing.mock_interfaces import MockRecordingInterface
+
+    interface = MockRecordingInterface(sampling_frequency=30_000.0, durations=[0.1, 0.2])
+
+    # Each segment drifts from the native rate, though by less than the tolerance over its duration
+    segment_timestamps = [
+        2.0 + np.arange(3_000) / (30_000.0 * (1 + 1e-7)),
+        5.0 + np.arange(6_000) / (30_000.0 * (1 + 1e-7)),
+    ]
+    regular_timing = set_regular_timing(interface=interface, aligned_timestamps=np.concatenate(segment_timestamps))
+
+    assert regular_timing["rate"] == 30_000.0
+    assert regular_timing["segment_starting_times"] == pytest.approx([2.0, 5.0])
+
+    # Timestamps that are irregular within a segment leave the interface as it was
+    irregular_timestamps = np.concatenate(segment_timestamps)
+    irregular_timestamps[4_000:] += 1.0
+    assert set_regular_timing(interface=interface, aligned_timestamps=irregular_timestamps) is None
+
+    metadata = interface.get_metadata()
+    metadata["NWBFile"]["session_start_time"] = "2024-01-01T00:00:00+00:00"
+    nwbfile = make_nwbfile_from_metadata(metadata=metadata)
+    interface.add_to_nwbfile(nwbfile=nwbfile, metadata=metadata)  # One series per segment
+    for segment_index, starting_time in enumerate([2.0, 5.0]):
+        electrical_series = nwbfile.acquisition[f"ElectricalSeries{segment_index}"]
+        assert electrical_series.timestamps is None
+        assert electrical_series.rate == 30_000.0
+        assert electrical_series.starting_time == pytest.approx(starting_time)
+
+
+def test_alignment_overview(client, session_info, tmp_path: Path):
+    aligned_timestamps = np.arange(90_000) / 30_000.0
+    aligned_timestamps[45_000:] += 1.0  # Introduce a one second gap halfway through
+
+    timestamps_file_path = tmp_path / "gapped_timestamps.npy"
+    np.save(file=timestamps_file_path, arr=aligned_timestamps)
+
+    alignment = dict(ap=dict(selected="timestamps", values=dict(timestamps=str(timestamps_file_path))))
+    result = post(
+        path="/neuroconv/alignment/overview",
+        json=dict(session_info, alignment=alignment, number_of_bins=64),
+        client=client,
+    )
+
+    timeline = result["timelines"]["ap"]
+    assert len(timeline["envelope"]["min"]) == len(timeline["envelope"]["max"]) == 64
+    assert timeline["envelope"]["min"][0] == pytest.approx(0.0)
+    assert timeline["envelope"]["max"][-1] == pytest.approx(aligned_timestamps[-1])
+    assert timeline["gaps"] == [pytest.approx([aligned_timestamps[44_999], aligned_timestamps[45_000]])]
+    assert result["timelines"]["phy"] is None
+
+
+def test_compatibility_checks_leave_sortings_unregistered(session_info):
+    from manageNeuroconv.manage_neuroconv import (
+        get_compatible_interfaces,
+        instantiate_custom_converter,
+    )
+
+    converter = instantiate_custom_converter(
+        source_data=session_info["source_data"], interface_class_dict=session_info["interfaces"]
+    )
+
+    assert get_compatible_interfaces(converter) == dict(phy=["ap"])
+    assert not converter.data_interface_objects["phy"].sorting_extractor.has_recording()
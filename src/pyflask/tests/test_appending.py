@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+
+import pytest
+
+
+def test_append_interfaces(tmp_path):
+    from manageNeuroconv.appending import append_to_nwbfile, check_append
+    from neuroconv import ConverterPipe
+    from neuroconv.tools.testing.mock_interfaces import (
+        MockBehaviorEventInterface,
+        MockRecordingInterface,
+    )
+    from pynwb import NWBHDF5IO
+
+    nwbfile_path = tmp_path / "sub-mouse_ses-1.nwb"
+
+    converter = ConverterPipe(data_interfaces=dict(recording=MockRecordingInterface(durations=[0.1])))
+    metadata = converter.get_metadata()
+    metadata["NWBFile"]["session_start_time"] = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    converter.run_conversion(nwbfile_path=nwbfile_path, metadata=metadata, overwrite=True)
+
+    # Only the added interface is converted, leaving the existing objects in place
+    events_converter = ConverterPipe(data_interfaces=dict(events=MockBehaviorEventInterface()))
+    assert check_append(events_converter, metadata=metadata, nwbfile_path=nwbfile_path, backend="hdf5") == []
+    append_to_nwbfile(events_converter, metadata=metadata, nwbfile_path=nwbfile_path)
+
+    with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+        assert set(io.read().acquisition) == {"ElectricalSeries", "BehaviorEvents"}
+
+    # Objects cannot be appended twice, nor can the metadata of the file change
+    changed_metadata = dict(metadata, NWBFile=dict(metadata["NWBFile"], session_description="Another session"))
+    conflicts = check_append(events_converter, metadata=changed_metadata, nwbfile_path=nwbfile_path, backend="hdf5")
+    assert {conflict["location"] for conflict in conflicts} == {
+        "acquisition/BehaviorEvents",
+        "NWBFile/session_description",
+    }
+    with pytest.raises(ValueError):
+        append_to_nwbfile(events_converter, metadata=metadata, nwbfile_path=nwbfile_path)
+
+    assert check_append(events_converter, metadata=metadata, nwbfile_path=nwbfile_path, backend="zarr")[0]["type"] == (
+        "backend"
+    )
+
+
+def test_create_file_appends_interfaces(tmp_path, monkeypatch, worker_pool):
+    import h5py
+    from manageNeuroconv import conversion_planning, conversion_predictions
+    from manageNeuroconv.manage_neuroconv import create_file, get_conversion_info
+    from neuroconv import ConverterPipe, datainterfaces
+    from neuroconv.tools.testing.mock_interfaces import (
+        MockBehaviorEventInterface,
+        MockRecordingInterface,
+    )
+    from pynwb import NWBHDF5IO
+
+    # Refer to the mock interfaces by name, as the GUIDE does
+    monkeypatch.setattr(datainterfaces, "MockRecordingInterface", MockRecordingInterface, raising=False)
+    monkeypatch.setattr(datainterfaces, "MockBehaviorEventInterface", MockBehaviorEventInterface, raising=False)
+    monkeypatch.setattr(conversion_predictions, "CONVERSION_THROUGHPUT_LOG_PATH", tmp_path / "throughput.jsonl")
+
+    converter = ConverterPipe(data_interfaces=dict(recording=MockRecordingInterface(durations=[0.1])))
+    metadata = converter.get_metadata().to_dict()  # As sent by the frontend
+    metadata["NWBFile"]["session_start_time"] = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    metadata["Subject"] = dict(subject_id="mouse", species="Mus musculus", sex="U", age="P30D")
+    nwbfile_path = tmp_path / "append" / "sub-mouse_ses-1.nwb"
+    nwbfile_path.parent.mkdir()
+    converter.run_conversion(nwbfile_path=nwbfile_path, metadata=metadata, overwrite=True)
+
+    metadata["NWBFile"]["session_start_time"] = "2024-01-01T00:00:00"
+    info = dict(
+        project_name="append",
+        nwbfile_path=nwbfile_path.name,
+        output_folder=str(tmp_path),
+        interfaces=dict(recording="MockRecordingInterface", events="MockBehaviorEventInterface"),
+        source_data=dict(recording=dict(durations=[0.1]), events=dict()),
+        metadata=metadata,
+        timezone="UTC",
+        append_interfaces=["events"],
+        configuration=dict(
+            backend="hdf5",
+            results=dict(hdf5={"acquisition/BehaviorEvents/event_time/data": dict(compression_method="lzf")}),
+        ),
+    )
+
+    # Only the appended interfaces are instantiated
+    appended_converter, __, __ = get_conversion_info(info)
+    assert list(appended_converter.data_interface_objects) == ["events"]
+
+    plan = conversion_planning.plan_conversions(dict(files=[info], estimate_compression=False))
+    assert plan["ready"] is True, plan["issues"]
+
+    create_file(info)
+
+    # The configuration chosen for the added dataset applies to the loaded file
+    with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+        assert set(io.read().acquisition) == {"ElectricalSeries", "BehaviorEvents"}
+    with h5py.File(nwbfile_path, mode="r") as file:
+        assert file["acquisition/BehaviorEvents/event_time"].compression == "lzf"
@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+
+
+def test_candidate_chunk_shapes():
+    from manageNeuroconv.backend_tuning import _get_candidate_chunk_shapes
+
+    candidates = _get_candidate_chunk_shapes(chunk_shape=(1_000, 4), full_shape=(1_500, 16))
+
+    # The configured shape comes first, and the first axis is never scaled past the full shape
+    assert candidates[0] == (1_000, 4)
+    assert all(1 <= chunk_shape[0] <= 1_500 for chunk_shape in candidates)
+    assert (250, 4) in candidates and (1_500, 4) in candidates
+    assert len(candidates) == len(set(candidates))
+
+    # Spanning every channel keeps roughly as many elements per chunk
+    assert (250, 16) in candidates
+
+
+def test_fit_buffer_shape():
+    from manageNeuroconv.backend_tuning import fit_buffer_shape
+
+    full_shape = (10_000, 16)
+    buffer_shape = (5_000, 16)
+    for chunk_shape in [(300, 4), (700, 16), (5_000, 16), (20_000, 16)]:
+        fitted_buffer_shape = fit_buffer_shape(chunk_shape, buffer_shape, full_shape)
+
+        # Clamped to the full shape, and a multiple of the chunk shape along every axis it does not fully span
+        assert all(axis <= full_axis for axis, full_axis in zip(fitted_buffer_shape, full_shape))
+        for chunk_axis, axis, full_axis in zip(chunk_shape, fitted_buffer_shape, full_shape):
+            assert axis == full_axis or axis % chunk_axis == 0
+
+        # The buffer never holds more than before, unless a single chunk is larger
+        assert math.prod(fitted_buffer_shape) <= max(
+            math.prod(buffer_shape), math.prod(min(a, b) for a, b in zip(chunk_shape, full_shape))
+        )
+
+
+def test_tune_dataset_configuration():
+    from manageNeuroconv.backend_tuning import tune_dataset_configuration
+    from neuroconv.tools.nwb_helpers import (
+        get_default_backend_configuration,
+        make_nwbfile_from_metadata,
+    )
+    from neuroconv.tools.testing.mock_interfaces import MockRecordingInterface
+
+    interface = MockRecordingInterface(durations=[1.0])
+    metadata = interface.get_metadata()
+    nwbfile = make_nwbfile_from_metadata(metadata=metadata)
+    interface.add_to_nwbfile(nwbfile=nwbfile, metadata=metadata)
+
+    backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend="hdf5")
+    dataset_configuration = backend_configuration.dataset_configurations["acquisition/ElectricalSeries/data"]
+
+    # Smooth signals compress well, so that codecs are ranked above storing the data uncompressed
+    sample = np.repeat(np.arange(30_000, dtype=dataset_configuration.dtype)[:, None] // 100, repeats=4, axis=1)
+    recommendations = tune_dataset_configuration(
+        sample=sample, dataset_configuration=dataset_configuration, backend="hdf5", number_of_recommendations=3
+    )
+
+    assert len(recommendations) == 3
+    scores = [recommendation["score"] for recommendation in recommendations]
+    assert scores == sorted(scores, reverse=True)
+    assert recommendations[0]["configuration"]["compression_method"] is not None
+    assert recommendations[0]["metrics"]["compression_ratio"] > 1
+
+    full_shape = tuple(dataset_configuration.full_shape)
+    for recommendation in recommendations:
+        configuration = recommendation["configuration"]
+        assert set(recommendation["metrics"]) == {"write_throughput", "compression_ratio", "read_latency"}
+        for chunk_axis, buffer_axis, full_axis in zip(
+            configuration["chunk_shape"], configuration["buffer_shape"], full_shape
+        ):
+            assert buffer_axis <= full_axis
+            assert buffer_axis == full_axis or buffer_axis % chunk_axis == 0
@@ -0,0 +1,18 @@
+def test_lru_cache_evicts_least_recently_used():
+    from manageNeuroconv.caches import LRUCache
+
+    cache = LRUCache(max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # Now more recently used than "b"
+
+    cache["c"] = 3
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert len(cache) == 2 and cache["a"] == 1 and cache["c"] == 3
+
+    # Entries larger than the whole cache are not stored
+    sized_cache = LRUCache(max_size=10, get_size=len)
+    sized_cache["small"] = "12345"
+    sized_cache["large"] = "12345678901"
+    assert "large" not in sized_cache and "small" in sized_cache
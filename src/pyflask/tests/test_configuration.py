@@ -0,0 +1,130 @@
+import pytest
+
+
+def test_conversion_throughput_calibration(tmp_path, monkeypatch):
+    from manageNeuroconv import conversion_predictions
+
+    monkeypatch.setattr(conversion_predictions, "CONVERSION_THROUGHPUT_LOG_PATH", tmp_path / "throughput.jsonl")
+    assert conversion_predictions.get_calibrated_throughput(backend="hdf5") is None
+
+    conversion_predictions.record_conversion_throughput(backend="hdf5", uncompressed_bytes=100e6, duration=10.0)
+    conversion_predictions.record_conversion_throughput(backend="hdf5", uncompressed_bytes=300e6, duration=10.0)
+    conversion_predictions.record_conversion_throughput(backend="zarr", uncompressed_bytes=100e6, duration=1.0)
+    conversion_predictions.record_conversion_throughput(backend="hdf5", uncompressed_bytes=1e3, duration=1.0)  # Ignored
+
+    calibration = conversion_predictions.get_calibrated_throughput(backend="hdf5")
+    assert calibration["number_of_conversions"] == 2
+    assert calibration["throughput"] == pytest.approx(20.0)
+
+
+@pytest.mark.parametrize(
+    "template_shape, template_full_shape, full_shape, expected_shape",
+    [
+        ([5_000, 384], [90_000, 384], [120_000, 384], [5_000, 384]),  # Same channels, longer recording
+        ([5_000, 64], [90_000, 384], [120_000, 32], [5_000, 32]),  # Fewer channels than the chunk
+        ([5_000, 64], [90_000, 64], [120_000, 128], [2_500, 128]),  # Spanned channels keep the chunk size
+        ([90_000, 8], [90_000, 384], [60_000, 384], [60_000, 8]),  # Shorter recording
+    ],
+)
+def test_adapt_shape(template_shape, template_full_shape, full_shape, expected_shape):
+    from manageNeuroconv.configuration_templates import adapt_shape
+
+    assert adapt_shape(template_shape, template_full_shape, full_shape) == expected_shape
+
+
+def test_adapt_shape_with_different_dimensions():
+    from manageNeuroconv.configuration_templates import adapt_shape
+
+    with pytest.raises(ValueError):
+        adapt_shape([10, 10], [10, 10], [10])
+
+
+def test_apply_configuration_template(monkeypatch):
+    import copy
+
+    from manageNeuroconv.configuration_templates import apply_configuration_template
+    from neuroconv import datainterfaces
+    from neuroconv.tools.testing.mock_interfaces import MockRecordingInterface
+
+    monkeypatch.setattr(datainterfaces, "MockRecordingInterface", MockRecordingInterface, raising=False)
+
+    metadata = MockRecordingInterface().get_metadata().to_dict()
+    metadata["NWBFile"]["session_start_time"] = "2024-01-01T00:00:00"
+    metadata["Subject"] = dict(subject_id="mouse", species="Mus musculus", sex="U", age="P30D")
+
+    def get_info(session: str, duration: float) -> dict:
+        return dict(
+            project_name="template",
+            nwbfile_path=f"sub-mouse_ses-{session}.nwb",
+            interfaces=dict(recording="MockRecordingInterface"),
+            source_data=dict(recording=dict(durations=[duration])),
+            metadata=copy.deepcopy(metadata),
+            timezone="UTC",
+        )
+
+    # The template chunks a one second recording
+    location_in_file = "acquisition/ElectricalSeries/data"
+    template = dict(
+        backend="hdf5",
+        results={
+            location_in_file: dict(
+                chunk_shape=[10_000, 4], full_shape=[30_000, 4], compression_method="lzf", compression_options=None
+            )
+        },
+    )
+    files = [get_info("longer", duration=2.0), get_info("shorter", duration=0.25)]
+    resolved = apply_configuration_template(dict(template=template, files=files))
+
+    assert resolved["failed"] == dict()
+    longer, shorter = (
+        resolved["configurations"][session["nwbfile_path"]]["results"][location_in_file] for session in files
+    )
+    assert longer["chunk_shape"] == [10_000, 4]
+    assert shorter["chunk_shape"] == shorter["buffer_shape"] == [7_500, 4]  # Clipped to the shorter recording
+    assert longer["compression_method"] == shorter["compression_method"] == "lzf"
+
+
+def test_plan_reports_blocking_issues(tmp_path, monkeypatch, worker_pool):
+    from collections import namedtuple
+
+    from manageNeuroconv import conversion_planning, conversion_predictions
+
+    source_file_path = tmp_path / "corrupted.ap.bin"
+    source_file_path.write_bytes(b"\0" * 1_000_000)
+
+    def get_info(session: str, file_path: str, **kwargs) -> dict:
+        return dict(
+            project_name="plan",
+            nwbfile_path=f"sub-mouse_ses-{session}.nwb",
+            output_folder=str(tmp_path / "output"),
+            interfaces=dict(recording="SpikeGLXRecordingInterface"),
+            source_data=dict(recording=dict(file_path=file_path)),
+            metadata=dict(),
+            configuration=dict(backend="hdf5"),
+            **kwargs,
+        )
+
+    # No space is left on the output volume
+    usage = namedtuple("usage", ["total", "used", "free"])
+    monkeypatch.setattr(conversion_predictions, "disk_usage", lambda path: usage(total=1, used=1, free=0))
+
+    files = [
+        get_info("missing", str(tmp_path / "missing.ap.bin")),
+        get_info("corrupted", str(source_file_path)),
+        get_info("appended", str(source_file_path), append_interfaces=["recording"]),
+    ]
+    plan = conversion_planning.plan_conversions(dict(files=files, estimate_compression=False))
+
+    assert plan["ready"] is False
+    assert {issue["type"] for issue in plan["issues"] if issue["blocking"]} == {
+        "missing_source",
+        "configuration",
+        "insufficient_space",
+    }
+    assert plan["total"]["number_of_planned_sessions"] == 3
+    assert plan["total"]["projected_bytes_read"] == 2_000_000
+    assert len(plan["volumes"]) == 1 and plan["volumes"][0]["required_bytes"] == 2_000_000
+
+    # Appends that cannot be configured are not checked against their file
+    appended_session = str(tmp_path / "output" / "plan" / "sub-mouse_ses-appended.nwb")
+    assert [issue["type"] for issue in plan["issues"] if issue.get("session") == appended_session] == ["configuration"]
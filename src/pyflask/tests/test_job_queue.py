@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+
+import pytest
+
+
+def test_job_queue_relays_progress_and_results(tmp_path):
+    from manageNeuroconv.job_queue import FileSystemJobQueue, run_job, run_queued
+    from manageNeuroconv.progress import create_progress_reporter
+
+    queue = FileSystemJobQueue(tmp_path / "queue")
+
+    def convert(info, log_url=None):
+        report = create_progress_reporter(request_id=info["request_id"])
+        report(dict(progress_bar_id=info["name"], format_dict=dict(n=1, total=1)))
+        if info["name"] == "broken":
+            raise ValueError("Unreadable source data.")
+        return dict(file=f"{info['name']}.nwb")
+
+    claimed_jobs = []
+
+    def work():
+        number_of_jobs = 0
+        while number_of_jobs < 3:
+            job = queue.claim(worker_id="test-worker")
+            if job is None:
+                time.sleep(0.01)
+                continue
+            claimed_jobs.append(job)
+            run_job(queue=queue, job=job, function=convert)
+            number_of_jobs += 1
+
+    worker = threading.Thread(target=work)
+    worker.start()
+
+    jobs = [
+        (size, (dict(request_id="test", name=name),), dict(log_url=None))
+        for size, name in [(1, "small"), (3, "large"), (2, "broken")]
+    ]
+    updates = []
+    completed = list(
+        run_queued(
+            queue=queue,
+            jobs=jobs,
+            on_progress_update=updates.append,
+            poll_interval=0.01,
+            progress_update_rate=0.5,
+            pin_cpus=True,
+        )
+    )
+    worker.join()
+
+    results = {timing["index"]: future for future, timing in completed}
+    assert results[0].result() == dict(file="small.nwb")
+    assert results[1].result() == dict(file="large.nwb")
+    assert "Unreadable source data." in str(results[2].exception())
+
+    assert {update["progress_bar_id"] for update in updates} == {"small", "large", "broken"}
+    assert all(timing["worker_id"] == "test-worker" for __, timing in completed)
+    assert queue.get_status() == dict(pending=0, running=0, done=2, failed=1)
+
+    # The options of the batch are passed on to the workers
+    assert all(job["progress_update_rate"] == 0.5 and job["pin_cpus"] for job in claimed_jobs)
+
+
+def test_queued_conversions_require_an_output_folder(tmp_path):
+    from manageNeuroconv.manage_neuroconv import convert_all_to_nwb
+
+    files = [
+        dict(project_name="queue", nwbfile_path="sub-mouse_ses-1.nwb", output_folder=str(tmp_path)),
+        dict(project_name="queue", nwbfile_path="sub-mouse_ses-2.nwb"),
+    ]
+    with pytest.raises(ValueError, match="sub-mouse_ses-2.nwb"):
+        convert_all_to_nwb(files=files, request_id=None, job_queue_folder=str(tmp_path / "queue"))
+
+    assert not (tmp_path / "queue").exists()
+
+
+def test_stale_jobs_are_requeued(tmp_path):
+    from manageNeuroconv.job_queue import FileSystemJobQueue
+
+    queue = FileSystemJobQueue(tmp_path / "queue")
+    job_id = queue.submit(dict(name="session"))
+
+    job = queue.claim(worker_id="lost-worker")
+    assert job["job_id"] == job_id
+    assert queue.claim(worker_id="other-worker") is None
+    assert queue.requeue_stale_jobs() == []
+
+    # The worker stopped marking its job alive
+    running_path = tmp_path / "queue" / "running" / f"{job_id}.json"
+    os.utime(running_path, (0, 0))
+    assert queue.requeue_stale_jobs() == [job_id]
+    assert queue.claim(worker_id="other-worker")["job_id"] == job_id
+
+    # The worker that lost the job can no longer record its outcome, while the one that claimed it again can
+    assert not queue.heartbeat(job)
+    assert not queue.complete(job, result=dict(file="lost.nwb"))
+    assert not (tmp_path / "queue" / "done" / f"{job_id}.json").exists()
+
+
+def test_requeued_jobs_are_abandoned(tmp_path, monkeypatch):
+    from manageNeuroconv import job_queue
+    from manageNeuroconv.job_queue import FileSystemJobQueue, run_job
+
+    queue = FileSystemJobQueue(tmp_path / "queue")
+    job_id = queue.submit(dict(name="session"))
+    job = queue.claim(worker_id="lost-worker")
+
+    def convert(info):
+        # The job is returned to the queue and claimed again while it runs
+        os.utime(tmp_path / "queue" / "running" / f"{job_id}.json", (0, 0))
+        queue.requeue_stale_jobs()
+        queue.claim(worker_id="other-worker")
+        time.sleep(1)
+        raise AssertionError("The abandoned job was not interrupted.")
+
+    monkeypatch.setattr(job_queue, "HEARTBEAT_INTERVAL", 0.01)
+    assert not run_job(queue=queue, job=job, function=convert)
+
+    assert queue.get_status() == dict(pending=0, running=1, done=0, failed=0)
@@ -0,0 +1,72 @@
+import copy
+
+
+def test_conversion_manifest(tmp_path):
+    from manageNeuroconv.manifest import (
+        get_conversion_fingerprint,
+        is_conversion_up_to_date,
+        load_conversion_manifest,
+        record_conversion,
+        save_conversion_manifest,
+    )
+
+    source_file_path = tmp_path / "recording.bin"
+    source_file_path.write_bytes(b"0" * 100)
+
+    info = dict(
+        project_name="project",
+        nwbfile_path="sub-mouse_ses-1.nwb",
+        output_folder=str(tmp_path / "output"),
+        interfaces=dict(recording="SpikeGLXRecordingInterface"),
+        source_data=dict(recording=dict(file_path=str(source_file_path))),
+        metadata=dict(NWBFile=dict(session_description="A session")),
+        configuration=dict(backend="hdf5"),
+    )
+    directory = tmp_path / "output" / "project"
+    directory.mkdir(parents=True)
+    (directory / "sub-mouse_ses-1.nwb").write_bytes(b"1" * 10)
+
+    manifest = load_conversion_manifest(directory)
+    fingerprint = get_conversion_fingerprint(info)
+    assert not is_conversion_up_to_date(info, manifest=manifest, fingerprint=fingerprint)
+
+    record_conversion(info, manifest=manifest, fingerprint=fingerprint)
+    save_conversion_manifest(directory, manifest=manifest)
+    manifest = load_conversion_manifest(directory)
+    assert is_conversion_up_to_date(info, manifest=manifest, fingerprint=fingerprint)
+
+    changed_info = copy.deepcopy(info)
+    changed_info["metadata"]["NWBFile"]["session_description"] = "Another session"
+    assert not is_conversion_up_to_date(
+        changed_info, manifest=manifest, fingerprint=get_conversion_fingerprint(changed_info)
+    )
+
+    source_file_path.write_bytes(b"0" * 200)
+    assert not is_conversion_up_to_date(info, manifest=manifest, fingerprint=get_conversion_fingerprint(info))
+
+    (directory / "sub-mouse_ses-1.nwb").unlink()
+    assert not is_conversion_up_to_date(info, manifest=manifest, fingerprint=fingerprint)
+
+
+def test_fingerprint_of_folder_changes_with_its_files(tmp_path):
+    import os
+
+    from manageNeuroconv.manifest import get_conversion_fingerprint
+
+    folder_path = tmp_path / "Session1_g0" / "Session1_g0_imec0"
+    folder_path.mkdir(parents=True)
+    file_path = folder_path / "Session1_g0_t0.imec0.ap.bin"
+    file_path.write_bytes(b"0" * 100)
+
+    info = dict(
+        interfaces=dict(recording="SpikeGLXConverterPipe"),
+        source_data=dict(recording=dict(folder_path=str(tmp_path / "Session1_g0"))),
+    )
+    fingerprint = get_conversion_fingerprint(info)
+
+    # Editing a file in place leaves the folders that hold it unchanged
+    folder_stat = (tmp_path / "Session1_g0").stat()
+    file_path.write_bytes(b"1" * 100)
+    os.utime(file_path, ns=(file_path.stat().st_atime_ns, file_path.stat().st_mtime_ns + 1_000_000_000))
+    assert (tmp_path / "Session1_g0").stat().st_mtime_ns == folder_stat.st_mtime_ns
+    assert get_conversion_fingerprint(info) != fingerprint
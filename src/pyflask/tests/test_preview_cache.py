@@ -0,0 +1,62 @@
+import copy
+
+
+def test_preview_cache(tmp_path, monkeypatch):
+    from manageNeuroconv import preview_cache
+    from manageNeuroconv.preview_cache import (
+        evict_previews,
+        get_preview_fingerprint,
+        prepare_preview_output,
+        restore_preview,
+        store_preview,
+    )
+
+    monkeypatch.setattr(preview_cache, "PREVIEW_CACHE_FOLDER_PATH", tmp_path / "cache")
+
+    source_file_path = tmp_path / "recording.bin"
+    source_file_path.write_bytes(b"0" * 100)
+
+    info = dict(
+        project_name="project",
+        nwbfile_path="sub-mouse_ses-1.nwb",
+        output_folder=str(tmp_path / "preview"),
+        stub_test=True,
+        interfaces=dict(recording="SpikeGLXRecordingInterface"),
+        source_data=dict(recording=dict(file_path=str(source_file_path))),
+        metadata=dict(NWBFile=dict(session_description="A session")),
+    )
+    nwbfile_path = tmp_path / "preview" / "project" / "sub-mouse_ses-1.nwb"
+
+    fingerprint = get_preview_fingerprint(info)
+    assert not restore_preview(info, fingerprint=fingerprint)
+
+    nwbfile_path.parent.mkdir(parents=True)
+    nwbfile_path.write_bytes(b"1" * 10)
+    store_preview(info, fingerprint=fingerprint)
+    assert nwbfile_path.read_bytes() == b"1" * 10
+
+    prepare_preview_output(info)
+    assert not nwbfile_path.exists()
+    assert restore_preview(info, fingerprint=fingerprint)
+    assert nwbfile_path.read_bytes() == b"1" * 10
+
+    other_info = copy.deepcopy(info)
+    other_info["nwbfile_path"] = "sub-mouse_ses-2.nwb"
+    other_info["metadata"]["NWBFile"]["session_description"] = "Another session"
+    other_fingerprint = get_preview_fingerprint(other_info)
+    assert other_fingerprint != fingerprint
+
+    other_nwbfile_path = nwbfile_path.parent / "sub-mouse_ses-2.nwb"
+    prepare_preview_output(other_info)
+    other_nwbfile_path.write_bytes(b"2" * 20)
+    store_preview(other_info, fingerprint=other_fingerprint)
+
+    # The least recently used preview is evicted first, and previews in use are kept
+    statistics = evict_previews(quota_in_bytes=25, keep=[other_fingerprint])
+    assert statistics == dict(number_of_entries=1, size=20, quota=25, number_evicted=1)
+    assert not restore_preview(info, fingerprint=fingerprint)
+    assert restore_preview(other_info, fingerprint=other_fingerprint)
+
+    # Sessions no longer link to evicted previews
+    assert not nwbfile_path.is_symlink()
+    assert other_nwbfile_path.read_bytes() == b"2" * 20
@@ -0,0 +1,50 @@
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _report_progress_in_worker(total: int) -> None:
+    from manageNeuroconv.progress import create_progress_reporter
+
+    report = create_progress_reporter(request_id="request")
+    for n in range(total + 1):
+        report(dict(progress_bar_id="bar", format_dict=dict(n=n, total=total)))
+
+
+def test_progress_reporter_is_rate_limited_in_the_server():
+    from manageNeuroconv.progress import create_progress_reporter, progress_handler
+
+    listener = progress_handler.listen()
+    try:
+        report = create_progress_reporter(request_id="request")
+        for n in range(1_001):
+            report(dict(progress_bar_id="bar", format_dict=dict(n=n, total=1_000)))
+
+        messages = [listener.get_nowait() for _ in range(listener.qsize())]
+    finally:
+        progress_handler.unsubscribe(listener)
+
+    assert 2 <= len(messages) < 10
+    assert messages[0]["request_id"] == "request"
+    assert messages[-1]["format_dict"]["n"] == 1_000  # The final update is always reported
+
+
+def test_progress_is_transported_from_worker_processes():
+    from manageNeuroconv.progress import (
+        get_progress_queue,
+        initialize_progress_worker,
+        progress_handler,
+    )
+
+    listener = progress_handler.listen()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=1, initializer=initialize_progress_worker, initargs=(get_progress_queue(), 10)
+        ) as executor:
+            executor.submit(_report_progress_in_worker, 1_000).result()
+
+        message = listener.get(timeout=5)
+        while message["format_dict"]["n"] != 1_000:
+            message = listener.get(timeout=5)
+    finally:
+        progress_handler.unsubscribe(listener)
+
+    assert message == dict(request_id="request", progress_bar_id="bar", format_dict=dict(n=1_000, total=1_000))
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+
+def test_project_store(tmp_path, monkeypatch):
+    from manageNeuroconv import project_store
+    from manageNeuroconv.project_store import (
+        get_project_index,
+        pin_session_reference,
+        resolve_session_reference,
+        update_project_store,
+    )
+
+    monkeypatch.setattr(project_store, "PROJECT_STORE_FOLDER_PATH", tmp_path / "store")
+
+    info = dict(project_name="project", nwbfile_path="sub-mouse/sub-mouse_ses-1.nwb", metadata=dict(lab="Lab"))
+    index = update_project_store("project", sessions={"mouse/1": info})
+    assert get_project_index("project") == index
+
+    # References are resolved with their overrides, which remove stored keys if null
+    reference = dict(project_name="project", session_id="mouse/1", stub_test=True, metadata=None)
+    assert resolve_session_reference(reference) == dict(
+        project_name="project", nwbfile_path="sub-mouse/sub-mouse_ses-1.nwb", stub_test=True
+    )
+    assert resolve_session_reference(info) is info
+
+    # Pinned references keep resolving to the payload they were pinned to
+    pinned = pin_session_reference(reference)
+    updated_info = dict(info, metadata=dict(lab="Other lab"))
+    new_index = update_project_store("project", sessions={"mouse/1": updated_info})
+    assert new_index["mouse/1"] != index["mouse/1"]
+    assert "metadata" not in resolve_session_reference(pinned)
+    assert resolve_session_reference(dict(project_name="project", session_id="mouse/1")) == updated_info
+
+    # Unreferenced payloads are only removed once no pinned conversion could still need them
+    object_path = tmp_path / "store" / "project" / "objects" / f"{index['mouse/1']}.json"
+    os.utime(object_path, (0, 0))
+    update_project_store("project", remove=["mouse/1"])
+    assert not object_path.exists()
+    assert get_project_index("project") == dict()
+
+    with pytest.raises(KeyError):
+        resolve_session_reference(reference)
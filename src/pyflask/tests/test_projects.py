@@ -0,0 +1,92 @@
+def get_project():
+    return dict(
+        project=dict(
+            name="project",
+            conversion_output_folder="/data/nwb",
+            workflow=dict(timezone="UTC", file_format="zarr"),
+            NWBFile=dict(institution="Institute", lab="Lab"),
+            Subject=dict(species="Mus musculus", sex="U"),
+            SourceData=dict(sorting=dict(folder_path="/data/phy")),
+        ),
+        interfaces=dict(recording="SpikeGLXRecordingInterface", sorting="PhySortingInterface"),
+        subjects=dict(mouse=dict(sex="M", sessions=["a", "b"])),
+        results=dict(
+            mouse={
+                session: dict(
+                    source_data=dict(recording=dict(file_path=f"/data/{session}.ap.bin"), sorting=dict()),
+                    metadata=dict(NWBFile=dict(session_id=session, lab="Other lab"), Subject=dict(subject_id="mouse")),
+                )
+                for session in ["a", "b"]
+            }
+        ),
+        schema=dict(
+            metadata=dict(
+                mouse={
+                    session: dict(
+                        type="object",
+                        properties=dict(
+                            NWBFile=dict(type="object", properties=dict(institution=dict(), lab=dict())),
+                            Subject=dict(type="object", properties=dict(species=dict(), sex=dict(), age=dict())),
+                        ),
+                    )
+                    for session in ["a", "b"]
+                }
+            )
+        ),
+    )
+
+
+def test_conversion_payload_matches_frontend():
+    from manageNeuroconv.projects import get_conversion_payload
+
+    payload = get_conversion_payload(get_project(), subject="mouse", session="a")
+
+    assert payload["nwbfile_path"] == "sub-mouse/sub-mouse_ses-a.nwb"
+    assert payload["output_folder"] == "/data/nwb"
+    assert payload["configuration"] == dict(backend="zarr")
+    assert payload["timezone"] == "UTC"
+    assert payload["source_data"] == dict(
+        recording=dict(file_path="/data/a.ap.bin"), sorting=dict(folder_path="/data/phy")
+    )
+
+    # Session values take precedence over those of the subject, which take precedence over the project
+    assert payload["metadata"]["NWBFile"] == dict(session_id="a", lab="Other lab", institution="Institute")
+    assert payload["metadata"]["Subject"] == dict(subject_id="mouse", species="Mus musculus", sex="M")
+
+    preview_payload = get_conversion_payload(get_project(), subject="mouse", session="a", stub_test=True)
+    assert preview_payload["stub_test"] is True
+    assert "output_folder" not in preview_payload
+
+
+def test_conversion_payload_of_saved_project():
+    """The metadata of each session matches that resolved by the frontend from the same saved project."""
+    import json
+    from pathlib import Path
+
+    from manageNeuroconv.projects import get_conversion_payload, get_project_sessions
+
+    fixtures_folder_path = Path(__file__).parent / "fixtures"
+    with open(file=fixtures_folder_path / "saved_project.json", mode="r") as file:
+        project = json.load(fp=file)
+    with open(file=fixtures_folder_path / "saved_project_metadata.json", mode="r") as file:
+        resolved_metadata = json.load(fp=file)
+
+    for subject, session in get_project_sessions(project):
+        payload = get_conversion_payload(project, subject=subject, session=session)
+        assert payload["metadata"] == resolved_metadata[subject][session]
+
+    # Project-wide source data takes precedence over that of each session, as on the frontend
+    payload = get_conversion_payload(project, subject="mouse1", session="s2")
+    assert payload["source_data"]["sorting"] == dict(folder_path="/data/phy")
+    assert payload["configuration"] == dict(backend="zarr")
+    assert payload["timezone"] == "America/Los_Angeles"
+
+
+def test_shards_cover_every_session_once():
+    from manageNeuroconv.projects import select_shard
+
+    sessions = [("mouse", str(session)) for session in range(10)]
+    shards = [select_shard(sessions, shard=shard, number_of_shards=3) for shard in range(3)]
+
+    assert sorted(session for shard in shards for session in shard) == sorted(sessions)
+    assert [len(shard) for shard in shards] == [4, 3, 3]
@@ -0,0 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from utils import ArrayIterator
+
+
+def test_read_ahead_preserves_buffers_and_order():
+    from manageNeuroconv.read_ahead import enable_read_ahead
+    from pynwb.testing.mock.base import mock_TimeSeries
+    from pynwb.testing.mock.file import mock_NWBFile
+
+    array = np.arange(1_000 * 8, dtype="int16").reshape(1_000, 8)
+    expected_chunks = list(ArrayIterator(array=array, buffer_shape=(100, 8), chunk_shape=(50, 8)))
+
+    nwbfile = mock_NWBFile()
+    time_series = mock_TimeSeries(data=ArrayIterator(array=array, buffer_shape=(100, 8), chunk_shape=(50, 8)))
+    nwbfile.add_acquisition(time_series)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert enable_read_ahead(nwbfile=nwbfile, executor=executor, number_of_buffers=3) == 1
+        chunks = list(time_series.data)
+
+    assert len(chunks) == len(expected_chunks) == 10
+    for chunk, expected_chunk in zip(chunks, expected_chunks):
+        assert chunk.selection == expected_chunk.selection
+        np.testing.assert_array_equal(chunk.data, expected_chunk.data)
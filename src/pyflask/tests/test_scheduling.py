@@ -0,0 +1,177 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+def test_run_scheduled_submits_largest_first():
+    from manageNeuroconv.scheduling import FixedConcurrencyController, run_scheduled
+
+    jobs = [(size, (name,), dict()) for size, name in [(10, "small"), (1_000, "large"), (100, "medium")]]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        completed = list(
+            run_scheduled(
+                executor=executor,
+                function=str.upper,
+                jobs=jobs,
+                max_workers=1,
+                controller=FixedConcurrencyController(max_workers=1),
+            )
+        )
+
+    assert [future.result() for future, __ in completed] == ["LARGE", "MEDIUM", "SMALL"]
+    assert [timing["index"] for __, timing in completed] == [1, 2, 0]
+    assert all(timing["queue_time"] >= 0 and timing["run_time"] >= 0 for __, timing in completed)
+
+
+def test_concurrency_starts_at_admissible_count_and_lifts_disk_cap(monkeypatch):
+    from types import SimpleNamespace
+
+    import psutil
+    from manageNeuroconv import scheduling
+    from manageNeuroconv.scheduling import (
+        DISK_THROUGHPUT_CAP_DURATION,
+        ConcurrencyController,
+    )
+
+    # The disk writes as fast with any number of sessions
+    clock = SimpleNamespace(now=0.0, written=0)
+
+    def disk_io_counters():
+        clock.written += 100_000_000
+        return SimpleNamespace(write_bytes=clock.written)
+
+    monkeypatch.setattr(scheduling.time, "monotonic", lambda: clock.now)
+    monkeypatch.setattr(psutil, "disk_io_counters", disk_io_counters)
+    monkeypatch.setattr(psutil, "cpu_percent", lambda interval: 10.0)
+    monkeypatch.setattr(psutil, "virtual_memory", lambda: SimpleNamespace(available=10e9))
+    monkeypatch.setattr(scheduling, "get_worker_memory_in_gb", lambda: 0.0)
+
+    assert ConcurrencyController(max_workers=4, session_memory_gb=2).limit == 4
+    assert ConcurrencyController(max_workers=4, session_memory_gb=3).limit == 2
+
+    controller = ConcurrencyController(max_workers=4)
+    for number_running in [3, 3, 3, 4, 4, 4]:
+        clock.now += 1
+        controller.update(number_running=number_running)
+    assert controller.disk_throughput_cap == controller.limit == 3
+
+    # The cap expires, so that concurrency ramps up again
+    clock.now += DISK_THROUGHPUT_CAP_DURATION
+    controller.update(number_running=3)
+    assert controller.disk_throughput_cap is None
+    assert controller.limit == 4
+
+
+def test_get_source_data_size(tmp_path):
+    from manageNeuroconv.manage_neuroconv import get_source_data_size
+
+    (tmp_path / "recording.bin").write_bytes(b"0" * 100)
+    (tmp_path / "sorting").mkdir()
+    (tmp_path / "sorting" / "spike_times.npy").write_bytes(b"0" * 20)
+    (tmp_path / "sorting" / "spike_clusters.npy").write_bytes(b"0" * 30)
+
+    info = dict(
+        source_data=dict(
+            recording=dict(file_path=str(tmp_path / "recording.bin"), es_key="ElectricalSeries"),
+            sorting=dict(folder_path=str(tmp_path / "sorting")),
+            missing=dict(file_path=str(tmp_path / "missing.bin")),
+        )
+    )
+    assert get_source_data_size(info) == 150
+
+
+def test_worker_pool_is_shared(worker_pool):
+    from manageNeuroconv.worker_pool import get_worker_pool, with_progress_update_rate
+
+    assert get_worker_pool() is worker_pool
+
+    future = worker_pool.submit(with_progress_update_rate(os.getpid, progress_update_rate=5))
+    assert future.result() != os.getpid()
+
+
+def test_only_busy_workers_count_against_memory(worker_pool):
+    import time
+
+    from manageNeuroconv.scheduling import get_worker_memory_in_gb
+    from manageNeuroconv.worker_pool import (
+        get_busy_worker_pids,
+        with_progress_update_rate,
+    )
+
+    worker_pool.submit(os.getpid).result()  # Start an idle worker
+    assert get_busy_worker_pids() == [] and get_worker_memory_in_gb() == 0
+
+    future = worker_pool.submit(with_progress_update_rate(time.sleep), 2)
+    deadline = time.monotonic() + 10
+    while not get_busy_worker_pids() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert len(get_busy_worker_pids()) == 1
+    assert get_worker_memory_in_gb() > 0
+
+    future.result()
+    assert get_busy_worker_pids() == []
+
+
+def test_jobs_limit_native_threads(worker_pool):
+    from manageNeuroconv.thread_limits import get_thread_limit, get_threads_per_worker
+    from manageNeuroconv.worker_pool import with_thread_limit
+
+    assert get_threads_per_worker(number_of_workers=os.cpu_count()) == 1
+    assert get_threads_per_worker(number_of_workers=2 * os.cpu_count()) == 1
+
+    assert worker_pool.submit(with_thread_limit(get_thread_limit, number_of_threads=3)).result() == 3
+
+    blosc_threads = worker_pool.submit(with_thread_limit(functools.partial(os.getenv, "BLOSC_NTHREADS"), 2))
+    assert blosc_threads.result() == "2"
+
+
+def test_pinned_jobs_claim_distinct_cores(monkeypatch):
+    import multiprocessing
+
+    from manageNeuroconv import thread_limits
+    from manageNeuroconv.thread_limits import pin_to_cpus, release_cpus
+
+    affinities = []
+    monkeypatch.setattr(thread_limits.os, "sched_setaffinity", lambda pid, cpus: affinities.append(list(cpus)))
+    monkeypatch.setattr(thread_limits, "_available_cpus", [0, 1, 2, 3])
+    monkeypatch.setattr(thread_limits, "_cpu_claims", multiprocessing.Array("i", 4))
+    cpu_claims = thread_limits._cpu_claims
+
+    # Another worker runs a job on the first block, whatever the index of this worker
+    cpu_claims[0] = cpu_claims[1] = 1
+    pin_to_cpus(2)
+    assert affinities[-1] == [2, 3]
+    assert cpu_claims[:] == [1, 1, os.getpid(), os.getpid()]
+
+    # Cores are released as the job completes
+    release_cpus()
+    assert affinities[-1] == [0, 1, 2, 3]
+    assert cpu_claims[:] == [1, 1, 0, 0]
+
+    # Jobs are left unpinned rather than share a block with a running job
+    cpu_claims[2] = cpu_claims[3] = 2
+    pin_to_cpus(2)
+    assert affinities[-1] == [0, 1, 2, 3]
+    assert cpu_claims[:] == [1, 1, 2, 2]
+
+
+def test_buffers_fit_memory_budget():
+    from manageNeuroconv.manage_neuroconv import (
+        DEFAULT_BUFFER_GB,
+        get_buffer_gb,
+        get_number_of_buffers_in_memory,
+    )
+
+    number_of_buffers = get_number_of_buffers_in_memory(dict(backend="hdf5"), read_ahead=dict(number_of_buffers=3))
+    assert number_of_buffers == 4
+    assert get_buffer_gb(memory_budget_gb=2, number_of_buffers=number_of_buffers) == 0.25
+
+    zarr_configuration = dict(backend="zarr", number_of_write_threads=4)
+    assert get_number_of_buffers_in_memory(zarr_configuration) == 1 + 4 * 2
+
+    # Budgets never raise buffers above the default of the iterators
+    assert get_buffer_gb(memory_budget_gb=64, number_of_buffers=1) == DEFAULT_BUFFER_GB
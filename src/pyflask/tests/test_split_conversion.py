@@ -0,0 +1,143 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+def test_split_and_consolidate(tmp_path):
+    import h5py
+    from manageNeuroconv.manage_neuroconv import upload_folder_to_dandi
+    from manageNeuroconv.split_conversion import (
+        build_in_memory_nwbfile_by_part,
+        consolidate_nwbfile,
+        get_heavy_parts,
+        get_parts_folder,
+        get_unconsolidated_files,
+    )
+    from neuroconv import ConverterPipe
+    from neuroconv.tools.nwb_helpers import (
+        configure_backend,
+        get_default_backend_configuration,
+    )
+    from neuroconv.tools.testing.mock_interfaces import MockRecordingInterface
+    from pynwb import NWBHDF5IO
+
+    converter = ConverterPipe(
+        data_interfaces=dict(
+            long=MockRecordingInterface(durations=[1.0], es_key="ElectricalSeriesLong"),
+            short=MockRecordingInterface(durations=[0.1], es_key="ElectricalSeriesShort"),
+        )
+    )
+    metadata = converter.get_metadata()
+    metadata["NWBFile"]["session_start_time"] = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    nwbfile, object_ids_by_part = build_in_memory_nwbfile_by_part(converter, metadata=metadata)
+    backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend="hdf5")
+
+    # Only the data of neurodata objects is split, and only that of parts above the minimum size
+    heavy_parts = get_heavy_parts(nwbfile, object_ids_by_part, backend_configuration, minimum_part_size_in_gb=0)
+    assert heavy_parts == {
+        ("long",): ["acquisition/ElectricalSeriesLong/data"],
+        ("short",): ["acquisition/ElectricalSeriesShort/data"],
+    }
+    heavy_parts = get_heavy_parts(nwbfile, object_ids_by_part, backend_configuration, minimum_part_size_in_gb=1e-4)
+    assert list(heavy_parts) == [("long",)]
+
+    # Link to the data of a part, as written by another process
+    nwbfile_path = tmp_path / "sub-mouse_ses-1.nwb"
+    part_file_path = get_parts_folder(nwbfile_path) / "long.nwb"
+    part_file_path.parent.mkdir()
+    long_data = converter.data_interface_objects["long"].recording_extractor.get_traces()
+    with h5py.File(part_file_path, mode="w") as part_file:
+        part_file.create_dataset("acquisition/ElectricalSeriesLong/data", data=long_data)
+
+    configure_backend(nwbfile=nwbfile, backend_configuration=backend_configuration)
+    with h5py.File(part_file_path, mode="r") as part_file:
+        nwbfile.acquisition["ElectricalSeriesLong"].fields["data"] = part_file["acquisition/ElectricalSeriesLong/data"]
+        with NWBHDF5IO(path=nwbfile_path, mode="w") as io:
+            io.write(nwbfile)
+
+    with h5py.File(nwbfile_path, mode="r") as file:
+        assert isinstance(file["acquisition/ElectricalSeriesLong"].get("data", getlink=True), h5py.ExternalLink)
+
+    # Files are not uploaded without the data they link to
+    assert get_unconsolidated_files(tmp_path) == [nwbfile_path]
+    with pytest.raises(ValueError, match="must be consolidated"):
+        upload_folder_to_dandi(dandiset_id="000000", api_key="", nwb_folder_path=str(tmp_path))
+
+    # Consolidation copies the linked data into the file, which no longer needs its parts
+    consolidate_nwbfile(nwbfile_path)
+    assert not get_parts_folder(nwbfile_path).exists()
+    assert get_unconsolidated_files(tmp_path) == []
+    with h5py.File(nwbfile_path, mode="r") as file:
+        assert isinstance(file["acquisition/ElectricalSeriesLong"].get("data", getlink=True), h5py.HardLink)
+    with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+        np.testing.assert_array_equal(io.read().acquisition["ElectricalSeriesLong"].data[:], long_data)
+
+
+def test_write_split_nwbfile(tmp_path, monkeypatch):
+    import h5py
+    from jsonschema import ValidationError
+    from manageNeuroconv import conversion_predictions, split_conversion
+    from manageNeuroconv.manage_neuroconv import create_file
+    from neuroconv import ConverterPipe, datainterfaces
+    from neuroconv.tools.testing.mock_interfaces import MockRecordingInterface
+    from pynwb import NWBHDF5IO
+
+    # Refer to the mock interface by name, as the GUIDE does (part processes inherit it as they fork)
+    monkeypatch.setattr(datainterfaces, "MockRecordingInterface", MockRecordingInterface, raising=False)
+    monkeypatch.setattr(conversion_predictions, "CONVERSION_THROUGHPUT_LOG_PATH", tmp_path / "throughput.jsonl")
+    monkeypatch.setattr(split_conversion, "MINIMUM_PART_SIZE_IN_GB", 1e-4)
+
+    interfaces = dict(first="MockRecordingInterface", second="MockRecordingInterface")
+    source_data = dict(
+        first=dict(durations=[1.0], es_key="ElectricalSeriesFirst"),
+        second=dict(durations=[0.5], es_key="ElectricalSeriesSecond"),
+    )
+    converter = ConverterPipe(
+        data_interfaces={name: MockRecordingInterface(**source_data[name]) for name in interfaces}
+    )
+    metadata = converter.get_metadata().to_dict()  # As sent by the frontend
+    metadata["NWBFile"]["session_start_time"] = "2024-01-01T00:00:00"
+    metadata["Subject"] = dict(subject_id="mouse", species="Mus musculus", sex="U", age="P30D")
+
+    info = dict(
+        project_name="split",
+        nwbfile_path="sub-mouse_ses-1.nwb",
+        output_folder=str(tmp_path),
+        interfaces=interfaces,
+        source_data=source_data,
+        metadata=metadata,
+        timezone="UTC",
+        configuration=dict(backend="hdf5"),
+        split_interfaces=True,
+    )
+    nwbfile_path = tmp_path / "split" / "sub-mouse_ses-1.nwb"
+
+    # Metadata that the in-memory file tolerates is still validated before any part is written
+    with pytest.raises(ValidationError):
+        create_file(dict(info, metadata=dict(metadata, Ecephys=dict(metadata["Ecephys"], Unknown="value"))))
+    assert not split_conversion.get_parts_folder(nwbfile_path).exists()
+
+    # Each part is written to its own file, which the NWB file of the session links to
+    assert len(create_file(info)["parts"]) == 2
+    with h5py.File(nwbfile_path, mode="r") as file:
+        for name in ("ElectricalSeriesFirst", "ElectricalSeriesSecond"):
+            assert isinstance(file["acquisition"][name].get("data", getlink=True), h5py.ExternalLink)
+
+    with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+        acquisition = io.read().acquisition
+        for name, interface in converter.data_interface_objects.items():
+            expected_data = interface.recording_extractor.get_traces()
+            np.testing.assert_array_equal(acquisition[source_data[name]["es_key"]].data[:], expected_data)
+
+    # Each part only instantiates its own interface, and reports the timing of its write
+    assert list(split_conversion._get_part_info(info, ("first",))["interfaces"]) == ["first"]
+    linked_info = dict(info, alignment=dict(first=dict(selected="linked", values=dict(linked="second"))))
+    assert list(split_conversion._get_part_info(linked_info, ("first",))["interfaces"]) == ["first", "second"]
+    report = json.loads(Path(f"{nwbfile_path}.telemetry.json").read_text())
+    assert {phase["part"] for phase in report["phases"] if phase["phase"] == "write_part"} == {"first", "second"}
+    for name in ("ElectricalSeriesFirst", "ElectricalSeriesSecond"):
+        assert report["datasets"][f"acquisition/{name}/data"]["bytes_read"] > 0
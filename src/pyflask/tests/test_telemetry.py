@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+from utils import ArrayIterator
+
+
+def test_telemetry_measures_each_dataset(tmp_path):
+    from manageNeuroconv.telemetry import ConversionTelemetry
+    from neuroconv.tools.nwb_helpers import (
+        configure_backend,
+        get_default_backend_configuration,
+    )
+    from pynwb import NWBHDF5IO
+    from pynwb.testing.mock.base import mock_TimeSeries
+    from pynwb.testing.mock.file import mock_NWBFile
+
+    array = np.arange(1_000 * 8, dtype="int16").reshape(1_000, 8)
+
+    nwbfile = mock_NWBFile()
+    data = ArrayIterator(array=array, buffer_shape=(100, 8), chunk_shape=(50, 8))
+    nwbfile.add_acquisition(mock_TimeSeries(name="series", data=data))
+
+    backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend="hdf5")
+
+    telemetry = ConversionTelemetry()
+    telemetry.instrument_datasets(nwbfile=nwbfile, backend_configuration=backend_configuration)
+    configure_backend(nwbfile=nwbfile, backend_configuration=backend_configuration)
+
+    nwbfile_path = tmp_path / "telemetry.nwb"
+    with telemetry.phase("write", backend="hdf5"):
+        with NWBHDF5IO(path=nwbfile_path, mode="w") as io:
+            io.write(nwbfile)
+    telemetry.record_storage(nwbfile_path=nwbfile_path, backend="hdf5")
+
+    report_path = telemetry.write_report(nwbfile_path=nwbfile_path, backend="hdf5")
+    with open(report_path) as file:
+        report = json.load(file)
+
+    record = report["datasets"]["acquisition/series/data"]
+    assert record["uncompressed_bytes"] == record["bytes_read"] == array.nbytes
+    assert record["number_of_buffers"] == 10
+    assert record["bytes_written"] > 0
+    assert [phase["phase"] for phase in report["phases"]] == ["write"]
+    assert report["total"]["bytes_read"] == array.nbytes
+
+
+def test_telemetry_of_interleaved_writes(tmp_path):
+    from manageNeuroconv.telemetry import ConversionTelemetry
+    from manageNeuroconv.zarr_writing import write_zarr_nwbfile
+    from neuroconv.tools.nwb_helpers import get_default_backend_configuration
+    from pynwb.testing.mock.base import mock_TimeSeries
+    from pynwb.testing.mock.file import mock_NWBFile
+
+    nwbfile = mock_NWBFile()
+    for name in ("first", "second"):
+        array = np.arange(1_000 * 8, dtype="int16").reshape(1_000, 8)
+        data = ArrayIterator(array=array, buffer_shape=(100, 8), chunk_shape=(50, 8))
+        nwbfile.add_acquisition(mock_TimeSeries(name=name, data=data))
+
+    backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend="zarr")
+
+    telemetry = ConversionTelemetry()
+    telemetry.instrument_datasets(nwbfile=nwbfile, backend_configuration=backend_configuration, interleaved_writes=True)
+
+    nwbfile_path = tmp_path / "telemetry.nwb.zarr"
+    with telemetry.phase("write", backend="zarr"):
+        write_zarr_nwbfile(nwbfile=nwbfile, nwbfile_path=nwbfile_path, backend_configuration=backend_configuration)
+    telemetry.record_storage(nwbfile_path=nwbfile_path, backend="zarr")
+
+    # The time between the buffers of a dataset also covers the others, so only the whole write phase is timed
+    report = telemetry.get_report()
+    for location_in_file in ("acquisition/first/data", "acquisition/second/data"):
+        assert report["datasets"][location_in_file]["number_of_buffers"] == 10
+        assert report["datasets"][location_in_file]["write_time"] is None
+    assert report["total"]["interleaved_writes"]
+    assert report["total"]["write_time"] == report["phases"][0]["duration"]
@@ -0,0 +1,64 @@
+import numpy as np
+from utils import ArrayIterator
+
+
+def test_parallel_zarr_write(tmp_path, monkeypatch):
+    import zarr
+    from manageNeuroconv import zarr_writing
+    from manageNeuroconv.zarr_writing import write_zarr_nwbfile
+    from neuroconv.tools.nwb_helpers import get_default_backend_configuration
+    from pynwb.testing.mock.base import mock_TimeSeries
+    from pynwb.testing.mock.file import mock_NWBFile
+
+    arrays = dict(
+        first=np.arange(10_000 * 4, dtype="int16").reshape(10_000, 4),
+        second=np.arange(5_000 * 8, dtype="float32").reshape(5_000, 8),
+    )
+
+    nwbfile = mock_NWBFile()
+    for name, array in arrays.items():
+        data = ArrayIterator(array=array, buffer_shape=(1_000, array.shape[1]), chunk_shape=(100, array.shape[1]))
+        nwbfile.add_acquisition(mock_TimeSeries(name=name, data=data))
+
+    backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend="zarr")
+    for dataset_configuration in backend_configuration.dataset_configurations.values():
+        dataset_configuration.chunk_shape = (100, dataset_configuration.full_shape[1])
+
+    stored_selections = []
+    store_buffer = zarr_writing._store_buffer
+
+    def record_store_buffer(dataset, buffer):
+        stored_selections.append(buffer.selection)
+        store_buffer(dataset=dataset, buffer=buffer)
+
+    monkeypatch.setattr(zarr_writing, "_store_buffer", record_store_buffer)
+
+    nwbfile_path = tmp_path / "parallel.nwb.zarr"
+    write_zarr_nwbfile(
+        nwbfile=nwbfile, nwbfile_path=nwbfile_path, backend_configuration=backend_configuration, number_of_threads=4
+    )
+
+    file = zarr.open_consolidated(str(nwbfile_path), mode="r")
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(file[f"acquisition/{name}/data"][:], array)
+
+    # Every buffer of both datasets was stored on the thread pool
+    assert len(stored_selections) == 10 + 5
+
+
+def test_zarr_io_queue_is_replaced(tmp_path):
+    from hdmf_zarr.backend import ZarrIO
+    from manageNeuroconv.zarr_writing import (
+        QUEUE_ATTRIBUTE_NAME,
+        ParallelNWBZarrIO,
+        ThreadedDataChunkIteratorQueue,
+    )
+    from pynwb.testing.mock.file import mock_NWBFile
+
+    # The parallel writer depends on ZarrIO exhausting its queue through this private attribute
+    with ZarrIO(str(tmp_path / "plain.zarr"), mode="w") as io:
+        assert hasattr(io, QUEUE_ATTRIBUTE_NAME)
+
+    with ParallelNWBZarrIO(str(tmp_path / "parallel.nwb.zarr"), mode="w") as io:
+        io.write(mock_NWBFile())
+        assert isinstance(getattr(io, QUEUE_ATTRIBUTE_NAME), ThreadedDataChunkIteratorQueue)
@@ -1,4 +1,6 @@
+import numpy as np
 import requests
+from hdmf.data_utils import GenericDataChunkIterator
 
 
 def get(path, client):
@@ -19,6 +21,15 @@ def post(path, json, client):
         return client.post(path, json=json, follow_redirects=True).json
 
 
+def post_binary(path, json, client) -> bytes:
+    if isinstance(client, str):
+        r = requests.post(f"{client}/{path}", json=json, allow_redirects=True)
+        r.raise_for_status()
+        return r.content
+    else:
+        return client.post(path, json=json, follow_redirects=True).data
+
+
 def get_converter_output_schema(interfaces: dict):
     return {
         "type": "object",
@@ -42,3 +53,18 @@ def get_converter_output_schema(interfaces: dict):
             },
         },
     }
+
+
+class ArrayIterator(GenericDataChunkIterator):
+    def __init__(self, array: np.ndarray, **kwargs):
+        self.array = array
+        super().__init__(**kwargs)
+
+    def _get_data(self, selection):
+        return self.array[selection]
+
+    def _get_maxshape(self):
+        return self.array.shape
+
+    def _get_dtype(self):
+        return self.array.dtype
@@ -8,6 +8,11 @@ import { createMockGlobalState } from './utils'
 
 import { Validator } from 'jsonschema'
 import { updateResultsFromSubjects } from '../src/electron/frontend/utils/data'
+import { resolveMetadata } from '../src/electron/frontend/utils/data'
+
+// Shared with the tests of the headless CLI, which resolves the same metadata on the server
+import savedProject from '../src/pyflask/tests/fixtures/saved_project.json'
+import savedProjectMetadata from '../src/pyflask/tests/fixtures/saved_project_metadata.json'
 
 
 var validator = new Validator();
@@ -37,3 +42,11 @@ test('removing all existing sessions will maintain the related subject entry on
     updateResultsFromSubjects(results, subjects)
     expect(Object.keys(results)).toEqual(Object.keys(copy))
 })
+
+test('metadata resolved from a saved project matches that of the headless CLI', () => {
+    for (const [subject, sessions] of Object.entries(savedProjectMetadata)) {
+        for (const [session, metadata] of Object.entries(sessions)) {
+            expect(resolveMetadata(subject, session, structuredClone(savedProject))).toEqual(metadata)
+        }
+    }
+})